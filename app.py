@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent / "app"))
 
 # Import services
 from app.services.ai_agents import CharterAgent, CriticAgent
+from app.services.ai_agents.telemetry import start_metrics_server_from_env
 from app.services.pattern_registry import PatternRegistry
 from app.services.project_registry import ProjectRegistry
 from app.services.project_scaffolder import ProjectScaffolder
@@ -49,6 +50,8 @@ def get_services():
     project_registry = ProjectRegistry()
     scaffolder = ProjectScaffolder()
     issue_manager = IssueManager()
+    # Cached resource, so the metrics endpoint starts once per server process
+    start_metrics_server_from_env()
     return registry, charter_agent, critic_agent, project_registry, scaffolder, issue_manager
 
 
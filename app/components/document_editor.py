@@ -1,11 +1,14 @@
 """Enhanced document editor with pattern-specific critique and markdown editing."""
 
 import json
+import time
 from pathlib import Path
 from typing import Any
 
 import streamlit as st
 
+from app.utils.markdown_sections import section_text, split_sections
+
 
 class DocumentEditor:
     """Universal document editor supporting any pattern with critique and enhancement."""
@@ -149,8 +152,8 @@ class DocumentEditor:
                         if custom_prompt.strip():
                             with st.spinner("Enhancing..."):
                                 try:
-                                    enhanced = self.charter_agent.enhance_large_document(
-                                        updated_content, feedback=custom_prompt, chunk_size=1000
+                                    enhanced = self._enhance_document(
+                                        updated_content, feedback=custom_prompt
                                     )
                                     updated_content = enhanced
                                     st.session_state[working_content_key] = enhanced
@@ -170,10 +173,9 @@ class DocumentEditor:
                     ):
                         with st.spinner("Improving wording..."):
                             try:
-                                enhanced = self.charter_agent.enhance_large_document(
+                                enhanced = self._enhance_document(
                                     updated_content,
                                     feedback="Improve word choice and sentence structure for clarity and professionalism",
-                                    chunk_size=1000,
                                 )
                                 updated_content = enhanced
                                 st.session_state[working_content_key] = enhanced
@@ -189,10 +191,9 @@ class DocumentEditor:
                     ):
                         with st.spinner("Adjusting tone..."):
                             try:
-                                enhanced = self.charter_agent.enhance_large_document(
+                                enhanced = self._enhance_document(
                                     updated_content,
                                     feedback="Rewrite in a more professional and authoritative tone",
-                                    chunk_size=1000,
                                 )
                                 updated_content = enhanced
                                 st.session_state[working_content_key] = enhanced
@@ -289,6 +290,7 @@ class DocumentEditor:
                             st.warning("**Critical Gaps:**")
                             for gap in results["critical_gaps"]:
                                 st.markdown(f"- {gap}")
+                self._render_section_review(updated_content)
             else:
                 st.info("Critique agent not available for this document type.")
 
@@ -316,6 +318,105 @@ class DocumentEditor:
         return updated_content, action_taken
 
 
+    def _enhance_document(self, content: str, feedback: str) -> str:
+        """Enhance the document in parallel chunks, showing a live progress bar."""
+        progress = st.progress(0.0, text="Enhancing...")
+
+        def on_progress(done: int, total: int):
+            progress.progress(done / total, text=f"Enhanced {done}/{total} parts")
+
+        try:
+            return self.charter_agent.enhance_large_document(
+                content, feedback=feedback, on_progress=on_progress
+            )
+        finally:
+            progress.empty()
+
+    def _render_section_review(self, content: str):
+        """Quick-review every top-level section in one batched call and show per-section scores."""
+        results_key = f"section_reviews_{self.document_name}"
+        if st.button(
+            "📑 Review Sections",
+            use_container_width=True,
+            key=f"{self.key_prefix}section_review_{self.document_name}",
+        ):
+            with st.spinner("Reviewing sections..."):
+                st.session_state[results_key] = self.critic_agent.quick_review_batch(
+                    self._top_level_sections(content)
+                )
+
+        reviews = st.session_state.get(results_key)
+        if not reviews:
+            return
+        with st.expander("📑 Section Reviews", expanded=True):
+            for name, review in reviews.items():
+                if review.get("error"):
+                    st.markdown(f"**{name}**: ❌ {review['error']}")
+                    continue
+                st.markdown(f"**{name}**: {review.get('score', 0):.0f}/100")
+                for strength in review.get("strengths", []):
+                    st.markdown(f"✅ {strength}")
+                for improvement in review.get("improvements", []):
+                    st.markdown(f"💡 {improvement}")
+
+    def _top_level_sections(self, content: str) -> dict[str, str]:
+        """Map the highest-level headings below the title to their section text."""
+        sections = [section for section in split_sections(content) if section.level > 1]
+        if not sections:
+            return {"Document": content}
+
+        level = min(section.level for section in sections)
+        named = {}
+        for section in sections:
+            if section.level == level:
+                name = section.title
+                if name in named:
+                    name = f"{name} ({len(named) + 1})"
+                named[name] = section_text(content, section)
+        return named
+
+
+class StreamingPreview:
+    """Live markdown preview that renders pipeline output as tokens stream in."""
+
+    STAGE_LABELS = {
+        "draft": "✍️ Drafting...",
+        "edit": "✏️ Polishing draft...",
+    }
+
+    def __init__(self, refresh_interval: float = 0.15):
+        """
+        Initialize streaming preview.
+
+        Args:
+            refresh_interval: Minimum seconds between re-renders of the preview
+        """
+        self.refresh_interval = refresh_interval
+        self._status = st.empty()
+        self._body = st.empty()
+        self._stage = None
+        self._text = ""
+        self._last_render = 0.0
+
+    def __call__(self, stage: str, delta: str):
+        """Append a streamed delta; a new stage replaces the previous stage's text."""
+        if stage != self._stage:
+            self._stage = stage
+            self._text = ""
+            self._status.caption(self.STAGE_LABELS.get(stage, f"🔁 {stage.replace('_', ' ')}..."))
+
+        self._text += delta
+        now = time.monotonic()
+        if now - self._last_render >= self.refresh_interval:
+            self._body.markdown(self._text)
+            self._last_render = now
+
+    def clear(self):
+        """Remove the preview once the final document is ready."""
+        self._status.empty()
+        self._body.empty()
+
+
 def render_simple_editor(document_content: str, document_name: str) -> tuple[str, bool]:
     """Simple fallback editor without AI features."""
     st.markdown(document_content)
@@ -10,7 +10,9 @@ from pathlib import Path
 import click
 from rich.console import Console
 from rich.panel import Panel
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TimeElapsedColumn
 
+from .services.ai_agents.telemetry import start_metrics_server_from_env
 from .services.document_generator import DocumentGenerator
 from .services.repo_bootstrapper import RepoBootstrapper
 from .wizard.phase1_initiation import run_initiation_wizard
@@ -26,7 +28,7 @@ def cli():
 
     Guides you through creating projects following formal PM methodology.
     """
-    pass
+    start_metrics_server_from_env()
 
 
 @cli.command()
@@ -170,5 +172,130 @@ def sync():
     console.print("This will create the project in OpenProject")
 
 
+@cli.command()
+@click.argument("pattern")
+@click.argument("project_paths", nargs=-1, type=click.Path(path_type=Path))
+@click.option(
+    "--registry",
+    "use_registry",
+    is_flag=True,
+    help="Add every project from the project registry",
+)
+@click.option(
+    "--filter",
+    "name_filter",
+    default=None,
+    help="Only registry projects whose name or type contains this text",
+)
+@click.option(
+    "--inputs",
+    "-i",
+    "inputs_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="JSON/YAML inputs: flat variables, or {defaults, projects: {path|name: ...}}",
+)
+@click.option("--workers", "-w", default=4, show_default=True, help="Projects generated at once")
+@click.option(
+    "--summary",
+    "summary_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="JSON summary file (default: generate_<pattern>_summary.json)",
+)
+@click.option("--resume", is_flag=True, help="Skip projects that succeeded in the summary file")
+@click.option("--overwrite", is_flag=True, help="Regenerate deliverables that already exist")
+@click.option("--no-critique", is_flag=True, help="Skip critique (no scores in the summary)")
+@click.option(
+    "--best-of",
+    default=1,
+    show_default=True,
+    help="Draft N candidates in parallel and keep the best-scoring one",
+)
+def generate(
+    pattern,
+    project_paths,
+    use_registry,
+    name_filter,
+    inputs_file,
+    workers,
+    summary_path,
+    resume,
+    overwrite,
+    no_critique,
+    best_of,
+):
+    """
+    Generate a deliverable for many projects (headless).
+
+    Example:
+        project-wizard generate 5w1h_analysis ~/projects/* --inputs 5w1h.yaml
+        project-wizard generate 5w1h_analysis --registry --filter clinical --resume
+    """
+    from .services.bulk_generator import BulkGenerator, load_inputs
+    from .services.pattern_registry import PatternRegistry
+    from .services.project_registry import ProjectRegistry
+
+    paths = list(project_paths)
+    if use_registry or name_filter:
+        for project in ProjectRegistry().list_projects(sort_by="name"):
+            haystack = f"{project.get('name', '')} {project.get('project_type', '')}".lower()
+            if name_filter and name_filter.lower() not in haystack:
+                continue
+            paths.append(Path(project["path"]))
+
+    if not paths:
+        console.print("[red]No projects given (pass paths or use --registry/--filter)[/red]")
+        raise SystemExit(1)
+
+    paths = sorted({path.resolve() for path in paths})
+    summary_path = summary_path or Path(f"generate_{pattern}_summary.json")
+    try:
+        generator = BulkGenerator(
+            PatternRegistry(),
+            pattern,
+            summary_path,
+            workers=workers,
+            enable_critique=not no_critique,
+            overwrite=overwrite,
+            best_of=best_of,
+        )
+        inputs = load_inputs(inputs_file)
+    except (ValueError, OSError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise SystemExit(1) from e
+
+    icons = {"ok": "[green]✓[/green]", "skipped": "[yellow]↷[/yellow]", "failed": "[red]✗[/red]"}
+
+    with Progress(
+        "[progress.description]{task.description}",
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task(f"Generating {pattern}", total=len(paths))
+
+        def on_result(path: str, entry: dict):
+            detail = entry.get("error") or (
+                f"score {entry['score']:.2f}" if entry.get("score") is not None else "done"
+            )
+            progress.console.print(f"{icons[entry['status']]} {path}: {detail}")
+            progress.advance(task)
+
+        summary = generator.run(paths, inputs, resume=resume, on_result=on_result)
+        progress.update(task, completed=len(paths))
+
+    totals = summary["totals"]
+    console.print(
+        f"\n[bold]{totals.get('ok', 0)} ok, {totals.get('skipped', 0)} skipped, "
+        f"{totals.get('failed', 0)} failed[/bold] — "
+        f"avg score {totals['average_score']}, "
+        f"{totals['tokens'].get('total_tokens', 0):,} tokens"
+    )
+    console.print(f"Summary written to {summary_path}")
+    if totals.get("failed"):
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
     cli()
@@ -3,14 +3,26 @@ AI Agents Module
 Specialized agents for document generation pipeline
 """
 
+from .backends import LLMBackend, OpenAIBackend
 from .charter_agent import CharterAgent
 from .critic_agent import CriticAgent
 from .draft_agent import DraftAgent
 from .editor_agent import EditorAgent
-from .llm_client import LLMClient
+from .llm_client import LLMClient, StreamEvent
+from .rate_limiter import Priority, RateLimiter
+from .single_flight import SingleFlight
+from .telemetry import Telemetry, call_context
 
 __all__ = [
     "LLMClient",
+    "StreamEvent",
+    "LLMBackend",
+    "OpenAIBackend",
+    "Priority",
+    "RateLimiter",
+    "SingleFlight",
+    "Telemetry",
+    "call_context",
     "CharterAgent",
     "CriticAgent",
     "DraftAgent",
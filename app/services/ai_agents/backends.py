@@ -0,0 +1,84 @@
+"""Pluggable chat-completion backends used by LLMClient."""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any
+
+from .http_pool import get_async_openai_client, get_openai_client
+
+logger = logging.getLogger(__name__)
+
+
+class LLMBackend(ABC):
+    """
+    Transport for chat-completion requests.
+
+    Implementations accept OpenAI chat-completions parameters and return
+    OpenAI-shaped response objects (or chunk iterators when stream=True), so
+    LLMClient's caching, limiting and parsing work unchanged on any backend.
+    """
+
+    name = "base"
+
+    @property
+    def identity(self) -> str:
+        """
+        Where responses come from, e.g. "openai:https://gateway/v1".
+
+        Part of every completion cache key, so responses from one backend or
+        endpoint are never served to a client talking to another.
+        """
+        return self.name
+
+    @abstractmethod
+    def create(self, messages: list[dict[str, str]], **params: Any) -> Any:
+        """Send a chat-completion request and return the response (or chunk stream)."""
+
+    @abstractmethod
+    async def acreate(self, messages: list[dict[str, str]], **params: Any) -> Any:
+        """Async twin of create()."""
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI API, or any OpenAI-compatible gateway reachable via base_url."""
+
+    name = "openai"
+
+    def __init__(self, api_key: str | None = None, base_url: str | None = None):
+        """
+        Initialize OpenAI backend.
+
+        Args:
+            api_key: API key (defaults to OPENAI_API_KEY env var)
+            base_url: Endpoint (defaults to OPENAI_BASE_URL env var, else api.openai.com)
+
+        Raises:
+            ValueError: If no API key is available for the public OpenAI endpoint
+        """
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+
+        if not self.api_key:
+            if not self.base_url:
+                raise ValueError(
+                    "OpenAI API key not found. Set OPENAI_API_KEY environment variable."
+                )
+            # Self-hosted gateways and the local fake server don't check keys
+            self.api_key = "local"
+
+        self.client = get_openai_client(self.api_key, self.base_url)
+
+    @property
+    def identity(self) -> str:
+        """Backend name plus endpoint (the public OpenAI API when base_url is unset)."""
+        return f"{self.name}:{self.base_url or 'https://api.openai.com/v1'}"
+
+    def create(self, messages: list[dict[str, str]], **params: Any) -> Any:
+        """Send a chat-completion request through the pooled sync client."""
+        return self.client.chat.completions.create(messages=messages, **params)
+
+    async def acreate(self, messages: list[dict[str, str]], **params: Any) -> Any:
+        """Send a chat-completion request through the pooled async client."""
+        client = get_async_openai_client(self.api_key, self.base_url)
+        return await client.chat.completions.create(messages=messages, **params)
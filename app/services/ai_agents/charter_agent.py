@@ -1,10 +1,17 @@
 """AI agent for drafting and enhancing project charter sections."""
 
+import asyncio
 import json
 import logging
+from collections.abc import Callable
 from pathlib import Path
 
+from ...utils.markdown_blocks import INERT_KINDS, Block, chunk_blocks, parse_blocks
+from .completion_cache import CompletionCache
+from .event_loop import call_in_caller, run_sync
 from .llm_client import LLMClient
+from .prompt_layout import PromptBuilder, PromptLayout
+from .rate_limiter import Priority
 
 logger = logging.getLogger(__name__)
 
@@ -12,14 +19,52 @@ logger = logging.getLogger(__name__)
 class CharterAgent:
     """AI agent specialized in drafting and enhancing project charter content."""
 
-    def __init__(self, llm_client: LLMClient | None = None):
+    GENERIC_SYSTEM_PROMPT = """You are a professional project manager.
+Enhance text for clarity and structure ONLY.
+Do NOT add facts, metrics, or data the user didn't provide."""
+
+    GENERIC_TASK = "Enhance the given text for professional clarity. Output only the enhanced text."
+
+    CHUNK_REQUIREMENTS = """CRITICAL REQUIREMENTS:
+1. Preserve ALL markdown formatting (headers #, lists -, bullets *, bold **, etc.)
+2. Preserve ALL section structure and hierarchy
+3. Do NOT remove or change any headers
+4. Do NOT change list formatting or numbering
+5. ONLY improve the wording within the existing structure
+6. Output ONLY the enhanced markdown text with no explanations or meta-commentary
+
+Keep exact same headers, lists, and formatting. Only improve the prose."""
+
+    CHUNK_CONTEXT_NOTE = """Text around the part may be given for context so your wording stays consistent with it. Enhance and output ONLY the part itself."""
+
+    # Characters of each neighbouring chunk sent as context with a chunk
+    NEIGHBOR_CONTEXT_CHARS = 300
+
+    # Structural block kinds -> instruction words that make them worth enhancing;
+    # otherwise they are passed through without an LLM call
+    STRUCTURAL_KEYWORDS = {
+        "table": ("table",),
+        "code": ("code", "snippet", "command"),
+    }
+
+    # Block kind for text resolved from the enhancement cache (never re-sent)
+    CACHED_KIND = "enhanced"
+
+    def __init__(
+        self,
+        llm_client: LLMClient | None = None,
+        enhancement_cache: CompletionCache | None = None,
+    ):
         """
         Initialize charter agent.
 
         Args:
-            llm_client: LLMClient instance (creates default if not provided)
+            llm_client: LLMClient instance (uses the shared client if not provided)
+            enhancement_cache: Cache of enhanced markdown blocks keyed by block,
+                instruction and model (defaults to the on-disk "enhancements" cache)
         """
-        self.llm = llm_client or LLMClient()
+        self.llm = (llm_client or LLMClient.shared()).for_agent("charter")
+        self.enhancement_cache = enhancement_cache or CompletionCache.default("enhancements")
         self.prompts_config = self._load_prompts()
         logger.info("CharterAgent initialized with structured prompts")
 
@@ -50,19 +95,76 @@ class CharterAgent:
         if not user_text or not user_text.strip():
             return user_text
 
+        request = self._build_section_request(section_key, user_text, feedback)
+        if request is None:
+            return self._generic_enhance(user_text)
+
+        system_prompt, user_prompt, max_tokens = request
+        try:
+            enhanced = self.llm.complete(
+                system_prompt,
+                user_prompt,
+                temperature=0.3,  # Conservative
+                max_tokens=max_tokens,
+                priority=Priority.INTERACTIVE,
+            )
+            return enhanced.strip()
+        except Exception as e:
+            logger.error(f"Enhancement failed: {e}")
+            return user_text
+
+    async def aenhance_section(
+        self, section_key: str, user_text: str, feedback: str | None = None
+    ) -> str:
+        """Async twin of enhance_section()."""
+        if not user_text or not user_text.strip():
+            return user_text
+
+        request = self._build_section_request(section_key, user_text, feedback)
+        if request is None:
+            return await self._ageneric_enhance(user_text)
+
+        system_prompt, user_prompt, max_tokens = request
+        try:
+            enhanced = await self.llm.acomplete(
+                system_prompt,
+                user_prompt,
+                temperature=0.3,  # Conservative
+                max_tokens=max_tokens,
+                priority=Priority.INTERACTIVE,
+            )
+            return enhanced.strip()
+        except Exception as e:
+            logger.error(f"Enhancement failed: {e}")
+            return user_text
+
+    def _build_section_request(
+        self, section_key: str, user_text: str, feedback: str | None
+    ) -> tuple[str, str, int] | None:
+        """
+        Build prompts for a structured section enhancement.
+
+        Returns:
+            Tuple of (system_prompt, user_prompt, max_tokens), or None when the
+            section has no config and the generic enhancement should be used
+        """
         # Get configuration for this section
         config = self.prompts_config.get(section_key, {})
         meta = self.prompts_config.get("meta", {})
 
         if not config:
             logger.warning(f"No config for {section_key}, using generic enhancement")
-            return self._generic_enhance(user_text)
+            return None
 
         # Build system prompt with constraints
         constraints = meta.get("constraints", [])
         forbidden = config.get("forbidden", [])
 
-        system_prompt = f"""You are a {meta.get("role", "professional project manager")}.
+        # Everything derived from config is static per section and forms the
+        # cacheable prefix; only the user's text and feedback vary
+        prompt = (
+            PromptBuilder(
+                f"""You are a {meta.get("role", "professional project manager")}.
 
 Style: {meta.get("style", "clear and professional")}
 Max words: {config.get("max_words", 150)}
@@ -73,12 +175,8 @@ CRITICAL CONSTRAINTS (you MUST follow these):
 FORBIDDEN ACTIONS (you MUST NOT do these):
 {chr(10).join(f"- {f}" for f in forbidden)}
 
-Your role is to enhance CLARITY and STRUCTURE, not to add content or data."""
-
-        # Build user prompt with example
-        feedback_text = f"\n\nSpecific feedback to address: {feedback}" if feedback else ""
-
-        user_prompt = f"""{config.get("instruction", "Enhance this text.")}
+Your role is to enhance CLARITY and STRUCTURE, not to add content or data.""",
+                f"""{config.get("instruction", "Enhance this text.")}
 
 Format: {config.get("format", "clear paragraph")}
 Tone: {config.get("tone", "professional")}
@@ -86,102 +184,227 @@ Tone: {config.get("tone", "professional")}
 Example of good output:
 {config.get("example", "N/A")}
 
-User's original text (PRESERVE ALL USER FACTS):
-{user_text}{feedback_text}
-
-Task: Enhance for clarity and professional structure ONLY. Do NOT add metrics, numbers, or facts the user did not provide. Output ONLY the enhanced text, nothing else."""
-
-        try:
-            enhanced = self.llm.complete(
-                system_prompt,
-                user_prompt,
-                temperature=0.3,  # Conservative
-                max_tokens=config.get("max_words", 150) * 2,
+Task: Enhance the user's text for clarity and professional structure ONLY. PRESERVE ALL USER FACTS. Do NOT add metrics, numbers, or facts the user did not provide. Output ONLY the enhanced text, nothing else.""",
             )
-            return enhanced.strip()
-        except Exception as e:
-            logger.error(f"Enhancement failed: {e}")
-            return user_text
-
-    def _generic_enhance(self, text: str) -> str:
-        """Fallback generic enhancement."""
-        system_prompt = """You are a professional project manager.
-Enhance text for clarity and structure ONLY.
-Do NOT add facts, metrics, or data the user didn't provide."""
-
-        user_prompt = f"""Enhance this for professional clarity:
+            .variable(feedback, heading="SPECIFIC FEEDBACK TO ADDRESS")
+            .variable(user_text, heading="USER'S ORIGINAL TEXT")
+            .build()
+        )
 
-{text}
+        return prompt.system, prompt.user, self.llm.words_to_tokens(config.get("max_words", 150))
 
-Output only the enhanced text."""
-
-        return self.llm.complete(system_prompt, user_prompt, temperature=0.3)
-
-    def enhance_large_document(self, text: str, feedback: str, chunk_size: int = 1000) -> str:
+    def _generic_enhance(self, text: str, priority: Priority = Priority.INTERACTIVE) -> str:
+        """Fallback generic enhancement."""
+        prompt = self._build_generic_prompt(text)
+        return self.llm.complete(
+            prompt.system,
+            prompt.user,
+            temperature=0.3,
+            priority=priority,
+        )
+
+    async def _ageneric_enhance(self, text: str, priority: Priority = Priority.INTERACTIVE) -> str:
+        """Async twin of _generic_enhance()."""
+        prompt = self._build_generic_prompt(text)
+        return await self.llm.acomplete(
+            prompt.system,
+            prompt.user,
+            temperature=0.3,
+            priority=priority,
+        )
+
+    def _build_generic_prompt(self, text: str) -> PromptLayout:
+        """Build a generic enhancement prompt."""
+        return PromptBuilder(self.GENERIC_SYSTEM_PROMPT, self.GENERIC_TASK).variable(text).build()
+
+    def enhance_large_document(
+        self,
+        text: str,
+        feedback: str,
+        chunk_tokens: int = 300,
+        max_parallel: int = 4,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> str:
         """
         Enhance a large document by processing it in chunks while preserving markdown structure.
 
+        The document is split into markdown blocks and chunked on block and
+        heading boundaries, so tables, lists and code are never cut in half.
+        Tables and code blocks the instruction doesn't mention are kept
+        verbatim without an LLM call. Enhanced text is cached per block
+        (paragraph, list, ...) with the instruction and model, under both the
+        original and the enhanced block, so enhancing the result again costs
+        nothing and after editing one paragraph only that paragraph is re-sent.
+        Chunks are enhanced concurrently and reassembled in order; each is sent
+        with the end of the previous chunk and the start of the next one as
+        read-only context, so style stays consistent across chunk boundaries.
+
         Args:
             text: Full document text
             feedback: Enhancement instructions
-            chunk_size: Characters per chunk (approximate)
+            chunk_tokens: Target tokens per chunk
+            max_parallel: Max chunks enhanced at once
+            on_progress: Called with (chunks done, chunks to enhance) as chunks
+                finish, on the calling thread
 
         Returns:
             Enhanced full document with preserved formatting
         """
-        if len(text) <= chunk_size:
-            return self._generic_enhance(text)
-
-        # Split into paragraphs
-        paragraphs = text.split("\n\n")
-
-        # Group paragraphs into chunks
-        chunks = []
-        current_chunk = []
-        current_size = 0
-
-        for para in paragraphs:
-            para_size = len(para)
-            if current_size + para_size > chunk_size and current_chunk:
-                chunks.append("\n\n".join(current_chunk))
-                current_chunk = [para]
-                current_size = para_size
-            else:
-                current_chunk.append(para)
-                current_size += para_size
-
-        if current_chunk:
-            chunks.append("\n\n".join(current_chunk))
-
-        # Enhance each chunk
-        enhanced_chunks = []
-        for i, chunk in enumerate(chunks):
-            system_prompt = f"""You are a professional editor enhancing part {i + 1} of {len(chunks)} of a markdown document.
-
-{feedback}
-
-CRITICAL REQUIREMENTS:
-1. Preserve ALL markdown formatting (headers #, lists -, bullets *, bold **, etc.)
-2. Preserve ALL section structure and hierarchy
-3. Do NOT remove or change any headers
-4. Do NOT change list formatting or numbering
-5. ONLY improve the wording within the existing structure
-6. Output ONLY the enhanced markdown text with no explanations or meta-commentary"""
-
-            user_prompt = f"""Enhance the text content while preserving ALL markdown structure:
-
-{chunk}
-
-Remember: Keep exact same headers, lists, and formatting. Only improve the prose."""
+        return run_sync(
+            self.aenhance_large_document(text, feedback, chunk_tokens, max_parallel, on_progress)
+        )
+
+    async def aenhance_large_document(
+        self,
+        text: str,
+        feedback: str,
+        chunk_tokens: int = 300,
+        max_parallel: int = 4,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> str:
+        """Async twin of enhance_large_document()."""
+        passthrough = self._passthrough_kinds(feedback)
+        # The part number and neighbours go in the user message so the system
+        # prompt is identical (and cacheable) across chunks
+        system_prompt = (
+            PromptBuilder(
+                "You are a professional editor enhancing one part of a markdown document.",
+                feedback,
+                self.CHUNK_REQUIREMENTS,
+                self.CHUNK_CONTEXT_NOTE,
+            )
+            .build()
+            .system
+        )
+
+        # Blocks enhanced before (or produced by an earlier enhancement) are
+        # resolved from the cache and never sent again
+        blocks = []
+        hits = 0
+        for block in parse_blocks(text):
+            if self._cacheable(block, passthrough):
+                cached = self.enhancement_cache.get(
+                    self._enhancement_key(system_prompt, block.text)
+                )
+                if cached is not None:
+                    hits += 1
+                    block = Block(self.CACHED_KIND, cached)
+            blocks.append(block)
+        if hits:
+            logger.info(f"Enhancement: {hits} blocks served from cache")
+
+        chunks = chunk_blocks(
+            blocks,
+            chunk_tokens,
+            self.llm.count_tokens,
+            passthrough_kinds=passthrough | {self.CACHED_KIND},
+        )
+        todo = [i for i, chunk in enumerate(chunks) if not chunk.passthrough]
+        if len(chunks) > len(todo):
+            logger.info(f"Enhancement: {len(chunks) - len(todo)} chunks kept as-is")
+
+        limit = asyncio.Semaphore(max(1, max_parallel))
+        done = 0
+
+        async def enhance_chunk(part: int, i: int) -> str:
+            nonlocal done
+            original = chunks[i].text
+            previous = chunks[i - 1].text[-self.NEIGHBOR_CONTEXT_CHARS :] if i else None
+            following = (
+                chunks[i + 1].text[: self.NEIGHBOR_CONTEXT_CHARS] if i + 1 < len(chunks) else None
+            )
+            user_prompt = (
+                PromptBuilder()
+                .variable(previous, heading="PRECEDING TEXT (context only)")
+                .variable(following, heading="FOLLOWING TEXT (context only)")
+                .variable(original, heading=f"PART {part + 1} OF {len(todo)} TO ENHANCE")
+                .build()
+                .user
+            )
+            async with limit:
+                try:
+                    enhanced = await self.llm.acomplete(
+                        system_prompt, user_prompt, temperature=0.2, priority=Priority.BULK
+                    )
+                    result = enhanced.strip() or original
+                    self._cache_blocks(system_prompt, original, result, passthrough)
+                except Exception as e:
+                    logger.error(f"Enhancement failed for chunk {i + 1}: {e}")
+                    result = original  # Use original on error
+
+            done += 1
+            if on_progress:
+                call_in_caller(on_progress, done, len(todo))
+            return result
+
+        enhanced = await asyncio.gather(*(enhance_chunk(part, i) for part, i in enumerate(todo)))
+        texts = [chunk.text for chunk in chunks]
+        for i, result in zip(todo, enhanced, strict=True):
+            texts[i] = result
+        return "\n\n".join(texts)
+
+    def _cacheable(self, block: Block, passthrough: set[str]) -> bool:
+        """Whether a block's enhancement is looked up in and stored to the cache."""
+        return (
+            self.enhancement_cache is not None
+            and block.kind not in INERT_KINDS
+            and block.kind not in passthrough
+        )
+
+    def _cache_blocks(
+        self, system_prompt: str, original: str, enhanced: str, passthrough: set[str]
+    ):
+        """
+        Store an enhanced chunk block by block.
 
-            try:
-                enhanced = self.llm.complete(system_prompt, user_prompt, temperature=0.2)
-                enhanced_chunks.append(enhanced.strip())
-            except Exception as e:
-                logger.error(f"Enhancement failed for chunk {i + 1}: {e}")
-                enhanced_chunks.append(chunk)  # Use original on error
+        Every enhanced block is stored as its own result (a fixed point), so
+        enhancing the output again is a cache hit rather than another round of
+        rewording. Original blocks are mapped to their enhanced versions only
+        when the model kept the block structure and the blocks line up.
+        """
+        if self.enhancement_cache is None:
+            return
+        after = parse_blocks(enhanced)
+        for new in after:
+            if self._cacheable(new, passthrough):
+                self._store_enhancement(system_prompt, new.text, new.text)
+
+        before = parse_blocks(original)
+        if [block.kind for block in before] != [block.kind for block in after]:
+            logger.debug("Enhancement: block structure changed, originals not cached")
+            return
+        for old, new in zip(before, after, strict=True):
+            if old.text != new.text and self._cacheable(old, passthrough):
+                self._store_enhancement(system_prompt, old.text, new.text)
+
+    def _store_enhancement(self, system_prompt: str, block: str, enhanced: str):
+        """Cache the enhanced version of one block."""
+        self.enhancement_cache.set(
+            self._enhancement_key(system_prompt, block), enhanced, model=self.llm.model
+        )
+
+    def _enhancement_key(self, system_prompt: str, block: str) -> str:
+        """
+        Cache key for one enhanced markdown block: (block, instruction, model, backend).
 
-        return "\n\n".join(enhanced_chunks)
+        Neighbour context is deliberately left out, so a block stays cached when
+        the paragraphs around it are edited.
+        """
+        return CompletionCache.make_key(
+            self.llm.model,
+            [{"role": "system", "content": system_prompt}, {"role": "user", "content": block}],
+            kind="enhance_block",
+            backend=self.llm.backend.identity,
+        )
+
+    def _passthrough_kinds(self, feedback: str) -> set[str]:
+        """Structural block kinds the instruction doesn't mention, which skip the LLM."""
+        instruction = (feedback or "").lower()
+        return {
+            kind
+            for kind, keywords in self.STRUCTURAL_KEYWORDS.items()
+            if not any(keyword in instruction for keyword in keywords)
+        }
 
     # Legacy methods for backward compatibility
     def draft_business_need(self, project_brief: str, context: dict = None) -> str:
@@ -0,0 +1,216 @@
+"""Persistent, content-addressed cache for LLM completions."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".project_wizard_cache"
+
+
+class CompletionCache:
+    """
+    SQLite-backed cache of completions keyed by a hash of the full request.
+
+    Entries are evicted by age first, then least-recently-used until the
+    cache is back under its entry and size limits.
+    """
+
+    _instances: dict[str, "CompletionCache"] = {}
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        max_entries: int = 5000,
+        max_bytes: int = 200 * 1024 * 1024,
+        max_age_seconds: float = 30 * 24 * 3600,
+    ):
+        """
+        Initialize completion cache.
+
+        Args:
+            db_path: SQLite file (defaults to LLM_CACHE_DIR or ~/.project_wizard_cache)
+            max_entries: Maximum number of cached completions
+            max_bytes: Maximum total size of cached completions in bytes
+            max_age_seconds: Entries older than this are discarded
+        """
+        if db_path is None:
+            cache_dir = Path(os.getenv("LLM_CACHE_DIR", DEFAULT_CACHE_DIR)).expanduser()
+            db_path = cache_dir / "completions.sqlite3"
+
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_completions_accessed ON completions (accessed_at)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def default(cls, name: str = "completions") -> "CompletionCache | None":
+        """
+        Get a process-wide cache shared by all clients.
+
+        Args:
+            name: Cache name; each name is a separate SQLite file in the cache
+                directory (e.g. "enhancements" for per-chunk enhancement results)
+
+        Returns:
+            Shared cache, or None if disabled via LLM_CACHE_DISABLED or unusable
+        """
+        if os.getenv("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+            return None
+
+        with cls._default_lock:
+            if name not in cls._instances:
+                try:
+                    cache_dir = Path(os.getenv("LLM_CACHE_DIR", DEFAULT_CACHE_DIR)).expanduser()
+                    cls._instances[name] = cls(cache_dir / f"{name}.sqlite3")
+                except Exception as e:
+                    logger.warning(f"Completion cache '{name}' unavailable: {e}")
+                    return None
+            return cls._instances[name]
+
+    @staticmethod
+    def make_key(model: str, messages: list[dict[str, str]], **params: Any) -> str:
+        """
+        Build a content-addressed key for a request.
+
+        Args:
+            model: Model name
+            messages: Chat messages sent to the model
+            **params: Sampling parameters (temperature, max_tokens, ...)
+
+        Returns:
+            Hex SHA-256 digest of the canonicalized request
+        """
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Return cached content for key, or None on miss or expiry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.max_age_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, content: str, model: str | None = None):
+        """Store content under key and evict entries over the configured limits."""
+        if not content:
+            return
+
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, content, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str):
+        """Remove one entry, e.g. a completion that turned out to be unusable."""
+        with self._lock:
+            self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least-recently-used ones over the limits."""
+        self._conn.execute(
+            "DELETE FROM completions WHERE created_at < ?", (now - self.max_age_seconds,)
+        )
+
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT key, size FROM completions ORDER BY accessed_at ASC"
+        ).fetchall()
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+
+        logger.info(f"Completion cache: evicted {evicted} entries")
+
+    def clear(self):
+        """Remove all cached completions and reset counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with hits, misses, hit_rate, entries and bytes
+        """
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": count,
+            "bytes": total,
+        }
@@ -1,10 +1,14 @@
 """AI agent for critiquing and improving project charters."""
 
-import json
+import asyncio
 import logging
-import re
+from collections.abc import Callable
 
+from .event_loop import run_sync
 from .llm_client import LLMClient
+from .prompt_layout import PromptBuilder, PromptLayout
+from .rate_limiter import Priority
+from .structured_output import CriterionScore, Critique, QuickReview, QuickReviewBatch
 
 logger = logging.getLogger(__name__)
 
@@ -24,114 +28,303 @@ Be constructive but rigorous. Flag issues that could lead to project failure.
 
 CRITICAL: You must respond with valid JSON only. No markdown, no code blocks, no extra text."""
 
+    DEFAULT_RUBRIC = {
+        "criteria": [
+            {"name": "Clarity of Goal", "weight": 0.20},
+            {"name": "Scope & Deliverables", "weight": 0.20},
+            {"name": "Risks & Mitigations", "weight": 0.15},
+            {"name": "Success Criteria", "weight": 0.15},
+            {"name": "Strategic Alignment", "weight": 0.15},
+            {"name": "Stakeholders & Resources", "weight": 0.15},
+        ],
+        "threshold": 0.75,
+    }
+
+    # Static prompt blocks live in the system message so the prefix is cacheable
+    CRITIQUE_FORMAT = """For each criterion, provide:
+1. Score (0-100)
+2. Strengths (brief, 1-2 sentences)
+3. Weaknesses (brief, 1-2 sentences)
+4. Improvements (specific actions, 1-2 sentences)
+
+Respond with ONLY valid JSON in this exact format (no markdown, no code blocks):
+{
+  "scores": [
+    {"criterion": "Clarity of Goal", "score": 85, "strengths": "Clear goal statement", "weaknesses": "Could be more measurable", "improvements": "Add specific metrics"},
+    {"criterion": "Scope & Deliverables", "score": 80, "strengths": "...", "weaknesses": "...", "improvements": "..."},
+    {"criterion": "Risks & Mitigations", "score": 75, "strengths": "...", "weaknesses": "...", "improvements": "..."},
+    {"criterion": "Success Criteria", "score": 85, "strengths": "...", "weaknesses": "...", "improvements": "..."},
+    {"criterion": "Strategic Alignment", "score": 80, "strengths": "...", "weaknesses": "...", "improvements": "..."},
+    {"criterion": "Stakeholders & Resources", "score": 75, "strengths": "...", "weaknesses": "...", "improvements": "..."}
+  ],
+  "overall_assessment": "Brief overall summary",
+  "critical_gaps": ["Gap 1", "Gap 2"],
+  "recommended_next_steps": ["Step 1", "Step 2"]
+}"""
+
+    CRITERION_FORMAT = """Score the charter on ONE criterion only, given after the charter.
+
+Provide:
+1. Score (0-100)
+2. Strengths (brief, 1-2 sentences)
+3. Weaknesses (brief, 1-2 sentences)
+4. Improvements (specific actions, 1-2 sentences)
+
+Respond with ONLY valid JSON (no markdown):
+{"criterion": "Clarity of Goal", "score": 85, "strengths": "...", "weaknesses": "...", "improvements": "..."}"""
+
+    # Attempts per criterion in per-criterion mode (each already includes a JSON repair call)
+    CRITERION_ATTEMPTS = 2
+
+    QUICK_REVIEW_FORMAT = """Review the given section from a project charter.
+
+Evaluate on:
+- Clarity and specificity
+- Completeness
+- Professional quality
+- Actionability
+
+Respond with ONLY valid JSON (no markdown):
+{
+  "score": 85,
+  "strengths": ["Strength 1", "Strength 2"],
+  "improvements": ["Improvement 1", "Improvement 2"]
+}"""
+
+    QUICK_REVIEW_BATCH_FORMAT = """Review each of the given sections from a project charter separately.
+
+Evaluate each section on:
+- Clarity and specificity
+- Completeness
+- Professional quality
+- Actionability
+
+Return one review per section, using the section names exactly as given.
+Respond with ONLY valid JSON (no markdown):
+{
+  "reviews": [
+    {"section": "Project Goal", "score": 85, "strengths": ["Strength 1"], "improvements": ["Improvement 1"]}
+  ]
+}"""
+
+    # Expected reply tokens per section in a batched quick review
+    REVIEW_TOKENS_PER_SECTION = 250
+
+    SUGGESTIONS_FORMAT = """Based on the charter critique, provide specific, actionable improvements.
+
+For each gap, suggest:
+1. What specifically should be added/changed
+2. Where it should be added
+3. Example text (1-2 sentences)
+
+Format as a numbered action list."""
+
     def __init__(self, llm_client: LLMClient | None = None):
         """
         Initialize critic agent.
 
         Args:
-            llm_client: LLMClient instance (creates default if not provided)
+            llm_client: LLMClient instance (uses the shared client if not provided)
         """
-        self.llm = llm_client or LLMClient()
+        self.llm = (llm_client or LLMClient.shared()).for_agent("critic")
         logger.info("CriticAgent initialized")
 
-    def _extract_json(self, text: str) -> dict:
-        """Extract JSON from text that might contain markdown or other wrapping."""
-        # Remove markdown code blocks
-        text = re.sub(r"```json\s*", "", text)
-        text = re.sub(r"```\s*", "", text)
-
-        # Try to find JSON object
-        json_match = re.search(r"\{.*\}", text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
-                pass
-
-        # If that fails, try the whole text
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON: {e}")
-            logger.error(f"Response text: {text[:500]}")
-            raise
-
-    def critique_charter(self, charter_text: str, rubric: dict | None = None) -> dict:
+    def critique_charter(
+        self, charter_text: str, rubric: dict | None = None, per_criterion: bool = False
+    ) -> dict:
         """
         Provide comprehensive critique of a charter.
 
         Args:
             charter_text: Full charter text
             rubric: Scoring rubric (criteria and weights)
+            per_criterion: Score each criterion in its own small concurrent call
+                instead of one call for the whole rubric
 
         Returns:
             Dict with scores, feedback, and approval status
         """
-        default_rubric = {
-            "criteria": [
-                {"name": "Clarity of Goal", "weight": 0.20},
-                {"name": "Scope & Deliverables", "weight": 0.20},
-                {"name": "Risks & Mitigations", "weight": 0.15},
-                {"name": "Success Criteria", "weight": 0.15},
-                {"name": "Strategic Alignment", "weight": 0.15},
-                {"name": "Stakeholders & Resources", "weight": 0.15},
-            ],
-            "threshold": 0.75,
-        }
-
-        rubric = rubric or default_rubric
-
-        prompt = f"""Evaluate this project charter against the following criteria:
-
-{self._format_rubric(rubric)}
-
-CHARTER TO EVALUATE:
-{charter_text}
-
-For each criterion, provide:
-1. Score (0-100)
-2. Strengths (brief, 1-2 sentences)
-3. Weaknesses (brief, 1-2 sentences)
-4. Improvements (specific actions, 1-2 sentences)
-
-Respond with ONLY valid JSON in this exact format (no markdown, no code blocks):
-{{
-  "scores": [
-    {{"criterion": "Clarity of Goal", "score": 85, "strengths": "Clear goal statement", "weaknesses": "Could be more measurable", "improvements": "Add specific metrics"}},
-    {{"criterion": "Scope & Deliverables", "score": 80, "strengths": "...", "weaknesses": "...", "improvements": "..."}},
-    {{"criterion": "Risks & Mitigations", "score": 75, "strengths": "...", "weaknesses": "...", "improvements": "..."}},
-    {{"criterion": "Success Criteria", "score": 85, "strengths": "...", "weaknesses": "...", "improvements": "..."}},
-    {{"criterion": "Strategic Alignment", "score": 80, "strengths": "...", "weaknesses": "...", "improvements": "..."}},
-    {{"criterion": "Stakeholders & Resources", "score": 75, "strengths": "...", "weaknesses": "...", "improvements": "..."}}
-  ],
-  "overall_assessment": "Brief overall summary",
-  "critical_gaps": ["Gap 1", "Gap 2"],
-  "recommended_next_steps": ["Step 1", "Step 2"]
-}}"""
+        rubric = rubric or self.DEFAULT_RUBRIC
+        if per_criterion:
+            return run_sync(self._acritique_per_criterion(charter_text, rubric))
 
         try:
-            response = self.llm.complete(
-                self.SYSTEM_PROMPT, prompt, temperature=0.2, max_tokens=2000
+            prompt = self._build_critique_prompt(charter_text, rubric)
+            critique = self.llm.complete_json(
+                prompt.system,
+                prompt.user,
+                Critique,
+                temperature=0.2,
+                max_tokens=2000,
+                check=self._rubric_check(rubric),
             )
+            return self._finalize_critique(critique, rubric)
 
-            critique = self._extract_json(response)
+        except Exception as e:
+            logger.error(f"Critique failed: {e}")
+            return self._failed_critique(e)
 
-            # Calculate weighted score
-            critique["weighted_score"] = self._calculate_weighted_score(
-                critique.get("scores", []), rubric["criteria"]
-            )
-            critique["approved"] = critique["weighted_score"] >= rubric["threshold"]
+    async def acritique_charter(
+        self, charter_text: str, rubric: dict | None = None, per_criterion: bool = False
+    ) -> dict:
+        """Async twin of critique_charter()."""
+        rubric = rubric or self.DEFAULT_RUBRIC
+        if per_criterion:
+            return await self._acritique_per_criterion(charter_text, rubric)
 
-            return critique
+        try:
+            prompt = self._build_critique_prompt(charter_text, rubric)
+            critique = await self.llm.acomplete_json(
+                prompt.system,
+                prompt.user,
+                Critique,
+                temperature=0.2,
+                max_tokens=2000,
+                check=self._rubric_check(rubric),
+            )
+            return self._finalize_critique(critique, rubric)
 
         except Exception as e:
             logger.error(f"Critique failed: {e}")
-            return {
-                "scores": [],
-                "weighted_score": 0.0,
-                "approved": False,
-                "error": f"Critique failed: {str(e)}",
-            }
+            return self._failed_critique(e)
+
+    def _build_critique_prompt(self, charter_text: str, rubric: dict) -> PromptLayout:
+        """Build a full rubric critique prompt; instructions and rubric form the prefix."""
+        return (
+            PromptBuilder(self.SYSTEM_PROMPT)
+            .static(
+                "Evaluate the charter against the following criteria:\n\n"
+                + self._format_rubric(rubric),
+                self.CRITIQUE_FORMAT,
+            )
+            .variable(charter_text, heading="CHARTER TO EVALUATE")
+            .build()
+        )
+
+    async def _acritique_per_criterion(self, charter_text: str, rubric: dict) -> dict:
+        """
+        Score every criterion concurrently and merge the results into one critique.
+
+        Each call only returns one small score object, so latency no longer grows
+        with the rubric size. A criterion that fails is retried on its own. One
+        that still fails after CRITERION_ATTEMPTS doesn't affect the others:
+        their scores are kept, the weights are renormalised over the criteria
+        that were scored and it is listed under "failed_criteria". The critique
+        only fails if no criterion could be scored.
+        """
+        criteria = rubric["criteria"]
+        results = await asyncio.gather(
+            *(self._ascore_criterion(charter_text, criterion) for criterion in criteria),
+            return_exceptions=True,
+        )
+        scores = []
+        failed = []
+        for criterion, result in zip(criteria, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Critique of '{criterion['name']}' failed: {result}")
+                failed.append(criterion["name"])
+            else:
+                scores.append(result)
+        if not scores:
+            error = next((r for r in results if isinstance(r, BaseException)), None)
+            return self._failed_critique(error or ValueError("rubric has no criteria"))
+
+        ranked = sorted(scores, key=lambda score: score.score)
+        weak = [score for score in ranked if score.score < 70]
+        critique = Critique(
+            scores=scores,
+            overall_assessment=(
+                f"Scored per criterion; weakest: {ranked[0].criterion} ({ranked[0].score:.0f})"
+            ),
+            critical_gaps=[f"{score.criterion}: {score.weaknesses}" for score in weak],
+            recommended_next_steps=list(
+                dict.fromkeys(score.improvements for score in ranked[:3] if score.improvements)
+            ),
+        )
+        if not failed:
+            return self._finalize_critique(critique, rubric)
+
+        # A transient failure shouldn't drag the score down: weigh only what was scored
+        scored = [criterion for criterion in criteria if criterion["name"] not in failed]
+        total = sum(criterion["weight"] for criterion in criteria)
+        scored_total = sum(criterion["weight"] for criterion in scored)
+        if scored_total > 0:
+            scored = [
+                {**criterion, "weight": criterion["weight"] * total / scored_total}
+                for criterion in scored
+            ]
+        result = self._finalize_critique(critique, {**rubric, "criteria": scored})
+        result["failed_criteria"] = failed
+        return result
+
+    async def _ascore_criterion(self, charter_text: str, criterion: dict) -> CriterionScore:
+        """Score one criterion, retrying it alone (uncached) if the call fails."""
+        prompt = self._build_criterion_prompt(charter_text, criterion)
+        for attempt in range(self.CRITERION_ATTEMPTS):
+            try:
+                score = await self.llm.acomplete_json(
+                    prompt.system,
+                    prompt.user,
+                    CriterionScore,
+                    temperature=0.2,
+                    max_tokens=400,
+                    bypass_cache=attempt > 0,
+                )
+                # The rubric name is authoritative for the weighted score
+                return score.model_copy(update={"criterion": criterion["name"]})
+            except Exception as e:
+                if attempt == self.CRITERION_ATTEMPTS - 1:
+                    raise
+                logger.warning(f"Critique of '{criterion['name']}' failed, retrying: {e}")
+
+    def _build_criterion_prompt(self, charter_text: str, criterion: dict) -> PromptLayout:
+        """Build a one-criterion prompt; the charter precedes the criterion so calls share a prefix."""
+        description = criterion.get("description", "")
+        return (
+            PromptBuilder(self.SYSTEM_PROMPT, self.CRITERION_FORMAT)
+            .variable(charter_text, heading="CHARTER TO EVALUATE")
+            .variable(
+                f"{criterion['name']}: {description}" if description else criterion["name"],
+                heading="CRITERION",
+            )
+            .build()
+        )
+
+    def _rubric_check(self, rubric: dict) -> Callable[[Critique], str | None]:
+        """Build a validation check that every rubric criterion was scored."""
+        names = [criterion["name"] for criterion in rubric["criteria"]]
+
+        def check(critique: Critique) -> str | None:
+            scored = {score.criterion for score in critique.scores}
+            missing = [name for name in names if name not in scored]
+            if missing:
+                return (
+                    f"scores are missing these criteria (use the exact names): {', '.join(missing)}"
+                )
+            return None
+
+        return check
+
+    def _finalize_critique(self, result: Critique, rubric: dict) -> dict:
+        """Attach the weighted score and approval to a validated critique."""
+        critique = result.model_dump()
+
+        # Calculate weighted score
+        critique["weighted_score"] = self._calculate_weighted_score(
+            critique.get("scores", []), rubric["criteria"]
+        )
+        critique["approved"] = critique["weighted_score"] >= rubric["threshold"]
+
+        return critique
+
+    def _failed_critique(self, error: Exception) -> dict:
+        """Build the result returned when a critique cannot be produced."""
+        return {
+            "scores": [],
+            "weighted_score": 0.0,
+            "approved": False,
+            "error": f"Critique failed: {str(error)}",
+        }
 
     def quick_review(self, section_name: str, section_text: str) -> dict:
         """
@@ -144,29 +337,137 @@ Respond with ONLY valid JSON in this exact format (no markdown, no code blocks):
         Returns:
             Dict with score and feedback
         """
-        prompt = f"""Review this {section_name} section from a project charter:
+        try:
+            prompt = self._build_quick_review_prompt(section_name, section_text)
+            review = self.llm.complete_json(
+                prompt.system,
+                prompt.user,
+                QuickReview,
+                temperature=0.2,
+                priority=Priority.INTERACTIVE,
+            )
+            return review.model_dump()
+        except Exception as e:
+            logger.error(f"Quick review failed: {e}")
+            return {"score": 0, "error": f"Review failed: {str(e)}"}
 
-{section_text}
+    async def aquick_review(self, section_name: str, section_text: str) -> dict:
+        """Async twin of quick_review()."""
+        try:
+            prompt = self._build_quick_review_prompt(section_name, section_text)
+            review = await self.llm.acomplete_json(
+                prompt.system,
+                prompt.user,
+                QuickReview,
+                temperature=0.2,
+                priority=Priority.INTERACTIVE,
+            )
+            return review.model_dump()
+        except Exception as e:
+            logger.error(f"Quick review failed: {e}")
+            return {"score": 0, "error": f"Review failed: {str(e)}"}
 
-Evaluate on:
-- Clarity and specificity
-- Completeness
-- Professional quality
-- Actionability
+    def quick_review_batch(self, sections: dict[str, str]) -> dict[str, dict]:
+        """
+        Quick review of several sections, packed into as few calls as fit.
 
-Respond with ONLY valid JSON (no markdown):
-{{
-  "score": 85,
-  "strengths": ["Strength 1", "Strength 2"],
-  "improvements": ["Improvement 1", "Improvement 2"]
-}}"""
+        Sections are sent together in one prompt; they are only split across
+        several (concurrent) calls when prompt plus expected reply would
+        overflow the context window.
 
+        Args:
+            sections: Section name -> section content
+
+        Returns:
+            Section name -> dict with score and feedback (as quick_review())
+        """
+        return run_sync(self.aquick_review_batch(sections))
+
+    async def aquick_review_batch(self, sections: dict[str, str]) -> dict[str, dict]:
+        """Async twin of quick_review_batch()."""
+        sections = {name: text for name, text in sections.items() if text and text.strip()}
+        if not sections:
+            return {}
+
+        batches = self._pack_review_batches(sections)
+        if len(batches) > 1:
+            logger.info(f"Quick review: {len(sections)} sections split into {len(batches)} calls")
+        results = await asyncio.gather(*(self._areview_batch(batch) for batch in batches))
+        return {name: review for batch in results for name, review in batch.items()}
+
+    async def _areview_batch(self, batch: dict[str, str]) -> dict[str, dict]:
+        """Review one packed batch; a failed call marks each of its sections as failed."""
         try:
-            response = self.llm.complete(self.SYSTEM_PROMPT, prompt, temperature=0.2)
-            return self._extract_json(response)
+            prompt = self._build_quick_review_batch_prompt(batch)
+            result = await self.llm.acomplete_json(
+                prompt.system,
+                prompt.user,
+                QuickReviewBatch,
+                temperature=0.2,
+                max_tokens=self.REVIEW_TOKENS_PER_SECTION * len(batch),
+                priority=Priority.INTERACTIVE,
+                check=self._batch_check(batch),
+            )
         except Exception as e:
             logger.error(f"Quick review failed: {e}")
-            return {"score": 0, "error": f"Review failed: {str(e)}"}
+            return {name: {"score": 0, "error": f"Review failed: {str(e)}"} for name in batch}
+
+        reviews = {
+            review.section: review.model_dump(exclude={"section"}) for review in result.reviews
+        }
+        return {name: reviews[name] for name in batch}
+
+    def _pack_review_batches(self, sections: dict[str, str]) -> list[dict[str, str]]:
+        """
+        Greedily group sections into batches whose prompt and reply fit the model.
+
+        fits_context() clamps the reply to the model's output limit, so the
+        reply budget is also checked against that limit; otherwise a large
+        batch would pass and its JSON reply be cut off at max_tokens.
+        """
+        max_output = self.llm.estimator.max_output_tokens
+        batches: list[dict[str, str]] = []
+        batch: dict[str, str] = {}
+        for name, text in sections.items():
+            candidate = {**batch, name: text}
+            prompt = self._build_quick_review_batch_prompt(candidate)
+            output_tokens = self.REVIEW_TOKENS_PER_SECTION * len(candidate)
+            if batch and (
+                output_tokens > max_output
+                or not self.llm.fits_context(prompt.system, prompt.user, output_tokens)
+            ):
+                batches.append(batch)
+                candidate = {name: text}
+            batch = candidate
+        batches.append(batch)
+        return batches
+
+    def _batch_check(self, batch: dict[str, str]) -> Callable[[QuickReviewBatch], str | None]:
+        """Build a validation check that every section in the batch was reviewed."""
+
+        def check(result: QuickReviewBatch) -> str | None:
+            reviewed = {review.section for review in result.reviews}
+            missing = [name for name in batch if name not in reviewed]
+            if missing:
+                return f"reviews are missing these sections (use the exact names): {', '.join(missing)}"
+            return None
+
+        return check
+
+    def _build_quick_review_batch_prompt(self, batch: dict[str, str]) -> PromptLayout:
+        """Build a multi-section review prompt with one block per section."""
+        builder = PromptBuilder(self.SYSTEM_PROMPT, self.QUICK_REVIEW_BATCH_FORMAT)
+        for name, text in batch.items():
+            builder.variable(text, heading=f"SECTION: {name}")
+        return builder.build()
+
+    def _build_quick_review_prompt(self, section_name: str, section_text: str) -> PromptLayout:
+        """Build a single-section review prompt."""
+        return (
+            PromptBuilder(self.SYSTEM_PROMPT, self.QUICK_REVIEW_FORMAT)
+            .variable(section_text, heading=f"SECTION: {section_name}")
+            .build()
+        )
 
     def suggest_improvements(self, charter_text: str, critique_results: dict) -> str:
         """
@@ -179,25 +480,25 @@ Respond with ONLY valid JSON (no markdown):
         Returns:
             Improvement suggestions as formatted text
         """
-        gaps = critique_results.get("critical_gaps", [])
-        gaps_text = "\n".join([f"- {gap}" for gap in gaps])
-
-        prompt = f"""Based on this charter critique, provide specific, actionable improvements:
-
-IDENTIFIED GAPS:
-{gaps_text}
+        prompt = self._build_suggestions_prompt(charter_text, critique_results)
+        return self.llm.complete(prompt.system, prompt.user, temperature=0.4)
 
-CURRENT CHARTER:
-{charter_text[:1000]}...
+    async def asuggest_improvements(self, charter_text: str, critique_results: dict) -> str:
+        """Async twin of suggest_improvements()."""
+        prompt = self._build_suggestions_prompt(charter_text, critique_results)
+        return await self.llm.acomplete(prompt.system, prompt.user, temperature=0.4)
 
-For each gap, suggest:
-1. What specifically should be added/changed
-2. Where it should be added
-3. Example text (1-2 sentences)
-
-Format as a numbered action list."""
+    def _build_suggestions_prompt(self, charter_text: str, critique_results: dict) -> PromptLayout:
+        """Build a gap-driven improvement suggestions prompt."""
+        gaps = critique_results.get("critical_gaps", [])
+        gaps_text = "\n".join([f"- {gap}" for gap in gaps])
 
-        return self.llm.complete(self.SYSTEM_PROMPT, prompt, temperature=0.4)
+        return (
+            PromptBuilder(self.SYSTEM_PROMPT, self.SUGGESTIONS_FORMAT)
+            .variable(gaps_text, heading="IDENTIFIED GAPS")
+            .variable(f"{charter_text[:1000]}...", heading="CURRENT CHARTER")
+            .build()
+        )
 
     def _format_rubric(self, rubric: dict) -> str:
         """Format rubric for prompt."""
@@ -4,8 +4,11 @@ First stage: Generate initial document from user inputs and pattern
 """
 
 import logging
+from collections.abc import Callable
 
 from .llm_client import LLMClient
+from .prompt_layout import PromptBuilder, PromptLayout
+from .rate_limiter import Priority
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +19,28 @@ class DraftAgent:
     Follows Unix philosophy: does ONE thing well - creates initial content.
     """
 
+    SECTION_TASK = """# SECTION UPDATE
+
+The inputs changed after the current document was written. Rewrite ONLY the section given last so it reflects the updated inputs, staying consistent with the rest of the document.
+
+- Start with the section's heading line exactly as given
+- Keep its subheadings and format; include nothing from other sections
+- Return only the rewritten section in markdown"""
+
     def __init__(self, llm_client: LLMClient = None):
         """Initialize with LLM client"""
-        self.llm = llm_client or LLMClient()
+        self.llm = (llm_client or LLMClient.shared()).for_agent("draft")
 
     def generate_draft(
-        self, system_prompt: str, user_prompt: str, temperature: float = 0.3, max_tokens: int = 2000
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        on_token: Callable[[str], None] | None = None,
+        output_key: str | None = None,
+        hedge: bool = False,
+        output_basis: str | None = None,
     ) -> str:
         """
         Generate initial draft from prompts
@@ -31,31 +50,158 @@ class DraftAgent:
             user_prompt: Rendered user.md with variables and context
             temperature: LLM temperature (lower = more deterministic)
             max_tokens: Maximum response length
+            on_token: Optional callback receiving text deltas as they stream in
+            output_key: Ratio key (e.g. "work_plan:draft") to size max_tokens from
+                observed output; max_tokens is used until a ratio is known and as
+                the minimum afterwards
+            output_basis: Text the draft length scales with (defaults to the whole
+                prompt); keeps project context size out of the learned ratio
+            hedge: Race a duplicate request when the first token is unusually slow
+                (ignored when streaming to on_token)
 
         Returns:
             Draft document content
         """
         logger.info("DraftAgent: Generating initial draft")
 
+        request = {
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "priority": Priority.BULK,
+            "output_key": output_key,
+            "output_basis": output_basis,
+        }
+
         try:
-            draft = self.llm.complete(
+            if on_token:
+                draft = self.llm.stream_to_callback(on_token, **request)
+            else:
+                draft = self.llm.complete(**request, hedge=hedge)
+
+            return self._finalize_draft(draft)
+
+        except Exception as e:
+            logger.error(f"DraftAgent: Draft generation failed: {e}")
+            return f"[ERROR: Draft generation failed - {str(e)}]"
+
+    async def agenerate_draft(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        output_key: str | None = None,
+        hedge: bool = False,
+        output_basis: str | None = None,
+    ) -> str:
+        """Async twin of generate_draft()."""
+        logger.info("DraftAgent: Generating initial draft (async)")
+
+        try:
+            draft = await self.llm.acomplete(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                priority=Priority.BULK,
+                output_key=output_key,
+                output_basis=output_basis,
+                hedge=hedge,
             )
-
-            if not draft or not draft.strip():
-                logger.error("DraftAgent: Received empty draft from LLM")
-                return "[ERROR: Empty response from AI]"
-
-            logger.info(f"DraftAgent: Generated draft ({len(draft)} chars)")
-            return draft.strip()
+            return self._finalize_draft(draft)
 
         except Exception as e:
             logger.error(f"DraftAgent: Draft generation failed: {e}")
             return f"[ERROR: Draft generation failed - {str(e)}]"
 
+    def redraft_section(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        document: str,
+        section: str,
+        temperature: float = 0.3,
+        max_tokens: int = 1500,
+    ) -> str:
+        """
+        Rewrite one section of an existing document for changed inputs
+
+        Args:
+            system_prompt: Pattern's system.md content (AI instructions)
+            user_prompt: User prompt rendered with the updated inputs
+            document: Current full document, for consistency
+            section: The section to rewrite, heading included
+            temperature: LLM temperature
+            max_tokens: Maximum response length
+
+        Returns:
+            Rewritten section, or an error marker
+        """
+        logger.info("DraftAgent: Redrafting section")
+        prompt = self._build_section_prompt(system_prompt, user_prompt, document, section)
+        try:
+            redraft = self.llm.complete(
+                system_prompt=prompt.system,
+                user_prompt=prompt.user,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                priority=Priority.BULK,
+            )
+            return self._finalize_draft(redraft)
+
+        except Exception as e:
+            logger.error(f"DraftAgent: Section redraft failed: {e}")
+            return f"[ERROR: Section redraft failed - {str(e)}]"
+
+    async def aredraft_section(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        document: str,
+        section: str,
+        temperature: float = 0.3,
+        max_tokens: int = 1500,
+    ) -> str:
+        """Async twin of redraft_section()."""
+        logger.info("DraftAgent: Redrafting section (async)")
+        prompt = self._build_section_prompt(system_prompt, user_prompt, document, section)
+        try:
+            redraft = await self.llm.acomplete(
+                system_prompt=prompt.system,
+                user_prompt=prompt.user,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                priority=Priority.BULK,
+            )
+            return self._finalize_draft(redraft)
+
+        except Exception as e:
+            logger.error(f"DraftAgent: Section redraft failed: {e}")
+            return f"[ERROR: Section redraft failed - {str(e)}]"
+
+    def _build_section_prompt(
+        self, system_prompt: str, user_prompt: str, document: str, section: str
+    ) -> PromptLayout:
+        """Shared inputs and document first, so concurrent section calls share a cached prefix."""
+        return (
+            PromptBuilder(system_prompt, self.SECTION_TASK)
+            .variable(user_prompt, heading="UPDATED INPUTS")
+            .variable(document, heading="CURRENT DOCUMENT")
+            .variable(section, heading="SECTION TO REWRITE")
+            .build()
+        )
+
+    def _finalize_draft(self, draft: str | None) -> str:
+        """Normalize raw LLM output into a draft or an error marker."""
+        if not draft or not draft.strip():
+            logger.error("DraftAgent: Received empty draft from LLM")
+            return "[ERROR: Empty response from AI]"
+
+        logger.info(f"DraftAgent: Generated draft ({len(draft)} chars)")
+        return draft.strip()
+
     def generate_with_context(
         self,
         system_prompt: str,
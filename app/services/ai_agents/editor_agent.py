@@ -3,9 +3,14 @@ Editor Agent
 Second stage: Polish and refine draft without adding fabricated content
 """
 
+import asyncio
 import logging
+from collections.abc import Callable
 
 from .llm_client import LLMClient
+from .prompt_layout import PromptBuilder, PromptLayout
+from .rate_limiter import Priority
+from .structured_output import EditSuggestions
 
 logger = logging.getLogger(__name__)
 
@@ -48,12 +53,33 @@ You are a professional technical editor specializing in project management and L
 
 Return the edited document maintaining the original markdown structure. If the draft is already good, minimal changes are acceptable."""
 
+    EDIT_TASK = """# TASK
+
+Edit the document for clarity, grammar, and professional tone. Follow all constraints - do NOT add fabricated information."""
+
+    SUGGESTIONS_SYSTEM_PROMPT = "You are a document analysis expert. Provide constructive feedback."
+
+    SUGGESTIONS_FORMAT = """Analyze the document and list 3-5 specific improvements that would enhance clarity or professionalism, WITHOUT adding fabricated data.
+
+Return a JSON object with format:
+{
+  "suggestions": [
+    "Improvement 1",
+    "Improvement 2",
+    ...
+  ]
+}"""
+
     def __init__(self, llm_client: LLMClient = None):
         """Initialize with LLM client"""
-        self.llm = llm_client or LLMClient()
+        self.llm = (llm_client or LLMClient.shared()).for_agent("editor")
 
     def edit_draft(
-        self, draft: str, specific_guidance: str = None, temperature: float = 0.2
+        self,
+        draft: str,
+        specific_guidance: str = None,
+        temperature: float = 0.2,
+        on_token: Callable[[str], None] | None = None,
     ) -> str:
         """
         Edit and polish draft
@@ -62,6 +88,7 @@ Return the edited document maintaining the original markdown structure. If the d
             draft: Original draft to edit
             specific_guidance: Optional specific editing instructions
             temperature: LLM temperature (lower for editing consistency)
+            on_token: Optional callback receiving text deltas as they stream in
 
         Returns:
             Edited document
@@ -72,78 +99,163 @@ Return the edited document maintaining the original markdown structure. If the d
             logger.warning("EditorAgent: Received error draft, returning as-is")
             return draft
 
-        user_prompt = f"""# DOCUMENT TO EDIT
+        parts = self._split_if_oversized(draft, specific_guidance)
+        if parts:
+            edited_parts = []
+            for i, part in enumerate(parts):
+                if on_token and i:
+                    on_token("\n\n")
+                edited_parts.append(
+                    self.edit_draft(part, specific_guidance, temperature, on_token=on_token)
+                )
+            return "\n\n".join(edited_parts)
+
+        prompt = self._build_edit_prompt(draft, specific_guidance)
+        request = {
+            "system_prompt": prompt.system,
+            "user_prompt": prompt.user,
+            "temperature": temperature,
+            "max_tokens": None,
+            "priority": Priority.BULK,
+            "output_key": "revision" if specific_guidance else "edit",
+            "output_basis": draft,
+        }
+
+        try:
+            if on_token:
+                edited = self.llm.stream_to_callback(on_token, **request)
+            else:
+                edited = self.llm.complete(**request)
+            return self._finalize_edit(draft, edited)
 
-{draft}
+        except Exception as e:
+            logger.error(f"EditorAgent: Editing failed: {e}")
+            logger.info("EditorAgent: Returning original draft due to error")
+            return draft  # Return original on error
 
-# TASK
+    async def aedit_draft(
+        self, draft: str, specific_guidance: str = None, temperature: float = 0.2
+    ) -> str:
+        """Async twin of edit_draft()."""
+        logger.info("EditorAgent: Polishing draft (async)")
 
-Edit the above document for clarity, grammar, and professional tone. Follow all constraints - do NOT add fabricated information.
-"""
+        if not draft or draft.startswith("[ERROR"):
+            logger.warning("EditorAgent: Received error draft, returning as-is")
+            return draft
 
-        if specific_guidance:
-            user_prompt += f"\n# SPECIFIC GUIDANCE\n\n{specific_guidance}\n"
+        parts = self._split_if_oversized(draft, specific_guidance)
+        if parts:
+            edited_parts = await asyncio.gather(
+                *(self.aedit_draft(part, specific_guidance, temperature) for part in parts)
+            )
+            return "\n\n".join(edited_parts)
 
+        prompt = self._build_edit_prompt(draft, specific_guidance)
         try:
-            edited = self.llm.complete(
-                system_prompt=self.SYSTEM_PROMPT,
-                user_prompt=user_prompt,
+            edited = await self.llm.acomplete(
+                system_prompt=prompt.system,
+                user_prompt=prompt.user,
                 temperature=temperature,
-                max_tokens=len(draft) + 500,  # Allow slightly more for reformatting
+                max_tokens=None,
+                priority=Priority.BULK,
+                output_key="revision" if specific_guidance else "edit",
+                output_basis=draft,
             )
-
-            if not edited or not edited.strip():
-                logger.warning("EditorAgent: Empty response, returning original draft")
-                return draft
-
-            logger.info(f"EditorAgent: Edited draft ({len(draft)} → {len(edited)} chars)")
-            return edited.strip()
+            return self._finalize_edit(draft, edited)
 
         except Exception as e:
             logger.error(f"EditorAgent: Editing failed: {e}")
             logger.info("EditorAgent: Returning original draft due to error")
             return draft  # Return original on error
 
-    def suggest_improvements(self, draft: str) -> dict:
+    def _split_if_oversized(self, draft: str, specific_guidance: str | None) -> list[str] | None:
         """
-        Analyze draft and suggest specific improvements (without editing)
+        Split a draft whose prompt plus expected output would overflow the context window.
 
         Returns:
-            Dict with 'suggestions': list of improvement ideas
+            Two halves split on a heading or paragraph boundary, or None if the
+            draft fits (or cannot be split further)
         """
-        user_prompt = f"""Analyze this document and list 3-5 specific improvements that would enhance clarity or professionalism, WITHOUT adding fabricated data.
+        output_key = "revision" if specific_guidance else "edit"
+        output_tokens = self.llm.size_max_tokens(self.llm.count_tokens(draft), output_key)
+        prompt = self._build_edit_prompt(draft, specific_guidance)
+        if self.llm.fits_context(prompt.system, prompt.user, output_tokens):
+            return None
+
+        middle = len(draft) // 2
+        for separator in ("\n#", "\n\n", "\n"):
+            before = draft.rfind(separator, 0, middle)
+            after = draft.find(separator, middle)
+            candidates = [i for i in (before, after) if i > 0]
+            if candidates:
+                cut = min(candidates, key=lambda i: abs(i - middle))
+                logger.info("EditorAgent: Draft exceeds context window, editing in parts")
+                return [draft[:cut].strip(), draft[cut:].strip()]
+
+        logger.warning("EditorAgent: Oversized draft has no split point")
+        return None
+
+    def _build_edit_prompt(self, draft: str, specific_guidance: str | None) -> PromptLayout:
+        """Build an editing prompt; the editing rules form the cacheable prefix."""
+        return (
+            PromptBuilder(self.SYSTEM_PROMPT, self.EDIT_TASK)
+            .variable(specific_guidance, heading="SPECIFIC GUIDANCE")
+            .variable(draft, heading="DOCUMENT TO EDIT")
+            .build()
+        )
+
+    def _finalize_edit(self, draft: str, edited: str | None) -> str:
+        """Fall back to the original draft when the editor returns nothing."""
+        if not edited or not edited.strip():
+            logger.warning("EditorAgent: Empty response, returning original draft")
+            return draft
 
-Document:
-{draft}
+        logger.info(f"EditorAgent: Edited draft ({len(draft)} → {len(edited)} chars)")
+        return edited.strip()
 
-Return a JSON object with format:
-{{
-  "suggestions": [
-    "Improvement 1",
-    "Improvement 2",
-    ...
-  ]
-}}"""
+    def suggest_improvements(self, draft: str) -> dict:
+        """
+        Analyze draft and suggest specific improvements (without editing)
 
+        Returns:
+            Dict with 'suggestions': list of improvement ideas
+        """
         try:
-            response = self.llm.complete(
-                system_prompt="You are a document analysis expert. Provide constructive feedback.",
-                user_prompt=user_prompt,
+            prompt = self._build_suggestions_prompt(draft)
+            suggestions = self.llm.complete_json(
+                system_prompt=prompt.system,
+                user_prompt=prompt.user,
+                schema=EditSuggestions,
                 temperature=0.3,
                 max_tokens=500,
             )
+            return suggestions.model_dump()
 
-            # Try to parse JSON
-            import json
-
-            # Extract JSON if wrapped in code blocks
-            if "```" in response:
-                response = response.split("```")[1]
-                if response.startswith("json"):
-                    response = response[4:]
+        except Exception as e:
+            logger.error(f"EditorAgent: Suggestion generation failed: {e}")
+            return {"suggestions": ["Error generating suggestions"]}
 
-            return json.loads(response.strip())
+    async def asuggest_improvements(self, draft: str) -> dict:
+        """Async twin of suggest_improvements()."""
+        try:
+            prompt = self._build_suggestions_prompt(draft)
+            suggestions = await self.llm.acomplete_json(
+                system_prompt=prompt.system,
+                user_prompt=prompt.user,
+                schema=EditSuggestions,
+                temperature=0.3,
+                max_tokens=500,
+            )
+            return suggestions.model_dump()
 
         except Exception as e:
             logger.error(f"EditorAgent: Suggestion generation failed: {e}")
             return {"suggestions": ["Error generating suggestions"]}
+
+    def _build_suggestions_prompt(self, draft: str) -> PromptLayout:
+        """Build an improvement suggestions prompt."""
+        return (
+            PromptBuilder(self.SUGGESTIONS_SYSTEM_PROMPT, self.SUGGESTIONS_FORMAT)
+            .variable(draft, heading="DOCUMENT")
+            .build()
+        )
@@ -0,0 +1,154 @@
+"""
+Long-lived background event loop shared by the sync wrappers of async agent APIs.
+
+Running every sync call through asyncio.run() would create (and discard) a new
+loop per call, and with it the loop-bound AsyncOpenAI connection pool. All sync
+wrappers instead submit their coroutine to one daemon loop thread, so pooled
+connections, semaphores and rate limiter state are reused across calls.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import queue
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine, Iterator
+from functools import partial
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+# Callback queue drained by the thread blocked in run_sync()
+_caller_calls: contextvars.ContextVar[queue.SimpleQueue | None] = contextvars.ContextVar(
+    "llm_caller_calls", default=None
+)
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get the shared background event loop, starting its thread on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="llm-event-loop", daemon=True)
+            _thread.start()
+            logger.info("Started shared LLM event loop thread")
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on the shared event loop and wait for its result.
+
+    The coroutine sees a copy of the caller's context variables (usage scopes,
+    call context). Callbacks handed to call_in_caller() while it runs are
+    executed on the calling thread, so UI code never runs on the loop thread.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        RuntimeError: If called from the shared loop itself (await the coroutine instead)
+    """
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() called on the shared event loop; await the coroutine")
+
+    loop = get_loop()
+    calls: queue.SimpleQueue = queue.SimpleQueue()
+    context = contextvars.copy_context()
+    context.run(_caller_calls.set, calls)
+    result: concurrent.futures.Future = concurrent.futures.Future()
+    tasks: list[asyncio.Task] = []
+
+    def finish(task: asyncio.Task):
+        if task.cancelled():
+            result.cancel()
+        elif task.exception() is not None:
+            result.set_exception(task.exception())
+        else:
+            result.set_result(task.result())
+        calls.put(None)
+
+    def start():
+        # create_task() copies the current context, i.e. the caller's copy
+        task = loop.create_task(coro)
+        task.add_done_callback(finish)
+        tasks.append(task)
+
+    def cancel():
+        if tasks:
+            tasks[0].cancel()
+
+    loop.call_soon_threadsafe(start, context=context)
+    try:
+        while (call := calls.get()) is not None:
+            call()
+    except BaseException:
+        # A failing callback or an interrupt in the caller stops the work too
+        loop.call_soon_threadsafe(cancel)
+        raise
+    return result.result()
+
+
+def iterate_sync(agen: AsyncIterator[T]) -> Iterator[T]:
+    """
+    Iterate an async iterator from sync code on the shared event loop.
+
+    Args:
+        agen: Async iterator (closed when the sync iterator is closed)
+
+    Returns:
+        Iterator over the same items
+    """
+
+    async def step() -> T:
+        return await agen.__anext__()
+
+    try:
+        while True:
+            try:
+                yield run_sync(step())
+            except StopAsyncIteration:
+                break
+    finally:
+        aclose: Callable[[], Awaitable[None]] | None = getattr(agen, "aclose", None)
+        if aclose:
+
+            async def close():
+                await aclose()
+
+            run_sync(close())
+
+
+def call_in_caller(
+    fn: Callable[..., Any], *args: Any, loop: asyncio.AbstractEventLoop | None = None
+) -> None:
+    """
+    Call a user callback on the thread waiting in run_sync().
+
+    Safe to use from the event loop or from worker threads started with
+    asyncio.to_thread(). Outside run_sync() (an async caller awaiting directly),
+    fn is scheduled on loop if given, otherwise called right away.
+
+    Args:
+        fn: Callback
+        *args: Callback arguments
+        loop: Event loop to call fn on when there is no waiting sync caller
+    """
+    calls = _caller_calls.get()
+    if calls is not None:
+        calls.put(partial(fn, *args))
+    elif loop is not None:
+        loop.call_soon_threadsafe(fn, *args)
+    else:
+        fn(*args)
@@ -0,0 +1,468 @@
+"""
+Local OpenAI-compatible stand-in server for offline load testing.
+
+Speaks the chat-completions protocol (including SSE streaming) with
+configurable latency, token throughput and error injection, so the whole
+pipeline can be benchmarked without network access:
+
+    python -m app.services.ai_agents.fake_server --port 8099 --latency 0.5 --tps 80
+    OPENAI_BASE_URL=http://127.0.0.1:8099/v1 streamlit run app.py
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+FILLER_TEXT = (
+    "the project team will deliver a clear plan with measurable milestones and "
+    "documented risks while stakeholders review scope budget and schedule each "
+    "phase closes with an acceptance check before the next one starts"
+)
+
+CRITERION_PATTERN = re.compile(r"^- (.+?) \(\d+% weight\)$", re.MULTILINE)
+SINGLE_CRITERION_PATTERN = re.compile(r"^# CRITERION\s+([^:\n]+)", re.MULTILINE)
+SECTION_PATTERN = re.compile(r"^# SECTION: (.+)$", re.MULTILINE)
+
+
+@dataclass
+class FakeServerConfig:
+    """Behaviour knobs for the fake server."""
+
+    latency: float = 0.2  # Seconds before the first byte (time to first token)
+    tokens_per_second: float = 0.0  # Streaming/generation throughput; 0 = unlimited
+    response_tokens: int = 300  # Length of generated prose responses
+    prefix_cache: bool = True  # Report repeated system prompts as cached tokens, like OpenAI
+    error_rate: float = 0.0  # Fraction of requests answered with error_status
+    error_status: int = 503  # HTTP status for injected errors (429 adds Retry-After)
+    retry_after: float = 1.0  # Retry-After seconds sent with injected 429s
+    malformed_json_rate: float = 0.0  # Fraction of JSON answers cut short (invalid JSON)
+    seed: int | None = None  # Seed for error injection, for reproducible runs
+
+
+class FakeLLMServer:
+    """Threaded HTTP server answering /v1/chat/completions and /v1/models."""
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 0, config: FakeServerConfig | None = None
+    ):
+        """
+        Initialize the server (bound immediately, not yet serving).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            config: Behaviour settings
+        """
+        self.config = config or FakeServerConfig()
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._seen_prefixes: set[str] = set()
+        self._thread: threading.Thread | None = None
+
+        self.httpd = ThreadingHTTPServer((host, port), _FakeHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI-style base URL to pass as OPENAI_BASE_URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Fake LLM server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        """Stop serving and release the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted."""
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def should_fail(self) -> bool:
+        """Count a request and decide whether to inject an error for it."""
+        with self._lock:
+            self.requests += 1
+            fail = self._random.random() < self.config.error_rate
+            if fail:
+                self.errors += 1
+            return fail
+
+    def generate(self, body: dict) -> tuple[str, int, int, str]:
+        """
+        Produce a deterministic completion for a chat request.
+
+        Args:
+            body: Parsed request body
+
+        Returns:
+            Tuple of (content, prompt_tokens, cached_tokens, finish_reason)
+        """
+        messages = body.get("messages", [])
+        prompt = "\n".join(m.get("content") or "" for m in messages)
+        prompt_tokens = _count_tokens(prompt) + 4 * len(messages) + 3
+        cached_tokens = self._cached_tokens(messages, prompt_tokens)
+        max_tokens = body.get("max_tokens") or self.config.response_tokens
+
+        if _wants_json(body, prompt):
+            content = _json_response(prompt)
+            with self._lock:
+                if self._random.random() < self.config.malformed_json_rate:
+                    content = content[: len(content) // 2]
+            return content, prompt_tokens, cached_tokens, "stop"
+
+        length = min(self.config.response_tokens, max_tokens)
+        finish_reason = "length" if max_tokens < self.config.response_tokens else "stop"
+        return _prose_response(prompt, length), prompt_tokens, cached_tokens, finish_reason
+
+    def _cached_tokens(self, messages: list[dict], prompt_tokens: int) -> int:
+        """
+        Mimic provider prefix caching for the system message.
+
+        Like OpenAI, only prompts of 1024+ tokens are cached, in 128-token blocks.
+        """
+        if not self.config.prefix_cache or not messages or messages[0].get("role") != "system":
+            return 0
+
+        system = messages[0].get("content") or ""
+        key = hashlib.sha256(system.encode()).hexdigest()
+        with self._lock:
+            seen = key in self._seen_prefixes
+            self._seen_prefixes.add(key)
+
+        if not seen or prompt_tokens < 1024:
+            return 0
+        return _count_tokens(system) // 128 * 128
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    """Request handler; keep-alive so client connection pooling behaves as in production."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeLLM/1.0"
+
+    @property
+    def fake(self) -> FakeLLMServer:
+        return self.server.fake
+
+    def handle(self):
+        # Clients drop connections mid-response (cancelled hedges, timeouts)
+        with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+            super().handle()
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(
+                200, {"object": "list", "data": [{"id": "fake-model", "object": "model"}]}
+            )
+        else:
+            self._send_json(404, _error_body("Not found", "invalid_request_error"))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b"{}"
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, _error_body("Not found", "invalid_request_error"))
+            return
+
+        try:
+            body = json.loads(raw)
+        except json.JSONDecodeError:
+            self._send_json(400, _error_body("Invalid JSON body", "invalid_request_error"))
+            return
+
+        config = self.fake.config
+        time.sleep(config.latency)
+
+        if self.fake.should_fail():
+            status = config.error_status
+            headers = {"Retry-After": str(config.retry_after)} if status == 429 else {}
+            if status == 429:
+                kind = "rate_limit_exceeded"
+            elif status >= 500:
+                kind = "server_error"
+            else:
+                kind = "invalid_request_error"
+            self._send_json(status, _error_body("Injected failure", kind), headers)
+            return
+
+        content, prompt_tokens, cached_tokens, finish_reason = self.fake.generate(body)
+        model = body.get("model", "fake-model")
+        usage = _usage(prompt_tokens, _count_tokens(content), cached_tokens)
+        if body.get("stream"):
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            self._stream(model, content, finish_reason, usage if include_usage else None)
+        else:
+            self._complete(model, content, finish_reason, usage)
+
+    def _complete(self, model: str, content: str, finish_reason: str, usage: dict):
+        """Answer a non-streaming request, pacing generation at the configured throughput."""
+        tps = self.fake.config.tokens_per_second
+        if tps > 0:
+            time.sleep(usage["completion_tokens"] / tps)
+
+        self._send_json(
+            200,
+            {
+                "id": _completion_id(),
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": finish_reason,
+                    }
+                ],
+                "usage": usage,
+            },
+        )
+
+    def _stream(self, model: str, content: str, finish_reason: str, usage: dict | None):
+        """Answer a streaming request as chunked server-sent events."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        chunk_id = _completion_id()
+        created = int(time.time())
+        tps = self.fake.config.tokens_per_second
+
+        def event(choices: list, usage: dict | None = None):
+            payload = {
+                "id": chunk_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": choices,
+            }
+            if usage is not None:
+                payload["usage"] = usage
+            self._write_chunk(f"data: {json.dumps(payload)}\n\n")
+
+        try:
+            event(
+                [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]
+            )
+            for piece in re.findall(r"\S+\s*|\s+", content):
+                if tps > 0:
+                    time.sleep(1 / tps)
+                event([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+            event([{"index": 0, "delta": {}, "finish_reason": finish_reason}])
+            if usage is not None:
+                event([], usage)
+            self._write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client cancelled the stream (e.g. a losing hedge)
+            self.close_connection = True
+
+    def _write_chunk(self, text: str):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, payload: dict, headers: dict | None = None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _count_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), matching the client's fallback."""
+    return (len(text) + 3) // 4
+
+
+def _usage(prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> dict:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": cached_tokens},
+    }
+
+
+def _completion_id() -> str:
+    return f"chatcmpl-fake-{random.getrandbits(48):012x}"
+
+
+def _error_body(message: str, kind: str) -> dict:
+    return {"error": {"message": message, "type": kind, "code": kind}}
+
+
+def _wants_json(body: dict, prompt: str) -> bool:
+    """Detect requests that expect a JSON answer (critique, review, suggestions)."""
+    response_format = body.get("response_format") or {}
+    return response_format.get("type") in ("json_object", "json_schema") or "JSON" in prompt
+
+
+def _json_response(prompt: str) -> str:
+    """Build a plausible JSON answer shaped after the prompt's requested format."""
+    single = SINGLE_CRITERION_PATTERN.search(prompt)
+    if single:
+        return json.dumps(
+            {
+                "criterion": single.group(1).strip(),
+                "score": 85,
+                "strengths": "Clearly stated.",
+                "weaknesses": "Could be more specific.",
+                "improvements": "Add measurable detail.",
+            }
+        )
+
+    criteria = CRITERION_PATTERN.findall(prompt)
+    if criteria:
+        return json.dumps(
+            {
+                "scores": [
+                    {
+                        "criterion": name,
+                        "score": 85,
+                        "strengths": "Clearly stated.",
+                        "weaknesses": "Could be more specific.",
+                        "improvements": "Add measurable detail.",
+                    }
+                    for name in criteria
+                ],
+                "overall_assessment": "Solid document with minor gaps.",
+                "critical_gaps": ["Quantify success criteria"],
+                "recommended_next_steps": ["Review with stakeholders"],
+            }
+        )
+
+    if '"reviews"' in prompt:
+        return json.dumps(
+            {
+                "reviews": [
+                    {
+                        "section": name.strip(),
+                        "score": 85,
+                        "strengths": ["Clear structure"],
+                        "improvements": ["Add specific metrics"],
+                    }
+                    for name in SECTION_PATTERN.findall(prompt)
+                ]
+            }
+        )
+
+    if '"suggestions"' in prompt:
+        return json.dumps({"suggestions": ["Tighten the summary", "Add owners to each action"]})
+
+    return json.dumps(
+        {
+            "score": 85,
+            "strengths": ["Clear structure"],
+            "improvements": ["Add specific metrics"],
+        }
+    )
+
+
+def _prose_response(prompt: str, tokens: int) -> str:
+    """Generate deterministic markdown prose of roughly `tokens` tokens for a prompt."""
+    rng = random.Random(hashlib.sha256(prompt.encode()).hexdigest())
+    vocabulary = FILLER_TEXT.split()
+    words = []
+    while _count_tokens(" ".join(words)) < tokens - 8:
+        words.append(rng.choice(vocabulary))
+
+    paragraphs = [" ".join(words[i : i + 60]) for i in range(0, len(words), 60)]
+    body = "\n\n".join(p[:1].upper() + p[1:] + "." for p in paragraphs if p)
+    return f"# Generated Document\n\n{body}\n"
+
+
+def main():
+    """Command-line entry point for running the fake server."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="OpenAI-compatible fake LLM server for load testing"
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)"
+    )
+    parser.add_argument("--port", type=int, default=8099, help="Port to bind (default: 8099)")
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="Seconds to first token (default: 0.2)"
+    )
+    parser.add_argument(
+        "--tps", type=float, default=0.0, help="Tokens per second; 0 = unlimited (default: 0)"
+    )
+    parser.add_argument(
+        "--response-tokens", type=int, default=300, help="Prose response length (default: 300)"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of failing requests (default: 0)"
+    )
+    parser.add_argument(
+        "--error-status", type=int, default=503, help="HTTP status for failures (default: 503)"
+    )
+    parser.add_argument(
+        "--malformed-json-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of JSON answers returned truncated (default: 0)",
+    )
+    parser.add_argument("--seed", type=int, help="Random seed for error injection")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = FakeServerConfig(
+        latency=args.latency,
+        tokens_per_second=args.tps,
+        response_tokens=args.response_tokens,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        malformed_json_rate=args.malformed_json_rate,
+        seed=args.seed,
+    )
+    server = FakeLLMServer(args.host, args.port, config)
+    print(f"Fake LLM server on {server.base_url}")
+    print(f"Point the app at it with: OPENAI_BASE_URL={server.base_url}")
+    with contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
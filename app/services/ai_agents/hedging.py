@@ -0,0 +1,143 @@
+"""Request hedging: duplicate slow LLM calls to cut tail latency."""
+
+import logging
+import math
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """When to send a duplicate request and how many duplicates a stage may spend."""
+
+    percentile: float = 95.0  # Hedge once the first token is later than this percentile
+    min_delay: float = 1.0  # Never hedge sooner than this many seconds
+    default_delay: float = 8.0  # Hedge delay until enough latency samples exist
+    min_samples: int = 20  # Samples needed before the percentile is trusted
+    budget_ratio: float = 0.1  # Max hedges per stage as a fraction of its calls
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        """Build a policy from LLM_HEDGE_PERCENTILE and LLM_HEDGE_BUDGET environment variables."""
+        return cls(
+            percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+            budget_ratio=float(os.getenv("LLM_HEDGE_BUDGET", "0.1")),
+        )
+
+
+class HedgeTracker:
+    """
+    Process-wide time-to-first-token samples and hedge spend per stage.
+
+    Stages are ratio keys such as "work_plan:draft"; calls without a key share
+    the "default" stage.
+    """
+
+    _shared_instance: "HedgeTracker | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize tracker.
+
+        Args:
+            window: Number of recent latency samples kept per stage
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+        self._calls: dict[str, int] = {}
+        self._hedges: dict[str, int] = {}
+
+    @classmethod
+    def shared(cls) -> "HedgeTracker":
+        """Get the process-wide tracker."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def record_latency(self, stage: str, seconds: float):
+        """Record one time-to-first-token sample for a stage."""
+        with self._lock:
+            self._samples.setdefault(stage, deque(maxlen=self.window)).append(seconds)
+
+    def hedge_delay(self, stage: str, policy: HedgePolicy) -> float:
+        """
+        Seconds to wait for a first token before hedging a call.
+
+        Args:
+            stage: Stage key
+            policy: Hedge policy
+
+        Returns:
+            Delay in seconds
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(stage, ()))
+
+        if len(samples) < policy.min_samples:
+            return policy.default_delay
+
+        index = min(len(samples) - 1, math.ceil(policy.percentile / 100 * len(samples)) - 1)
+        return max(samples[index], policy.min_delay)
+
+    def record_call(self, stage: str):
+        """Count a hedge-eligible call against the stage budget."""
+        with self._lock:
+            self._calls[stage] = self._calls.get(stage, 0) + 1
+
+    def try_hedge(self, stage: str, policy: HedgePolicy) -> bool:
+        """
+        Reserve budget for one duplicate request.
+
+        Args:
+            stage: Stage key
+            policy: Hedge policy
+
+        Returns:
+            True if the stage may hedge (the hedge is counted), False if over budget
+        """
+        with self._lock:
+            hedges = self._hedges.get(stage, 0)
+            # One hedge of headroom so a stage's first slow call can still hedge
+            if hedges >= self._calls.get(stage, 0) * policy.budget_ratio + 1:
+                logger.info(f"Hedge budget exhausted for stage '{stage}'")
+                return False
+            self._hedges[stage] = hedges + 1
+            return True
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Get per-stage hedging counters.
+
+        Returns:
+            Dict of stage -> calls, hedges and sample count
+        """
+        with self._lock:
+            return {
+                stage: {
+                    "calls": calls,
+                    "hedges": self._hedges.get(stage, 0),
+                    "samples": len(self._samples.get(stage, ())),
+                }
+                for stage, calls in self._calls.items()
+            }
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def hedge_executor() -> ThreadPoolExecutor:
+    """Shared worker pool that runs the racing attempts of sync hedged calls."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+        return _executor
@@ -0,0 +1,133 @@
+"""Process-wide pooled OpenAI clients so every agent reuses warm connections."""
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+try:
+    import httpx
+except ImportError:  # Newer openai releases ship their own HTTP stack
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """HTTP connection pool settings shared by all OpenAI clients."""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """Build config from LLM_POOL_* and LLM_HTTP2 environment variables."""
+        return cls(
+            max_connections=int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "60")),
+            http2=os.getenv("LLM_HTTP2", "").lower() in ("1", "true", "yes"),
+        )
+
+    def httpx_kwargs(self) -> dict:
+        """
+        Keyword arguments for constructing an httpx client with this pool.
+
+        Empty (openai's default pool) when httpx isn't installed.
+        """
+        if httpx is None:
+            logger.warning("httpx not installed; using openai's default connection pool")
+            return {}
+
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning(
+                    "LLM_HTTP2 requested but the 'h2' package is missing; using HTTP/1.1"
+                )
+                http2 = False
+
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "http2": http2,
+        }
+
+
+_lock = threading.Lock()
+_sync_clients: dict[tuple, OpenAI] = {}
+# Async transports are bound to the event loop that created them
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_openai_client(
+    api_key: str, base_url: str | None = None, config: PoolConfig | None = None
+) -> OpenAI:
+    """
+    Get the shared sync OpenAI client for an API key and endpoint.
+
+    Args:
+        api_key: API key
+        base_url: Optional API base URL (None for the default OpenAI endpoint)
+        config: Pool settings used if the client has to be created (defaults from env)
+
+    Returns:
+        Pooled OpenAI client
+    """
+    key = (api_key, base_url)
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            config = config or PoolConfig.from_env()
+            client = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                max_retries=0,  # LLMClient's RetryPolicy owns retries
+                http_client=DefaultHttpxClient(**config.httpx_kwargs()),
+            )
+            _sync_clients[key] = client
+            logger.info(f"Created pooled OpenAI client ({config.max_connections} connections)")
+        return client
+
+
+def get_async_openai_client(
+    api_key: str, base_url: str | None = None, config: PoolConfig | None = None
+) -> AsyncOpenAI:
+    """
+    Get the shared async OpenAI client for the running event loop.
+
+    Args:
+        api_key: API key
+        base_url: Optional API base URL (None for the default OpenAI endpoint)
+        config: Pool settings used if the client has to be created (defaults from env)
+
+    Returns:
+        Pooled AsyncOpenAI client
+    """
+    loop = asyncio.get_running_loop()
+    key = (api_key, base_url)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            config = config or PoolConfig.from_env()
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(**config.httpx_kwargs()),
+            )
+            clients[key] = client
+        return client
@@ -1,16 +1,133 @@
-"""OpenAI LLM client with retry logic and error handling."""
+"""LLM client with retry logic and error handling over a pluggable backend."""
 
+import asyncio
+import copy
 import logging
 import os
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from functools import partial
 
-from openai import OpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
+from .backends import LLMBackend, OpenAIBackend
+from .completion_cache import CompletionCache
+from .hedging import HedgePolicy, HedgeTracker, hedge_executor
+from .rate_limiter import Priority, RateLimiter
+from .retry_policy import RetryPolicy, classify_error
+from .single_flight import SingleFlight
+from .structured_output import (
+    ModelT,
+    ResultCheck,
+    StructuredOutputError,
+    parse_reply,
+    repair_messages,
+    response_format,
+)
+from .telemetry import CallRecord, Telemetry, current_context
+from .token_estimator import ContextWindowExceededError, OutputRatioTracker, TokenEstimator
 
 logger = logging.getLogger(__name__)
 
+# Smallest output budget worth sending a request for
+MIN_OUTPUT_TOKENS = 256
+
+
+@dataclass
+class StreamEvent:
+    """One chunk of a streamed completion; the final event carries usage."""
+
+    delta: str = ""
+    done: bool = False
+    content: str | None = None
+    usage: dict | None = None
+
+
+@dataclass
+class _PreparedCall:
+    """A chat request after defaults, sizing and pre-flight checks are applied."""
+
+    messages: list[dict[str, str]]
+    params: dict
+    priority: Priority
+    prompt_tokens: int
+    fingerprint: str
+    output_key: str | None = None
+    basis_tokens: int = 0
+    hedge: bool = False
+
+    # Filled in while the call runs, for telemetry
+    started: float = 0.0
+    attempts: int = 0  # Requests sent, hedged duplicates included
+    hedges: int = 0
+    ttft: float | None = None
+    cache_hit: bool = False
+    usage: dict | None = None
+    finish_reason: str | None = None
+
+    @property
+    def estimated_tokens(self) -> int:
+        """Worst-case tokens charged against the rate limit."""
+        return self.prompt_tokens + self.params["max_tokens"]
+
+    @property
+    def stage(self) -> str:
+        """Stage key used for latency tracking and hedge budgets."""
+        return self.output_key or "default"
+
+
+@dataclass
+class _StreamAccumulator:
+    """Collects text, usage and finish reason from streamed chunks."""
+
+    parts: list[str] = field(default_factory=list)
+    usage: dict | None = None
+    finish_reason: str | None = None
+
+    def add(self, chunk) -> str | None:
+        """Absorb one chunk and return its text delta, if any."""
+        if chunk.usage:
+            self.usage = {**_usage_dict(chunk.usage), "cached": False}
+        if not chunk.choices:
+            return None
+
+        self.finish_reason = chunk.choices[0].finish_reason or self.finish_reason
+        delta = chunk.choices[0].delta.content
+        if delta:
+            self.parts.append(delta)
+        return delta
+
+    @property
+    def content(self) -> str:
+        return "".join(self.parts)
+
+
+def _usage_dict(usage) -> dict:
+    """Convert an API usage object into a plain dict, including provider-cached tokens."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+        "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+    }
+
+
+class _HedgeCancelledError(Exception):
+    """Raised inside a losing hedged attempt once the other attempt has won."""
+
+    def __init__(self, stream: "_StreamAccumulator"):
+        super().__init__("hedged attempt lost the race")
+        self.stream = stream
+
 
 class LLMClient:
-    """Wrapper for OpenAI API with retry logic and configuration."""
+    """Wrapper for chat-completion backends with retry logic and configuration."""
+
+    _shared_instance: "LLMClient | None" = None
+    _shared_lock = threading.Lock()
 
     def __init__(
         self,
@@ -18,6 +135,14 @@ class LLMClient:
         model: str | None = None,
         temperature: float = 0.4,
         max_tokens: int = 2000,
+        cache: CompletionCache | None = None,
+        use_cache: bool = True,
+        max_concurrency: int | None = None,
+        rate_limiter: RateLimiter | None = None,
+        coalesce: bool = True,
+        backend: LLMBackend | None = None,
+        retry_policy: RetryPolicy | None = None,
+        hedge_policy: HedgePolicy | None = None,
     ):
         """
         Initialize LLM client.
@@ -27,56 +152,130 @@ class LLMClient:
             model: Model name (defaults to OPENAI_MODEL env var or gpt-4o-mini)
             temperature: Sampling temperature (0.0-1.0)
             max_tokens: Maximum tokens in response
+            cache: Completion cache (defaults to the shared on-disk cache)
+            use_cache: Set False to disable completion caching entirely
+            max_concurrency: Max in-flight async requests (defaults to LLM_MAX_CONCURRENCY or 8)
+            rate_limiter: RPM/TPM limiter (defaults to the process-wide shared limiter)
+            coalesce: Share one request between concurrent identical calls
+            backend: Chat-completion backend (defaults to OpenAI, honouring OPENAI_BASE_URL)
+            retry_policy: Retry behaviour for failed requests (defaults from environment)
+            hedge_policy: When hedged calls send a duplicate (defaults from environment)
+
+        Raises:
+            ValueError: If no backend is given and no OpenAI API key or base URL is set
         """
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.cache = (cache or CompletionCache.default()) if use_cache else None
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.rate_limiter = rate_limiter or RateLimiter.shared()
+        self.single_flight = SingleFlight.shared() if coalesce else None
+        self.estimator = TokenEstimator(self.model)
+        self.output_ratios = OutputRatioTracker.shared()
+        self.backend = backend or OpenAIBackend(api_key)
+        self.retry_policy = retry_policy or RetryPolicy.from_env()
+        self.hedge_policy = hedge_policy or HedgePolicy.from_env()
+        self.hedge_tracker = HedgeTracker.shared()
+        self.telemetry = Telemetry.shared()
+        self.agent: str | None = None
 
-        if not self.api_key:
-            raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
-
-        self.client = OpenAI(api_key=self.api_key)
+        # Async concurrency semaphores are bound to the event loop that uses them
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
         logger.info(f"Initialized LLM client with model: {self.model}")
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    @classmethod
+    def shared(cls) -> "LLMClient":
+        """
+        Get the process-wide default client used by agents created without one.
+
+        Returns:
+            Shared LLMClient configured from the environment
+        """
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def with_model(self, model: str) -> "LLMClient":
+        """
+        Get a view of this client that sends requests to another model.
+
+        The view shares the backend, cache, limiter and concurrency state.
+
+        Args:
+            model: Model name
+
+        Returns:
+            LLMClient view
+        """
+        if model == self.model:
+            return self
+        view = copy.copy(self)
+        view.model = model
+        view.estimator = TokenEstimator(model)
+        return view
+
+    def for_agent(self, agent: str) -> "LLMClient":
+        """
+        Get a view of this client whose calls are labelled with an agent name.
+
+        The view shares the backend, cache, limiter and concurrency state.
+
+        Args:
+            agent: Agent name for telemetry (e.g. "draft", "critic")
+
+        Returns:
+            LLMClient view
+        """
+        view = copy.copy(self)
+        view.agent = agent
+        return view
+
     def complete(
         self,
         system_prompt: str,
         user_prompt: str,
         temperature: float | None = None,
         max_tokens: int | None = None,
+        bypass_cache: bool = False,
+        priority: Priority = Priority.NORMAL,
+        output_key: str | None = None,
+        output_basis: str | None = None,
+        hedge: bool = False,
     ) -> str:
         """
-        Generate completion with retry logic.
+        Generate completion, retrying transient and rate-limited failures.
 
         Args:
             system_prompt: System message defining AI behavior
             user_prompt: User message with the actual request
             temperature: Override default temperature
-            max_tokens: Override default max_tokens
+            max_tokens: Override default max_tokens (with output_key: budget until a ratio is known)
+            bypass_cache: Skip the cache lookup (the fresh result is still stored)
+            priority: Rate-limit queue priority (INTERACTIVE calls jump ahead of BULK)
+            output_key: Ratio key (e.g. "work_plan:draft") used to size max_tokens
+            output_basis: Text the output length scales with (defaults to the whole prompt)
+            hedge: Race a duplicate request if the first token is slower than recent calls
 
         Returns:
             Generated text completion
+
+        Raises:
+            ContextWindowExceededError: If the prompt cannot fit the model's context window
         """
-        temp = temperature if temperature is not None else self.temperature
-        tokens = max_tokens if max_tokens is not None else self.max_tokens
+        call = self._prepare(
+            self._build_messages(system_prompt, user_prompt),
+            temperature,
+            max_tokens,
+            priority,
+            output_key,
+            output_basis,
+        )
+        call.hedge = hedge
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=temp,
-                max_tokens=tokens,
-            )
-
-            content = response.choices[0].message.content
-            logger.info(f"Completion generated: {response.usage.total_tokens} tokens used")
-            return content
-
+            return self._complete_messages(call, bypass_cache)
         except Exception as e:
             logger.error(f"Error generating completion: {e}")
             raise
@@ -87,6 +286,8 @@ class LLMClient:
         user_prompt: str,
         examples: list[dict[str, str]] | None = None,
         temperature: float | None = None,
+        bypass_cache: bool = False,
+        priority: Priority = Priority.NORMAL,
     ) -> str:
         """
         Generate structured completion with optional few-shot examples.
@@ -96,10 +297,331 @@ class LLMClient:
             user_prompt: User request
             examples: List of {"user": "...", "assistant": "..."} examples
             temperature: Override temperature
+            bypass_cache: Skip the cache lookup (the fresh result is still stored)
+            priority: Rate-limit queue priority (INTERACTIVE calls jump ahead of BULK)
 
         Returns:
             Generated completion
         """
+        call = self._prepare(
+            self._build_messages(system_prompt, user_prompt, examples), temperature, None, priority
+        )
+
+        try:
+            return self._complete_messages(call, bypass_cache)
+        except Exception as e:
+            logger.error(f"Error in structured completion: {e}")
+            raise
+
+    def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        bypass_cache: bool = False,
+        priority: Priority = Priority.NORMAL,
+        output_key: str | None = None,
+        output_basis: str | None = None,
+    ) -> Iterator[StreamEvent]:
+        """
+        Stream a completion token by token.
+
+        Yields StreamEvent objects with text deltas, followed by one final event
+        (done=True) carrying the full content and a usage record. Cached
+        completions are replayed as a single delta.
+
+        Args:
+            system_prompt: System message defining AI behavior
+            user_prompt: User message with the actual request
+            temperature: Override default temperature
+            max_tokens: Override default max_tokens (with output_key: budget until a ratio is known)
+            bypass_cache: Skip the cache lookup (the fresh result is still stored)
+            priority: Rate-limit queue priority (INTERACTIVE calls jump ahead of BULK)
+            output_key: Ratio key (e.g. "work_plan:draft") used to size max_tokens
+            output_basis: Text the output length scales with (defaults to the whole prompt)
+
+        Yields:
+            StreamEvent chunks
+        """
+        call = self._prepare(
+            self._build_messages(system_prompt, user_prompt),
+            temperature,
+            max_tokens,
+            priority,
+            output_key,
+            output_basis,
+        )
+        call.started = time.monotonic()
+        cached = self._cache_lookup(call, bypass_cache)
+        if cached is not None:
+            self._record(call)
+            yield StreamEvent(delta=cached)
+            yield StreamEvent(done=True, content=cached, usage={"cached": True})
+            return
+
+        stream = _StreamAccumulator()
+        try:
+            # Only opening the stream is retried; a stream that fails midway
+            # has already yielded text to the caller
+            response = self._send_with_retry(
+                call, stream=True, stream_options={"include_usage": True}
+            )
+
+            for chunk in response:
+                delta = stream.add(chunk)
+                if delta:
+                    if call.ttft is None:
+                        call.ttft = time.monotonic() - call.started
+                        self.hedge_tracker.record_latency(call.stage, call.ttft)
+                    yield StreamEvent(delta=delta)
+
+        except Exception as e:
+            logger.error(f"Error streaming completion: {e}")
+            self._record(call, e)
+            raise
+
+        if stream.usage:
+            logger.info(f"Streamed completion: {stream.usage['total_tokens']} tokens used")
+        self._finish(call, stream.content, stream.usage, stream.finish_reason)
+        self._record(call)
+
+        yield StreamEvent(done=True, content=stream.content, usage=stream.usage)
+
+    def stream_to_callback(
+        self, on_token: Callable[[str], None], system_prompt: str, user_prompt: str, **kwargs
+    ) -> str:
+        """
+        Stream a completion into a callback and return the full text.
+
+        Args:
+            on_token: Called with each text delta as it arrives
+            system_prompt: System message defining AI behavior
+            user_prompt: User message with the actual request
+            **kwargs: Passed through to stream()
+
+        Returns:
+            Generated text completion
+        """
+        content = None
+        for event in self.stream(system_prompt, user_prompt, **kwargs):
+            if event.delta:
+                on_token(event.delta)
+            if event.done:
+                content = event.content
+        return content
+
+    async def acomplete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        bypass_cache: bool = False,
+        priority: Priority = Priority.NORMAL,
+        output_key: str | None = None,
+        output_basis: str | None = None,
+        hedge: bool = False,
+    ) -> str:
+        """
+        Async twin of complete(), bounded by the client's concurrency limit.
+
+        Args:
+            system_prompt: System message defining AI behavior
+            user_prompt: User message with the actual request
+            temperature: Override default temperature
+            max_tokens: Override default max_tokens (with output_key: budget until a ratio is known)
+            bypass_cache: Skip the cache lookup (the fresh result is still stored)
+            priority: Rate-limit queue priority (INTERACTIVE calls jump ahead of BULK)
+            output_key: Ratio key (e.g. "work_plan:draft") used to size max_tokens
+            output_basis: Text the output length scales with (defaults to the whole prompt)
+            hedge: Race a duplicate request if the first token is slower than recent calls
+
+        Returns:
+            Generated text completion
+        """
+        call = self._prepare(
+            self._build_messages(system_prompt, user_prompt),
+            temperature,
+            max_tokens,
+            priority,
+            output_key,
+            output_basis,
+        )
+        call.hedge = hedge
+
+        try:
+            return await self._acomplete_messages(call, bypass_cache)
+        except Exception as e:
+            logger.error(f"Error generating async completion: {e}")
+            raise
+
+    async def acomplete_structured(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        examples: list[dict[str, str]] | None = None,
+        temperature: float | None = None,
+        bypass_cache: bool = False,
+        priority: Priority = Priority.NORMAL,
+    ) -> str:
+        """
+        Async twin of complete_structured().
+
+        Args:
+            system_prompt: System message
+            user_prompt: User request
+            examples: List of {"user": "...", "assistant": "..."} examples
+            temperature: Override temperature
+            bypass_cache: Skip the cache lookup (the fresh result is still stored)
+            priority: Rate-limit queue priority (INTERACTIVE calls jump ahead of BULK)
+
+        Returns:
+            Generated completion
+        """
+        call = self._prepare(
+            self._build_messages(system_prompt, user_prompt, examples), temperature, None, priority
+        )
+
+        try:
+            return await self._acomplete_messages(call, bypass_cache)
+        except Exception as e:
+            logger.error(f"Error in async structured completion: {e}")
+            raise
+
+    def complete_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: type[ModelT],
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        bypass_cache: bool = False,
+        priority: Priority = Priority.NORMAL,
+        check: ResultCheck | None = None,
+    ) -> ModelT:
+        """
+        Generate a reply constrained to a JSON schema and validate it.
+
+        A reply that fails validation (or `check`) gets one repair call that
+        quotes the problem back to the model.
+
+        Args:
+            system_prompt: System message defining AI behavior
+            user_prompt: User message with the actual request
+            schema: Pydantic model the reply must match
+            temperature: Override default temperature
+            max_tokens: Override default max_tokens
+            bypass_cache: Skip the cache lookup (the fresh result is still stored)
+            priority: Rate-limit queue priority (INTERACTIVE calls jump ahead of BULK)
+            check: Extra validation returning a problem description, or None if usable
+
+        Returns:
+            Validated schema instance
+
+        Raises:
+            StructuredOutputError: If the repaired reply is still invalid
+        """
+        messages = self._build_messages(system_prompt, user_prompt)
+        call = self._prepare_json(messages, schema, temperature, max_tokens, priority)
+        reply = self._complete_messages(call, bypass_cache)
+
+        result, problem = parse_reply(reply, schema, check)
+        if result is not None:
+            return result
+
+        repair = self._prepare_repair(call, reply, problem, schema, temperature, max_tokens)
+        reply = self._complete_messages(repair, bypass_cache)
+        return self._parse_repaired(repair, reply, schema, check)
+
+    async def acomplete_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: type[ModelT],
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        bypass_cache: bool = False,
+        priority: Priority = Priority.NORMAL,
+        check: ResultCheck | None = None,
+    ) -> ModelT:
+        """Async twin of complete_json()."""
+        messages = self._build_messages(system_prompt, user_prompt)
+        call = self._prepare_json(messages, schema, temperature, max_tokens, priority)
+        reply = await self._acomplete_messages(call, bypass_cache)
+
+        result, problem = parse_reply(reply, schema, check)
+        if result is not None:
+            return result
+
+        repair = self._prepare_repair(call, reply, problem, schema, temperature, max_tokens)
+        reply = await self._acomplete_messages(repair, bypass_cache)
+        return self._parse_repaired(repair, reply, schema, check)
+
+    def cache_stats(self) -> dict:
+        """Get completion cache statistics (empty if caching is disabled)."""
+        return self.cache.stats() if self.cache else {}
+
+    def metrics_snapshot(self) -> dict:
+        """Get aggregated per-call telemetry as JSON-serializable data."""
+        return self.telemetry.snapshot()
+
+    def hedging_stats(self) -> dict:
+        """Get per-stage hedged call and duplicate request counters."""
+        return self.hedge_tracker.stats()
+
+    def coalescing_stats(self) -> dict:
+        """Get in-flight request coalescing counters (empty if coalescing is disabled)."""
+        return self.single_flight.stats() if self.single_flight else {}
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens in text using the model's tokenizer."""
+        return self.estimator.count(text)
+
+    def words_to_tokens(self, words: int) -> int:
+        """Convert a word budget into a max_tokens budget."""
+        return self.estimator.words_to_tokens(words)
+
+    def fits_context(
+        self, system_prompt: str, user_prompt: str, output_tokens: int = MIN_OUTPUT_TOKENS
+    ) -> bool:
+        """Check whether a prompt plus `output_tokens` of response fit the context window."""
+        prompt_tokens = self.estimator.count_messages(
+            self._build_messages(system_prompt, user_prompt)
+        )
+        output_tokens = min(output_tokens, self.estimator.max_output_tokens)
+        return prompt_tokens + output_tokens <= self.estimator.context_window
+
+    def size_max_tokens(
+        self, basis_tokens: int, output_key: str, fallback: int | None = None
+    ) -> int:
+        """
+        Size an output budget from input length and the observed output ratio.
+
+        Args:
+            basis_tokens: Tokens of the text the output scales with
+            output_key: Ratio key (e.g. "work_plan:draft" or "edit")
+            fallback: Budget to use until a ratio for the key is known, and the
+                minimum afterwards (a learned ratio only ever raises the caller's budget)
+
+        Returns:
+            max_tokens budget
+        """
+        ratio = self.output_ratios.ratio(output_key)
+        if ratio is None:
+            return fallback if fallback is not None else self.max_tokens
+
+        # 30% headroom so ordinary variance doesn't truncate output
+        sized = max(int(basis_tokens * ratio * 1.3) + 64, MIN_OUTPUT_TOKENS)
+        return max(sized, fallback) if fallback is not None else sized
+
+    def _build_messages(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        examples: list[dict[str, str]] | None = None,
+    ) -> list[dict[str, str]]:
+        """Build chat messages with optional few-shot examples."""
         messages = [{"role": "system", "content": system_prompt}]
 
         if examples:
@@ -108,16 +630,470 @@ class LLMClient:
                 messages.append({"role": "assistant", "content": ex["assistant"]})
 
         messages.append({"role": "user", "content": user_prompt})
+        return messages
+
+    def _prepare(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float | None,
+        max_tokens: int | None,
+        priority: Priority,
+        output_key: str | None = None,
+        output_basis: str | None = None,
+        json_schema: dict | None = None,
+    ) -> _PreparedCall:
+        """
+        Resolve defaults, size the output budget and check the context window.
+
+        Raises:
+            ContextWindowExceededError: If the prompt leaves no room for a response
+        """
+        prompt_tokens = self.estimator.count_messages(messages)
+        window = self.estimator.context_window
+        if prompt_tokens + MIN_OUTPUT_TOKENS > window:
+            raise ContextWindowExceededError(prompt_tokens, window)
+
+        basis_tokens = self.estimator.count(output_basis) if output_basis else prompt_tokens
+        if output_key:
+            tokens = self.size_max_tokens(basis_tokens, output_key, fallback=max_tokens)
+        else:
+            tokens = max_tokens if max_tokens is not None else self.max_tokens
+        tokens = min(tokens, self.estimator.max_output_tokens, window - prompt_tokens)
+
+        params = {
+            "model": self.model,
+            "temperature": temperature if temperature is not None else self.temperature,
+            "max_tokens": tokens,
+        }
+        if json_schema:
+            params["response_format"] = json_schema
+
+        # Key on the requested budget, not the sized one, so learned ratios
+        # don't invalidate earlier results
+        requested = f"auto:{output_key}" if output_key else tokens
+        fingerprint = CompletionCache.make_key(
+            self.model,
+            messages,
+            backend=self.backend.identity,
+            temperature=params["temperature"],
+            max_tokens=requested,
+            response_format=json_schema,
+        )
 
-        temp = temperature if temperature is not None else self.temperature
+        return _PreparedCall(
+            messages=messages,
+            params=params,
+            priority=priority,
+            prompt_tokens=prompt_tokens,
+            fingerprint=fingerprint,
+            output_key=output_key,
+            basis_tokens=basis_tokens,
+        )
 
+    def _prepare_json(
+        self,
+        messages: list[dict[str, str]],
+        schema: type[ModelT],
+        temperature: float | None,
+        max_tokens: int | None,
+        priority: Priority,
+    ) -> _PreparedCall:
+        """Prepare a call whose reply is constrained to a schema."""
+        return self._prepare(
+            messages, temperature, max_tokens, priority, json_schema=response_format(schema)
+        )
+
+    def _prepare_repair(
+        self,
+        call: _PreparedCall,
+        reply: str | None,
+        problem: str,
+        schema: type[ModelT],
+        temperature: float | None,
+        max_tokens: int | None,
+    ) -> _PreparedCall:
+        """Drop an unusable reply from the cache and prepare the call that repairs it."""
+        logger.warning(f"Structured reply failed validation, requesting repair: {problem}")
+        if self.cache:
+            self.cache.delete(call.fingerprint)
+
+        messages = repair_messages(call.messages, reply, problem)
+        return self._prepare_json(messages, schema, temperature, max_tokens, call.priority)
+
+    def _parse_repaired(
+        self,
+        repair: _PreparedCall,
+        reply: str | None,
+        schema: type[ModelT],
+        check: ResultCheck | None,
+    ) -> ModelT:
+        """Validate a repaired reply; a second failure is final."""
+        result, problem = parse_reply(reply, schema, check)
+        if result is None:
+            if self.cache:
+                self.cache.delete(repair.fingerprint)
+            raise StructuredOutputError(f"{schema.__name__} reply invalid after repair: {problem}")
+        return result
+
+    def _cache_lookup(self, call: _PreparedCall, bypass_cache: bool) -> str | None:
+        """Return cached content for a call, or None on miss/bypass."""
+        if not self.cache or bypass_cache:
+            return None
+
+        cached = self.cache.get(call.fingerprint)
+        if cached is not None:
+            call.cache_hit = True
+            logger.info("Completion served from cache")
+        return cached
+
+    def _acquire(self, call: _PreparedCall):
+        """Wait for rate-limit capacity for a call."""
+        if self.rate_limiter:
+            self.rate_limiter.acquire(call.estimated_tokens, call.priority)
+
+    async def _aacquire(self, call: _PreparedCall):
+        """Async twin of _acquire()."""
+        if self.rate_limiter:
+            await self.rate_limiter.aacquire(call.estimated_tokens, call.priority)
+
+    def _finish(
+        self,
+        call: _PreparedCall,
+        content: str | None,
+        usage: dict | None,
+        finish_reason: str | None,
+    ):
+        """Record usage against the limiter and ratio tracker, and cache the result."""
+        call.usage = usage
+        call.finish_reason = finish_reason
+        if usage:
+            if self.rate_limiter:
+                self.rate_limiter.reconcile(call.estimated_tokens, usage["total_tokens"])
+            if call.output_key:
+                self.output_ratios.observe(
+                    call.output_key,
+                    call.basis_tokens,
+                    usage["completion_tokens"],
+                    truncated=finish_reason == "length",
+                )
+
+        if finish_reason == "length":
+            logger.warning(f"Completion truncated at max_tokens={call.params['max_tokens']}")
+
+        if self.cache and content:
+            self.cache.set(call.fingerprint, content, model=self.model)
+
+    def _handle_response(self, call: _PreparedCall, response) -> str:
+        """Extract content from a non-streaming API response and record it."""
+        choice = response.choices[0]
+        usage = None
+        if response.usage:
+            logger.info(f"Completion generated: {response.usage.total_tokens} tokens used")
+            usage = _usage_dict(response.usage)
+
+        self._finish(call, choice.message.content, usage, choice.finish_reason)
+        return choice.message.content
+
+    def _complete_messages(self, call: _PreparedCall, bypass_cache: bool) -> str:
+        """Serve a chat request from the cache, or call the API and cache the result."""
+        call.started = time.monotonic()
+        error = None
         try:
-            response = self.client.chat.completions.create(
-                model=self.model, messages=messages, temperature=temp, max_tokens=self.max_tokens
+            cached = self._cache_lookup(call, bypass_cache)
+            if cached is not None:
+                return cached
+
+            if self.single_flight:
+                return self.single_flight.do(call.fingerprint, lambda: self._send(call))
+            return self._send(call)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record(call, error)
+
+    def _send(self, call: _PreparedCall) -> str:
+        """Send a non-streaming request to the API."""
+        if call.hedge:
+            return self._send_hedged(call)
+        return self._handle_response(call, self._send_with_retry(call))
+
+    def _send_hedged(self, call: _PreparedCall) -> str:
+        """
+        Stream the request and race a duplicate if no token arrives in time.
+
+        The duplicate is sent once the first token is later than the stage's
+        latency percentile and the stage still has hedge budget. The first
+        attempt to finish wins; the other stops reading and closes its stream.
+        """
+        self.hedge_tracker.record_call(call.stage)
+        delay = self.hedge_tracker.hedge_delay(call.stage, self.hedge_policy)
+        executor = hedge_executor()
+
+        cancelled = threading.Event()
+        first_token = threading.Event()
+        futures = [executor.submit(self._stream_attempt, call, cancelled, first_token)]
+
+        first_token.wait(delay)
+        if (
+            not first_token.is_set()
+            and not futures[0].done()
+            and self.hedge_tracker.try_hedge(call.stage, self.hedge_policy)
+        ):
+            logger.info(f"Hedging slow request for stage '{call.stage}' after {delay:.1f}s")
+            call.hedges += 1
+            futures.append(
+                executor.submit(self._stream_attempt, call, cancelled, threading.Event())
             )
 
-            return response.choices[0].message.content
+        error = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    cancelled.set()
+                    for loser in futures:
+                        if loser is not future:
+                            loser.add_done_callback(partial(self._settle_hedge_future, call))
+                    stream = future.result()
+                    self._finish(call, stream.content, stream.usage, stream.finish_reason)
+                    return stream.content
+                error = future.exception()
+        raise error
+
+    def _settle_hedge_future(self, call: _PreparedCall, future):
+        """Settle a losing attempt of a sync hedged call once its thread ends."""
+        error = future.exception()
+        if error is None:
+            self._settle_hedge_loser(call, future.result())
+        elif isinstance(error, _HedgeCancelledError):
+            self._settle_hedge_loser(call, error.stream)
+        # Any other failure was refunded when the request failed
+
+    def _settle_hedge_loser(self, call: _PreparedCall, stream: _StreamAccumulator):
+        """
+        Reconcile a losing hedged attempt's rate-limit reservation with what it used.
 
+        A cancelled stream reports no usage, so it is charged the prompt plus
+        the tokens streamed before it stopped.
+        """
+        if not self.rate_limiter:
+            return
+        if stream.usage:
+            used = stream.usage["total_tokens"]
+        else:
+            used = call.prompt_tokens + self.count_tokens(stream.content)
+        self.rate_limiter.reconcile(call.estimated_tokens, used)
+
+    def _stream_attempt(
+        self, call: _PreparedCall, cancelled: threading.Event, first_token: threading.Event
+    ) -> _StreamAccumulator:
+        """
+        One racing attempt of a hedged call; stops early once `cancelled` is set.
+
+        `first_token` is set on the first text delta, or when the attempt ends
+        without one, so the caller never waits out the hedge delay for a failure.
+        """
+        started = time.monotonic()
+        stream = _StreamAccumulator()
+        try:
+            response = self._send_with_retry(
+                call, stream=True, stream_options={"include_usage": True}
+            )
+            try:
+                for chunk in response:
+                    if cancelled.is_set():
+                        raise _HedgeCancelledError(stream)
+                    if stream.add(chunk) and not first_token.is_set():
+                        latency = time.monotonic() - started
+                        self.hedge_tracker.record_latency(call.stage, latency)
+                        if call.ttft is None:
+                            call.ttft = time.monotonic() - call.started
+                        first_token.set()
+            finally:
+                response.close()
+        finally:
+            first_token.set()
+        return stream
+
+    def _send_with_retry(self, call: _PreparedCall, **extra):
+        """
+        Call the backend under the retry policy, charging the rate limit per attempt.
+
+        Each attempt's timeout is the time left before the retry deadline.
+        """
+        started = time.monotonic()
+        for attempt in self.retry_policy.retrying(self._on_rate_limited):
+            with attempt:
+                call.attempts += 1
+                self._acquire(call)
+                timeout = self.retry_policy.attempt_timeout(started)
+                try:
+                    return self.backend.create(
+                        call.messages, **call.params, **extra, timeout=timeout
+                    )
+                except BaseException:
+                    self._refund(call)
+                    raise
+
+    async def _acomplete_messages(self, call: _PreparedCall, bypass_cache: bool) -> str:
+        """Async twin of _complete_messages() sharing the per-loop connection pool."""
+        call.started = time.monotonic()
+        error = None
+        try:
+            cached = self._cache_lookup(call, bypass_cache)
+            if cached is not None:
+                return cached
+
+            if self.single_flight:
+                return await self.single_flight.ado(call.fingerprint, lambda: self._asend(call))
+            return await self._asend(call)
         except Exception as e:
-            logger.error(f"Error in structured completion: {e}")
+            error = e
             raise
+        finally:
+            self._record(call, error)
+
+    def _record(self, call: _PreparedCall, error: BaseException | None = None):
+        """Send the call's metrics to telemetry."""
+        if error is not None:
+            outcome = f"error_{classify_error(error).value}"
+        elif call.cache_hit:
+            outcome = "cache_hit"
+        elif call.attempts == 0:
+            outcome = "coalesced"  # Another in-flight caller sent the request
+        elif call.finish_reason == "length":
+            outcome = "truncated"
+        else:
+            outcome = "success"
+
+        context = current_context()
+        usage = call.usage or {}
+        self.telemetry.record(
+            CallRecord(
+                model=call.params["model"],
+                agent=self.agent or context.get("agent", ""),
+                pattern=context.get("pattern", ""),
+                stage=context.get("stage") or (call.output_key or "").rsplit(":", 1)[-1],
+                outcome=outcome,
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                cached_tokens=usage.get("cached_tokens", 0),
+                latency=time.monotonic() - call.started,
+                ttft=call.ttft,
+                retries=max(call.attempts - 1 - call.hedges, 0),
+                hedges=call.hedges,
+            )
+        )
+
+    async def _asend(self, call: _PreparedCall) -> str:
+        """Async twin of _send() sharing the per-loop connection pool."""
+        if call.hedge:
+            return await self._asend_hedged(call)
+        return self._handle_response(call, await self._asend_with_retry(call))
+
+    async def _asend_with_retry(self, call: _PreparedCall, **extra):
+        """Async twin of _send_with_retry(), bounded by the concurrency limit."""
+        started = time.monotonic()
+        async for attempt in self.retry_policy.aretrying(self._on_rate_limited):
+            with attempt:
+                call.attempts += 1
+                async with self._get_semaphore():
+                    await self._aacquire(call)
+                    timeout = self.retry_policy.attempt_timeout(started)
+                    try:
+                        return await self.backend.acreate(
+                            call.messages, **call.params, **extra, timeout=timeout
+                        )
+                    except BaseException:
+                        # Includes cancellation, e.g. a losing hedge or a stage timeout
+                        self._refund(call)
+                        raise
+
+    async def _asend_hedged(self, call: _PreparedCall) -> str:
+        """Async twin of _send_hedged(); the losing attempt's task is cancelled."""
+        self.hedge_tracker.record_call(call.stage)
+        delay = self.hedge_tracker.hedge_delay(call.stage, self.hedge_policy)
+
+        first_token = asyncio.Event()
+        tasks = {asyncio.create_task(self._astream_attempt(call, first_token))}
+        token_wait = asyncio.create_task(first_token.wait())
+        await asyncio.wait({*tasks, token_wait}, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+        token_wait.cancel()
+
+        if (
+            not first_token.is_set()
+            and not any(task.done() for task in tasks)
+            and self.hedge_tracker.try_hedge(call.stage, self.hedge_policy)
+        ):
+            logger.info(f"Hedging slow request for stage '{call.stage}' after {delay:.1f}s")
+            call.hedges += 1
+            tasks.add(asyncio.create_task(self._astream_attempt(call, asyncio.Event())))
+
+        winner = None
+        try:
+            error = None
+            pending = tasks
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        stream = task.result()
+                        self._finish(call, stream.content, stream.usage, stream.finish_reason)
+                        return stream.content
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if task is winner:
+                    continue
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    # Finished in the same round as the winner
+                    self._settle_hedge_loser(call, task.result())
+                else:
+                    task.cancel()
+
+    async def _astream_attempt(
+        self, call: _PreparedCall, first_token: asyncio.Event
+    ) -> _StreamAccumulator:
+        """Async twin of _stream_attempt(); cancelled via its task."""
+        started = time.monotonic()
+        response = await self._asend_with_retry(
+            call, stream=True, stream_options={"include_usage": True}
+        )
+        stream = _StreamAccumulator()
+        try:
+            async for chunk in response:
+                if stream.add(chunk) and not first_token.is_set():
+                    latency = time.monotonic() - started
+                    self.hedge_tracker.record_latency(call.stage, latency)
+                    if call.ttft is None:
+                        call.ttft = time.monotonic() - call.started
+                    first_token.set()
+        except asyncio.CancelledError:
+            self._settle_hedge_loser(call, stream)
+            raise
+        finally:
+            await response.close()
+        return stream
+
+    def _refund(self, call: _PreparedCall):
+        """Return a failed attempt's token estimate to the rate limiter."""
+        if self.rate_limiter:
+            self.rate_limiter.reconcile(call.estimated_tokens, 0)
+
+    def _on_rate_limited(self, seconds: float):
+        """Hold back every caller sharing the limiter while the API asks us to wait."""
+        if self.rate_limiter:
+            self.rate_limiter.pause(seconds)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
@@ -0,0 +1,54 @@
+"""Per-stage model cascades: run a cheap model first, escalate on failure."""
+
+import os
+from dataclasses import dataclass, field
+
+CASCADE_STAGES = ("draft", "edit", "revision", "critique")
+
+
+@dataclass(frozen=True)
+class ModelCascade:
+    """
+    Model tiers per pipeline stage, cheapest first.
+
+    Stages without tiers use the client's default model. The revision stage
+    falls back to the edit tiers. Edits never escalate (a failed edit keeps
+    the draft), so they only use the first edit tier.
+    """
+
+    tiers: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls) -> "ModelCascade":
+        """
+        Build a cascade from LLM_CASCADE_<STAGE> environment variables.
+
+        Example: LLM_CASCADE_DRAFT=gpt-4o-mini,gpt-4o
+        """
+        tiers = {}
+        for stage in CASCADE_STAGES:
+            value = os.getenv(f"LLM_CASCADE_{stage.upper()}", "")
+            models = tuple(m.strip() for m in value.split(",") if m.strip())
+            if models:
+                tiers[stage] = models
+        return cls(tiers)
+
+    @property
+    def enabled(self) -> bool:
+        """True if any stage has tiers configured."""
+        return bool(self.tiers)
+
+    def models(self, stage: str) -> list[str | None]:
+        """
+        Get the model tiers for a stage.
+
+        Args:
+            stage: Pipeline stage name
+
+        Returns:
+            Models cheapest first; [None] (client default) if the stage has none
+        """
+        models = self.tiers.get(stage)
+        if models is None and stage == "revision":
+            models = self.tiers.get("edit")
+        return list(models) if models else [None]
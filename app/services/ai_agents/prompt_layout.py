@@ -0,0 +1,66 @@
+"""
+Prompt assembly for provider-side prefix caching.
+
+Providers cache the longest previously seen prompt prefix, so prompts are laid
+out with every long, stable block (role, constraints, rubric, output format)
+in the system message and only per-call content in the user message, with the
+document last. Static blocks are normalized so the prefix stays byte-identical
+across calls.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PromptLayout:
+    """A chat prompt split into a cacheable prefix and a variable suffix."""
+
+    system: str
+    user: str
+
+
+class PromptBuilder:
+    """
+    Collects static instructions and per-call inputs in cache-friendly order.
+
+    Example:
+        prompt = (
+            PromptBuilder(SYSTEM_PROMPT)
+            .static(rubric_text, OUTPUT_FORMAT)
+            .variable(guidance, heading="SPECIFIC GUIDANCE")
+            .variable(document, heading="DOCUMENT TO EDIT")
+            .build()
+        )
+    """
+
+    def __init__(self, *instructions: str):
+        """
+        Start a prompt.
+
+        Args:
+            *instructions: Static blocks that open the system message
+        """
+        self.instructions: list[str] = []
+        self.inputs: list[str] = []
+        self.static(*instructions)
+
+    def static(self, *blocks: str) -> "PromptBuilder":
+        """Append blocks that are identical on every call (role, rules, rubric, format)."""
+        self.instructions.extend(_normalize(block) for block in blocks if block and block.strip())
+        return self
+
+    def variable(self, content: str | None, heading: str | None = None) -> "PromptBuilder":
+        """Append per-call content; add the document itself last."""
+        if content and content.strip():
+            body = content.strip()
+            self.inputs.append(f"# {heading}\n\n{body}" if heading else body)
+        return self
+
+    def build(self) -> PromptLayout:
+        """Assemble the system and user messages."""
+        return PromptLayout(system="\n\n".join(self.instructions), user="\n\n".join(self.inputs))
+
+
+def _normalize(block: str) -> str:
+    """Strip outer and trailing-line whitespace so equal text yields equal bytes."""
+    return "\n".join(line.rstrip() for line in block.strip().splitlines())
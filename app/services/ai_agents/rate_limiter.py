@@ -0,0 +1,172 @@
+"""Process-wide token-bucket rate limiting for LLM requests."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from enum import IntEnum
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request priority classes; lower values are served first."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute token buckets shared by all clients.
+
+    Callers queue by (priority, arrival order): only the head of the queue may
+    take capacity, so interactive calls overtake queued bulk generation while
+    the overall rate stays at the account limit.
+    """
+
+    _shared_instance: "RateLimiter | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, requests_per_minute: int = 500, tokens_per_minute: int = 200_000):
+        """
+        Initialize rate limiter.
+
+        Args:
+            requests_per_minute: Request budget per minute (bucket capacity)
+            tokens_per_minute: Token budget per minute (bucket capacity)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+        self._cond = threading.Condition()
+        self._queue: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+
+    @classmethod
+    def shared(cls) -> "RateLimiter | None":
+        """
+        Get the process-wide limiter configured from the environment.
+
+        Uses OPENAI_RPM_LIMIT and OPENAI_TPM_LIMIT; setting either to 0 disables
+        rate limiting.
+
+        Returns:
+            Shared limiter, or None if disabled
+        """
+        rpm = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+        tpm = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+        if rpm <= 0 or tpm <= 0:
+            return None
+
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls(rpm, tpm)
+                logger.info(f"Rate limiter: {rpm} requests/min, {tpm} tokens/min")
+            return cls._shared_instance
+
+    def acquire(self, tokens: int, priority: Priority = Priority.NORMAL):
+        """
+        Block until one request and `tokens` tokens of capacity are available.
+
+        Args:
+            tokens: Estimated tokens for the request (prompt + max output)
+            priority: Queue priority class
+        """
+        tokens = min(tokens, self.tokens_per_minute)
+        ticket = (int(priority), next(self._sequence))
+
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    wait = self._wait_time(ticket, tokens)
+                    if wait <= 0:
+                        self._take(tokens)
+                        return
+                    self._cond.wait(timeout=wait)
+            finally:
+                self._leave(ticket)
+
+    async def aacquire(self, tokens: int, priority: Priority = Priority.NORMAL):
+        """Async twin of acquire(); sleeps on the event loop instead of blocking."""
+        tokens = min(tokens, self.tokens_per_minute)
+        ticket = (int(priority), next(self._sequence))
+
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._wait_time(ticket, tokens)
+                    if wait <= 0:
+                        self._take(tokens)
+                        return
+                await asyncio.sleep(wait)
+        finally:
+            with self._cond:
+                self._leave(ticket)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int):
+        """Return over-estimated tokens to the bucket, or charge the shortfall."""
+        with self._cond:
+            self._refill(time.monotonic())
+            self._tokens = min(
+                self._tokens + estimated_tokens - actual_tokens, float(self.tokens_per_minute)
+            )
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """Stop handing out capacity for `seconds` (e.g. after a 429 response)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"Rate limiter: paused for {seconds:.1f}s")
+
+    def _refill(self, now: float):
+        """Refill both buckets for the time elapsed since the last update."""
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(
+            self._requests + elapsed * self.requests_per_minute / 60.0,
+            float(self.requests_per_minute),
+        )
+        self._tokens = min(
+            self._tokens + elapsed * self.tokens_per_minute / 60.0,
+            float(self.tokens_per_minute),
+        )
+
+    def _wait_time(self, ticket: tuple[int, int], tokens: int) -> float:
+        """Seconds until `ticket` could proceed (<= 0 means now). Caller holds the lock."""
+        now = time.monotonic()
+        self._refill(now)
+
+        if self._queue[0] != ticket:
+            return 0.05  # Not our turn yet; re-check once the head has moved
+
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        request_wait = (1.0 - self._requests) * 60.0 / self.requests_per_minute
+        token_wait = (tokens - self._tokens) * 60.0 / self.tokens_per_minute
+        return max(request_wait, token_wait, 0.0)
+
+    def _take(self, tokens: int):
+        """Consume capacity for the head of the queue. Caller holds the lock."""
+        self._requests -= 1.0
+        self._tokens -= tokens
+
+    def _leave(self, ticket: tuple[int, int]):
+        """Remove a ticket from the queue and wake the remaining waiters."""
+        if ticket in self._queue:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+        self._cond.notify_all()
@@ -0,0 +1,208 @@
+"""Error classification and Retry-After aware retry policy for LLM requests."""
+
+import logging
+import os
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from enum import Enum
+
+import openai
+from tenacity import AsyncRetrying, RetryCallState, Retrying, retry_if_exception
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying besides 429 and 5xx
+TRANSIENT_STATUS_CODES = {408, 409, 425}
+
+# Shortest timeout given to an attempt, even when the deadline is (nearly) spent
+MIN_ATTEMPT_TIMEOUT = 5.0
+
+
+class ErrorClass(Enum):
+    """How a failed request should be handled."""
+
+    TRANSIENT = "transient"  # Network blips, timeouts, 5xx: back off and retry
+    RATE_LIMITED = "rate_limited"  # 429: wait for Retry-After, then retry
+    FATAL = "fatal"  # Bad request, auth, quota, context overflow: never retry
+
+
+def classify_error(error: BaseException) -> ErrorClass:
+    """
+    Classify an exception raised while calling the LLM backend.
+
+    Args:
+        error: Exception from the backend
+
+    Returns:
+        ErrorClass for the exception
+    """
+    if isinstance(error, openai.RateLimitError):
+        # Exhausted billing quota also comes back as 429 but will not recover
+        if getattr(error, "code", None) == "insufficient_quota":
+            return ErrorClass.FATAL
+        return ErrorClass.RATE_LIMITED
+
+    if isinstance(error, openai.APIStatusError):
+        status = error.status_code
+        if status == 429:
+            return ErrorClass.RATE_LIMITED
+        if status >= 500 or status in TRANSIENT_STATUS_CODES:
+            return ErrorClass.TRANSIENT
+        return ErrorClass.FATAL
+
+    # APITimeoutError is a subclass of APIConnectionError
+    if isinstance(error, openai.APIConnectionError):
+        return ErrorClass.TRANSIENT
+
+    return ErrorClass.FATAL
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """
+    Read the server's Retry-After hint from an API error, if present.
+
+    Args:
+        error: Exception from the backend
+
+    Returns:
+        Seconds to wait, or None if the response carries no usable hint
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retries transient and rate-limited failures within a total deadline.
+
+    Transient errors back off exponentially with full jitter; rate-limited
+    errors wait for the server's Retry-After hint (plus a little jitter so
+    callers don't retry in lockstep). Fatal errors are raised immediately,
+    and a retry is skipped if its wait would overrun the per-call deadline.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 20.0
+    deadline: float = 90.0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a policy from LLM_MAX_ATTEMPTS and LLM_RETRY_DEADLINE environment variables."""
+        return cls(
+            max_attempts=int(os.getenv("LLM_MAX_ATTEMPTS", "4")),
+            deadline=float(os.getenv("LLM_RETRY_DEADLINE", "90")),
+        )
+
+    def attempt_timeout(self, started: float) -> float:
+        """
+        Timeout for the next attempt so the call ends near its deadline.
+
+        The deadline is otherwise only checked between attempts, so a single
+        hung request could run for the client's default timeout (600s).
+
+        Args:
+            started: time.monotonic() when the call's first attempt began
+
+        Returns:
+            Seconds left before the deadline (at least MIN_ATTEMPT_TIMEOUT)
+        """
+        return max(self.deadline - (time.monotonic() - started), MIN_ATTEMPT_TIMEOUT)
+
+    def next_delay(self, error: BaseException, attempt: int) -> float:
+        """
+        Seconds to wait before retrying after a failed attempt.
+
+        Args:
+            error: Exception from the failed attempt
+            attempt: Number of the attempt that failed (1-based)
+
+        Returns:
+            Delay in seconds
+        """
+        if classify_error(error) == ErrorClass.RATE_LIMITED:
+            hint = retry_after_seconds(error)
+            if hint is not None:
+                return hint + random.uniform(0, 0.25 * self.base_delay)
+
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def retrying(self, on_rate_limited: Callable[[float], None] | None = None) -> Retrying:
+        """
+        Build a tenacity Retrying controller for one call.
+
+        Args:
+            on_rate_limited: Called with the wait in seconds when a 429 is retried
+
+        Returns:
+            Retrying instance; use as `for attempt in policy.retrying(): with attempt: ...`
+        """
+        return Retrying(**self._tenacity_kwargs(on_rate_limited))
+
+    def aretrying(self, on_rate_limited: Callable[[float], None] | None = None) -> AsyncRetrying:
+        """Async twin of retrying()."""
+        return AsyncRetrying(**self._tenacity_kwargs(on_rate_limited))
+
+    def _tenacity_kwargs(self, on_rate_limited: Callable[[float], None] | None) -> dict:
+        """Shared tenacity configuration; the delay is decided once per failure."""
+        planned: dict[int, float] = {}
+
+        def delay_for(retry_state: RetryCallState) -> float:
+            if retry_state.attempt_number not in planned:
+                error = retry_state.outcome.exception()
+                planned[retry_state.attempt_number] = self.next_delay(
+                    error, retry_state.attempt_number
+                )
+            return planned[retry_state.attempt_number]
+
+        def should_stop(retry_state: RetryCallState) -> bool:
+            if retry_state.attempt_number >= self.max_attempts:
+                return True
+            elapsed = retry_state.seconds_since_start or 0.0
+            return elapsed + delay_for(retry_state) > self.deadline
+
+        def before_sleep(retry_state: RetryCallState):
+            error = retry_state.outcome.exception()
+            delay = delay_for(retry_state)
+            kind = classify_error(error)
+            if kind == ErrorClass.RATE_LIMITED and on_rate_limited:
+                on_rate_limited(delay)
+            logger.warning(
+                f"LLM request failed ({kind.value}: {error}); "
+                f"retrying in {delay:.1f}s (attempt {retry_state.attempt_number + 1}"
+                f"/{self.max_attempts})"
+            )
+
+        return {
+            "retry": retry_if_exception(lambda e: classify_error(e) != ErrorClass.FATAL),
+            "stop": should_stop,
+            "wait": delay_for,
+            "before_sleep": before_sleep,
+            "reraise": True,
+        }
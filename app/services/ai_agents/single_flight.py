@@ -0,0 +1,125 @@
+"""Single-flight coalescing of identical in-flight LLM requests."""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Lets concurrent callers with the same request fingerprint share one execution.
+
+    The first caller (the leader) runs the request; callers arriving while it is
+    in flight wait on the leader's future instead of sending a duplicate. Sync
+    and async callers share the same table, so a Streamlit session thread and
+    an asyncio pipeline can coalesce with each other.
+    """
+
+    _shared_instance: "SingleFlight | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        """Initialize an empty in-flight table."""
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    @classmethod
+    def shared(cls) -> "SingleFlight":
+        """Get the process-wide single-flight group."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn() unless an identical call is already in flight, then share its result.
+
+        Args:
+            key: Request fingerprint
+            fn: Zero-argument callable performing the request
+
+        Returns:
+            Result of the (possibly shared) execution
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._leave(key)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async twin of do().
+
+        Args:
+            key: Request fingerprint
+            fn: Zero-argument coroutine function performing the request
+
+        Returns:
+            Result of the (possibly shared) execution
+        """
+        future, leader = self._join(key)
+        if not leader:
+            # Shield so a cancelled follower doesn't cancel the leader's future
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._leave(key)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dict with leaders (requests sent), coalesced (requests saved) and in_flight
+        """
+        with self._lock:
+            return {
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+            }
+
+    def _join(self, key: str) -> tuple[Future, bool]:
+        """Return the in-flight future for key and whether the caller leads it."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                logger.info("Coalesced duplicate in-flight LLM request")
+                return future, False
+
+            future = Future()
+            self._in_flight[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _leave(self, key: str):
+        """Remove a finished call so later callers start a fresh one."""
+        with self._lock:
+            self._in_flight.pop(key, None)
@@ -0,0 +1,146 @@
+"""
+Schema-constrained JSON output for agents.
+
+Replies are requested with a JSON-schema response_format and validated into
+pydantic models. A reply that fails validation gets one targeted repair call
+that quotes the validation error back to the model, instead of a full retry.
+"""
+
+import re
+from collections.abc import Callable
+from typing import TypeVar
+
+from pydantic import BaseModel, Field, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Extra validation beyond the schema: return a problem description, or None if the result is usable
+ResultCheck = Callable[[ModelT], str | None]
+
+REPAIR_PROMPT = """Your previous reply could not be used: {problem}
+
+Reply again with the corrected JSON object only. Keep every valid part of your previous answer unchanged."""
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a reply still does not match its schema after the repair call."""
+
+
+class CriterionScore(BaseModel):
+    """Score and feedback for one rubric criterion."""
+
+    criterion: str
+    score: float = Field(ge=0, le=100)
+    strengths: str = ""
+    weaknesses: str = ""
+    improvements: str = ""
+
+
+class Critique(BaseModel):
+    """Full rubric critique of a document."""
+
+    scores: list[CriterionScore]
+    overall_assessment: str = ""
+    critical_gaps: list[str] = Field(default_factory=list)
+    recommended_next_steps: list[str] = Field(default_factory=list)
+
+
+class QuickReview(BaseModel):
+    """Review of a single document section."""
+
+    score: float = Field(ge=0, le=100)
+    strengths: list[str] = Field(default_factory=list)
+    improvements: list[str] = Field(default_factory=list)
+
+
+class SectionReview(QuickReview):
+    """Quick review of one section within a batch."""
+
+    section: str
+
+
+class QuickReviewBatch(BaseModel):
+    """Quick reviews of several sections returned by one call."""
+
+    reviews: list[SectionReview]
+
+
+class EditSuggestions(BaseModel):
+    """Improvement ideas for a document, without edits applied."""
+
+    suggestions: list[str]
+
+
+def response_format(schema: type[BaseModel]) -> dict:
+    """
+    Build an OpenAI response_format that constrains replies to a model's JSON schema.
+
+    Args:
+        schema: Pydantic model describing the reply
+
+    Returns:
+        response_format request parameter
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": schema.__name__, "schema": schema.model_json_schema()},
+    }
+
+
+def parse_reply(
+    text: str | None, schema: type[ModelT], check: ResultCheck | None = None
+) -> tuple[ModelT | None, str | None]:
+    """
+    Validate a reply against a schema.
+
+    Tolerates code fences and surrounding prose, for backends that ignore
+    response_format.
+
+    Args:
+        text: Raw reply content
+        schema: Pydantic model describing the reply
+        check: Optional extra validation of the parsed result
+
+    Returns:
+        Tuple of (result, None) on success or (None, problem description) on failure
+    """
+    if not text or not text.strip():
+        return None, "the reply was empty"
+
+    body = re.sub(r"```(?:json)?\s*", "", text).strip()
+    match = re.search(r"\{.*\}", body, re.DOTALL)
+    if match:
+        body = match.group(0)
+
+    try:
+        result = schema.model_validate_json(body)
+    except ValidationError as e:
+        return None, _describe(e)
+
+    problem = check(result) if check else None
+    return (None, problem) if problem else (result, None)
+
+
+def repair_messages(messages: list[dict[str, str]], reply: str | None, problem: str) -> list[dict]:
+    """
+    Build the follow-up conversation asking the model to fix its reply.
+
+    The original messages are kept as-is so the repair call reuses their cached prefix.
+    """
+    return [
+        *messages,
+        {"role": "assistant", "content": reply or ""},
+        {"role": "user", "content": REPAIR_PROMPT.format(problem=problem)},
+    ]
+
+
+def _describe(error: ValidationError) -> str:
+    """Summarize validation errors as one line per problem, with JSON paths."""
+    problems = []
+    for item in error.errors()[:10]:
+        if item["type"] == "json_invalid":
+            problems.append(f"invalid JSON ({item['msg']})")
+            continue
+        path = ".".join(str(part) for part in item["loc"]) or "root"
+        problems.append(f"{path}: {item['msg']}")
+    return "; ".join(problems)
@@ -0,0 +1,399 @@
+"""Per-call LLM telemetry aggregated into Prometheus-style metrics."""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+TTFT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+LABEL_NAMES = ("model", "agent", "pattern", "stage", "outcome")
+
+_call_context: ContextVar[dict[str, str] | None] = ContextVar("llm_call_context", default=None)
+_usage_scopes: ContextVar[tuple["UsageTotals", ...]] = ContextVar("llm_usage_scopes", default=())
+
+
+@contextmanager
+def call_context(**labels: str) -> Iterator[None]:
+    """
+    Attach labels (agent, pattern, stage) to every LLM call made inside the block.
+
+    Contexts nest; inner values override outer ones. Labels follow asyncio
+    tasks created inside the block.
+
+    Args:
+        **labels: Label values, e.g. pattern="work_plan", stage="draft"
+    """
+    token = _call_context.set({**current_context(), **labels})
+    try:
+        yield
+    finally:
+        _call_context.reset(token)
+
+
+def current_context() -> dict[str, str]:
+    """Labels set by the innermost call_context()."""
+    return _call_context.get() or {}
+
+
+@dataclass
+class UsageTotals:
+    """Running totals for the LLM calls made inside a usage_scope()."""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    retries: int = 0
+    hedges: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, record: "CallRecord"):
+        """Add one call record."""
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += record.prompt_tokens
+            self.completion_tokens += record.completion_tokens
+            self.cached_tokens += record.cached_tokens
+            self.retries += record.retries
+            self.hedges += record.hedges
+
+    def to_dict(self) -> dict[str, int]:
+        """Totals as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "cached_tokens": self.cached_tokens,
+                "total_tokens": self.prompt_tokens + self.completion_tokens,
+                "retries": self.retries,
+                "hedges": self.hedges,
+            }
+
+
+@contextmanager
+def usage_scope() -> Iterator[UsageTotals]:
+    """
+    Total the tokens of every LLM call made inside the block.
+
+    Scopes nest (a call counts towards every enclosing scope) and follow asyncio
+    tasks, asyncio.to_thread() workers and sync wrappers (run_sync()) started
+    inside the block. Plain threading.Thread targets do not inherit context
+    variables; run them with contextvars.copy_context().run to be counted.
+
+    Yields:
+        UsageTotals updated as calls complete
+    """
+    totals = UsageTotals()
+    token = _usage_scopes.set((*_usage_scopes.get(), totals))
+    try:
+        yield totals
+    finally:
+        _usage_scopes.reset(token)
+
+
+@dataclass
+class CallRecord:
+    """Metrics for one LLM call."""
+
+    model: str
+    agent: str = ""
+    pattern: str = ""
+    stage: str = ""
+    outcome: str = "success"  # success, truncated, cache_hit, coalesced, error_<class>
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prefix cache
+    latency: float = 0.0
+    ttft: float | None = None
+    retries: int = 0  # Attempts repeated after a failure
+    hedges: int = 0  # Duplicate requests raced against a slow first attempt
+    timestamp: float = field(default_factory=time.time)
+
+    def labels(self) -> tuple[str, ...]:
+        return tuple(getattr(self, name) for name in LABEL_NAMES)
+
+
+class _Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip((*self.buckets, float("inf")), self.counts, strict=True):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+
+class Telemetry:
+    """
+    Process-wide aggregation of CallRecords.
+
+    Keeps counters and latency histograms per label set plus a window of
+    recent raw records, and renders them as Prometheus text or JSON.
+    """
+
+    _shared_instance: "Telemetry | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, recent: int = 500):
+        """
+        Initialize empty metrics.
+
+        Args:
+            recent: Number of raw call records kept for the JSON snapshot
+        """
+        self._lock = threading.Lock()
+        self._recent: deque[CallRecord] = deque(maxlen=recent)
+        self._requests: dict[tuple, int] = {}
+        self._tokens: dict[tuple, dict[str, int]] = {}
+        self._retries: dict[tuple, int] = {}
+        self._hedges: dict[tuple, int] = {}
+        self._latency: dict[tuple, _Histogram] = {}
+        self._ttft: dict[tuple, _Histogram] = {}
+
+    @classmethod
+    def shared(cls) -> "Telemetry":
+        """Get the process-wide telemetry sink."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def record(self, record: CallRecord):
+        """Aggregate one call record."""
+        labels = record.labels()
+        with self._lock:
+            self._recent.append(record)
+            self._requests[labels] = self._requests.get(labels, 0) + 1
+            self._retries[labels] = self._retries.get(labels, 0) + record.retries
+            self._hedges[labels] = self._hedges.get(labels, 0) + record.hedges
+
+            tokens = self._tokens.setdefault(labels, {"prompt": 0, "completion": 0, "cached": 0})
+            tokens["prompt"] += record.prompt_tokens
+            tokens["completion"] += record.completion_tokens
+            tokens["cached"] += record.cached_tokens
+
+            self._latency.setdefault(labels, _Histogram(LATENCY_BUCKETS)).observe(record.latency)
+            if record.ttft is not None:
+                self._ttft.setdefault(labels, _Histogram(TTFT_BUCKETS)).observe(record.ttft)
+
+        for totals in _usage_scopes.get():
+            totals.add(record)
+
+        logger.debug(f"LLM call: {record}")
+
+    def reset(self):
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._recent.clear()
+            self._requests.clear()
+            self._tokens.clear()
+            self._retries.clear()
+            self._hedges.clear()
+            self._latency.clear()
+            self._ttft.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Get aggregated metrics as JSON-serializable data.
+
+        Returns:
+            Dict with one entry per label set under "series" and raw "recent" records
+        """
+        with self._lock:
+            series = []
+            for labels, requests in self._requests.items():
+                latency = self._latency[labels]
+                ttft = self._ttft.get(labels)
+                series.append(
+                    {
+                        **dict(zip(LABEL_NAMES, labels, strict=True)),
+                        "requests": requests,
+                        "retries": self._retries[labels],
+                        "hedges": self._hedges[labels],
+                        "tokens": dict(self._tokens[labels]),
+                        "latency_sum": round(latency.sum, 4),
+                        "latency_avg": round(latency.sum / latency.count, 4),
+                        "ttft_avg": round(ttft.sum / ttft.count, 4) if ttft else None,
+                    }
+                )
+            recent = [asdict(record) for record in self._recent]
+        return {"series": series, "prefix_cache": self.prefix_cache_ratios(), "recent": recent}
+
+    def prefix_cache_ratios(self) -> dict[str, dict]:
+        """
+        Get the share of prompt tokens served from the provider's prefix cache, per agent.
+
+        Returns:
+            Dict of agent -> prompt_tokens, cached_tokens and ratio
+        """
+        totals: dict[str, dict] = {}
+        with self._lock:
+            for labels, tokens in self._tokens.items():
+                agent = labels[LABEL_NAMES.index("agent")] or "unknown"
+                entry = totals.setdefault(agent, {"prompt_tokens": 0, "cached_tokens": 0})
+                entry["prompt_tokens"] += tokens["prompt"]
+                entry["cached_tokens"] += tokens["cached"]
+
+        for entry in totals.values():
+            prompt = entry["prompt_tokens"]
+            entry["ratio"] = round(entry["cached_tokens"] / prompt, 3) if prompt else 0.0
+        return totals
+
+    def to_json(self) -> str:
+        """Render snapshot() as a JSON string."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Render metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text suitable for a /metrics endpoint
+        """
+        lines = []
+        with self._lock:
+            lines += _counter("llm_requests_total", "LLM calls by outcome.", self._requests.items())
+            lines += _counter("llm_retries_total", "Retried LLM attempts.", self._retries.items())
+            lines += _counter(
+                "llm_hedges_total", "Duplicate requests sent by hedging.", self._hedges.items()
+            )
+
+            lines += [
+                "# HELP llm_tokens_total Tokens used by LLM calls.",
+                "# TYPE llm_tokens_total counter",
+            ]
+            for labels, tokens in self._tokens.items():
+                for kind, value in tokens.items():
+                    lines.append(f"llm_tokens_total{_format_labels(labels, kind=kind)} {value}")
+
+            lines += _histogram(
+                "llm_request_latency_seconds", "End-to-end LLM call latency.", self._latency
+            )
+            lines += _histogram(
+                "llm_time_to_first_token_seconds", "Time to first streamed token.", self._ttft
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: tuple[str, ...], **extra: str) -> str:
+    """Format a label tuple (plus extra labels) as a Prometheus label set."""
+    pairs = [*zip(LABEL_NAMES, labels, strict=True), *extra.items()]
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _counter(name: str, help_text: str, items) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    lines += [f"{name}{_format_labels(labels)} {value}" for labels, value in items]
+    return lines
+
+
+def _histogram(name: str, help_text: str, histograms: dict[tuple, _Histogram]) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in histograms.items():
+        for bound, count in histogram.cumulative():
+            lines.append(f"{name}_bucket{_format_labels(labels, le=bound)} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+    return lines
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves /metrics (Prometheus text) and /metrics.json (snapshot)."""
+
+    def do_GET(self):
+        telemetry = Telemetry.shared()
+        if self.path == "/metrics":
+            body, content_type = telemetry.to_prometheus(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = telemetry.to_json(), "application/json"
+        else:
+            self.send_error(404)
+            return
+
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def start_metrics_server(port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve the shared telemetry over HTTP from a background thread.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind
+
+    Returns:
+        The running server (call shutdown() to stop it)
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"LLM metrics available at http://{host}:{port}/metrics")
+    return server
+
+
+_metrics_server: ThreadingHTTPServer | None = None
+_metrics_lock = threading.Lock()
+
+
+def start_metrics_server_from_env() -> ThreadingHTTPServer | None:
+    """
+    Start the metrics server once per process if LLM_METRICS_PORT is set.
+
+    LLM_METRICS_HOST picks the interface to bind (default 127.0.0.1).
+
+    Returns:
+        The running server, or None if metrics are disabled or it could not start
+    """
+    global _metrics_server
+    port = os.getenv("LLM_METRICS_PORT")
+    if not port:
+        return None
+
+    with _metrics_lock:
+        if _metrics_server is None:
+            try:
+                _metrics_server = start_metrics_server(
+                    int(port), os.getenv("LLM_METRICS_HOST", "127.0.0.1")
+                )
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not start LLM metrics server on port {port}: {e}")
+        return _metrics_server
@@ -0,0 +1,154 @@
+"""Pre-flight token counting and output budget sizing for LLM requests."""
+
+import logging
+import math
+import threading
+
+try:
+    import tiktoken
+except ImportError:  # Optional dependency; fall back to a character heuristic
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Context window / maximum output tokens per model family (prefix match)
+MODEL_LIMITS = {
+    "gpt-4o-mini": (128_000, 16_384),
+    "gpt-4o": (128_000, 16_384),
+    "gpt-4-turbo": (128_000, 4_096),
+    "gpt-4.1": (1_047_576, 32_768),
+    "gpt-4": (8_192, 4_096),
+    "gpt-3.5-turbo": (16_385, 4_096),
+}
+DEFAULT_LIMITS = (16_385, 4_096)
+
+# Seed output/input ratios per stage until real observations come in
+DEFAULT_OUTPUT_RATIOS = {
+    "edit": 1.1,
+    "revision": 1.2,
+    "enhance": 1.2,
+}
+
+# Tokens reserved per chat message for role and separators
+MESSAGE_OVERHEAD = 4
+
+
+class ContextWindowExceededError(ValueError):
+    """Raised before sending a request whose prompt cannot fit the model's context."""
+
+    def __init__(self, prompt_tokens: int, context_window: int):
+        self.prompt_tokens = prompt_tokens
+        self.context_window = context_window
+        super().__init__(
+            f"Prompt needs {prompt_tokens} tokens but the model context window is "
+            f"{context_window} tokens"
+        )
+
+
+class TokenEstimator:
+    """Counts tokens with tiktoken when available, else ~4 characters per token."""
+
+    def __init__(self, model: str):
+        """
+        Initialize estimator for a model.
+
+        Args:
+            model: Model name used to pick the tokenizer and context limits
+        """
+        self.model = model
+        self.context_window, self.max_output_tokens = self._limits_for(model)
+        self._encoding = self._load_encoding(model)
+
+    def _limits_for(self, model: str) -> tuple[int, int]:
+        """Find context/output limits by longest matching model prefix."""
+        for prefix in sorted(MODEL_LIMITS, key=len, reverse=True):
+            if model.startswith(prefix):
+                return MODEL_LIMITS[prefix]
+        return DEFAULT_LIMITS
+
+    def _load_encoding(self, model: str):
+        """Load the tiktoken encoding for a model, if tiktoken is installed."""
+        if tiktoken is None:
+            return None
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+
+    def count(self, text: str) -> int:
+        """Count tokens in a piece of text."""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return math.ceil(len(text) / 4)
+
+    def count_messages(self, messages: list[dict[str, str]]) -> int:
+        """Count prompt tokens for a list of chat messages."""
+        return sum(self.count(m["content"]) + MESSAGE_OVERHEAD for m in messages) + 3
+
+    def words_to_tokens(self, words: int) -> int:
+        """Convert a word budget to a token budget (~1.35 tokens per English word)."""
+        return math.ceil(words * 1.35) + 16
+
+
+class OutputRatioTracker:
+    """
+    Tracks observed completion/input token ratios per key (e.g. "work_plan:draft").
+
+    Ratios are smoothed with an exponential moving average and shared
+    process-wide so every client learns from every call.
+    """
+
+    _shared_instance: "OutputRatioTracker | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, smoothing: float = 0.3):
+        """
+        Initialize tracker.
+
+        Args:
+            smoothing: Weight of the newest observation in the moving average
+        """
+        self.smoothing = smoothing
+        self._ratios: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "OutputRatioTracker":
+        """Get the process-wide tracker."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def ratio(self, key: str) -> float | None:
+        """Observed ratio for key, else the stage default, else None."""
+        with self._lock:
+            if key in self._ratios:
+                return self._ratios[key]
+        return DEFAULT_OUTPUT_RATIOS.get(key.rsplit(":", 1)[-1].split("_", 1)[0])
+
+    def observe(self, key: str, input_tokens: int, output_tokens: int, truncated: bool = False):
+        """
+        Record an observed output size.
+
+        Args:
+            key: Ratio key
+            input_tokens: Tokens of the text the output scales with
+            output_tokens: Completion tokens actually produced
+            truncated: True if the output hit max_tokens (real ratio is higher)
+        """
+        if input_tokens <= 0:
+            return
+
+        observed = output_tokens / input_tokens
+        if truncated:
+            observed *= 1.5
+
+        with self._lock:
+            previous = self._ratios.get(key)
+            if previous is None:
+                self._ratios[key] = observed
+            else:
+                self._ratios[key] = (1 - self.smoothing) * previous + self.smoothing * observed
@@ -0,0 +1,262 @@
+"""
+Bulk Generator
+Runs one pattern across many projects with a bounded worker pool
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from ..utils.document_utils import clean_markdown_output
+from .ai_agents.event_loop import call_in_caller, run_sync
+from .ai_agents.telemetry import usage_scope
+from .pattern_pipeline import PatternPipeline
+from .pattern_registry import PatternRegistry
+from .project_context import ProjectContext
+
+logger = logging.getLogger(__name__)
+
+
+def output_filename(pattern_name: str) -> str:
+    """Default deliverable file name for a pattern (matches the deliverables tab)."""
+    if pattern_name == "project_charter":
+        return "PROJECT_CHARTER.md"
+    return f"{pattern_name.upper()}.md"
+
+
+def load_inputs(inputs_file: Path | None) -> dict[str, Any]:
+    """
+    Load a bulk inputs file (JSON or YAML).
+
+    The file is either a flat mapping of variables used for every project, or
+    {"defaults": {...}, "projects": {"<path or name>": {...}}} with per-project
+    overrides.
+
+    Args:
+        inputs_file: Path to the inputs file, or None for no inputs
+
+    Returns:
+        Dict with "defaults" and "projects" keys
+    """
+    if inputs_file is None:
+        return {"defaults": {}, "projects": {}}
+
+    text = Path(inputs_file).read_text(encoding="utf-8")
+    if Path(inputs_file).suffix in (".yaml", ".yml"):
+        import yaml
+
+        data = yaml.safe_load(text) or {}
+    else:
+        data = json.loads(text)
+
+    if "defaults" in data or "projects" in data:
+        return {"defaults": data.get("defaults", {}), "projects": data.get("projects", {})}
+    return {"defaults": data, "projects": {}}
+
+
+class BulkGenerator:
+    """
+    Generates one pattern for many projects concurrently.
+
+    Progress is written to a JSON summary after every project, so an
+    interrupted run can be resumed: projects already marked "ok" are skipped.
+    """
+
+    def __init__(
+        self,
+        registry: PatternRegistry,
+        pattern_name: str,
+        summary_path: Path,
+        workers: int = 4,
+        enable_critique: bool = True,
+        overwrite: bool = False,
+        best_of: int = 1,
+    ):
+        """
+        Initialize generator
+
+        Args:
+            registry: Pattern registry
+            pattern_name: Pattern to generate for every project
+            summary_path: JSON summary file (read on resume, rewritten as projects finish)
+            workers: Max projects generated at once
+            enable_critique: Run the critic so the summary includes scores
+            overwrite: Regenerate deliverables that already exist
+            best_of: Draft candidates per project, keeping the best-scoring one
+
+        Raises:
+            ValueError: If the pattern does not exist
+        """
+        self.registry = registry
+        self.pattern_name = pattern_name
+        self.pattern = registry.get_pattern(pattern_name)
+        if not self.pattern:
+            raise ValueError(f"Pattern not found: {pattern_name}")
+
+        self.summary_path = Path(summary_path)
+        self.workers = max(1, workers)
+        self.enable_critique = enable_critique
+        self.overwrite = overwrite
+        self.best_of = max(1, best_of)
+        self.summary: dict[str, Any] = {}
+
+    def run(
+        self,
+        project_paths: list[Path],
+        inputs: dict[str, Any],
+        resume: bool = False,
+        on_result: Callable[[str, dict], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Generate the pattern for every project.
+
+        Args:
+            project_paths: Project directories
+            inputs: Loaded inputs file (see load_inputs())
+            resume: Skip projects that succeeded in the existing summary
+            on_result: Called with (project path, entry) as each project finishes,
+                on the calling thread
+
+        Returns:
+            Summary dict (also written to summary_path)
+        """
+        return run_sync(self.arun(project_paths, inputs, resume, on_result))
+
+    async def arun(
+        self,
+        project_paths: list[Path],
+        inputs: dict[str, Any],
+        resume: bool = False,
+        on_result: Callable[[str, dict], None] | None = None,
+    ) -> dict[str, Any]:
+        """Async twin of run()."""
+        self.summary = self._start_summary(resume)
+        done = self.summary["projects"]
+
+        todo = []
+        for path in project_paths:
+            key = str(Path(path).resolve())
+            if done.get(key, {}).get("status") == "ok":
+                logger.info(f"BulkGenerator: Skipping {key} (done in previous run)")
+                continue
+            todo.append(Path(key))
+
+        limit = asyncio.Semaphore(self.workers)
+
+        async def worker(path: Path):
+            async with limit:
+                entry = await self._generate(path, inputs)
+            done[str(path)] = entry
+            self._write_summary()
+            if on_result:
+                call_in_caller(on_result, str(path), entry)
+
+        await asyncio.gather(*(worker(path) for path in todo))
+
+        self.summary["finished"] = datetime.now().isoformat()
+        self.summary["totals"] = self._totals()
+        self._write_summary()
+        return self.summary
+
+    def _project_inputs(self, path: Path, inputs: dict[str, Any]) -> dict[str, Any]:
+        """Merge default inputs with overrides keyed by project path or directory name."""
+        overrides = inputs["projects"]
+        specific = overrides.get(str(path)) or overrides.get(path.name) or {}
+        return {**inputs["defaults"], **specific}
+
+    async def _generate(self, path: Path, inputs: dict[str, Any]) -> dict[str, Any]:
+        """Generate the deliverable for one project and describe the outcome."""
+        output = path / output_filename(self.pattern_name)
+        if not path.is_dir():
+            return {"status": "failed", "error": "Project directory not found"}
+        if output.exists() and not self.overwrite:
+            return {"status": "skipped", "output": str(output), "error": "Output exists"}
+
+        user_inputs = self._project_inputs(path, inputs)
+        missing = [
+            name
+            for name, config in self.pattern.get("variables", {}).items()
+            if config.get("required", False) and not str(user_inputs.get(name, "")).strip()
+        ]
+        if missing:
+            return {"status": "failed", "error": f"Missing required inputs: {', '.join(missing)}"}
+
+        started = time.monotonic()
+        pipeline = PatternPipeline(self.registry, ProjectContext(path))
+        with usage_scope() as usage:
+            try:
+                result = await pipeline.aexecute(
+                    self.pattern_name,
+                    user_inputs,
+                    enable_critique=self.enable_critique,
+                    project_path=path,
+                    best_of=self.best_of,
+                )
+            except Exception as e:
+                logger.error(f"BulkGenerator: {path} failed: {e}")
+                return {
+                    "status": "failed",
+                    "error": str(e),
+                    "duration": round(time.monotonic() - started, 2),
+                    "tokens": usage.to_dict(),
+                }
+
+        await asyncio.to_thread(output.write_text, clean_markdown_output(result["document"]))
+        critique = result.get("critique") or {}
+        return {
+            "status": "ok",
+            "output": str(output),
+            "score": result.get("final_score"),
+            "approved": critique.get("approved"),
+            "iterations": result.get("iterations", 0),
+            "duration": round(time.monotonic() - started, 2),
+            "tokens": usage.to_dict(),
+        }
+
+    def _start_summary(self, resume: bool) -> dict[str, Any]:
+        """Load the previous summary when resuming the same pattern, else start fresh."""
+        if resume and self.summary_path.exists():
+            previous = json.loads(self.summary_path.read_text(encoding="utf-8"))
+            if previous.get("pattern") == self.pattern_name:
+                previous.pop("totals", None)
+                previous.pop("finished", None)
+                return previous
+            logger.warning("BulkGenerator: Summary is for another pattern, starting fresh")
+
+        return {
+            "pattern": self.pattern_name,
+            "started": datetime.now().isoformat(),
+            "projects": {},
+        }
+
+    def _totals(self) -> dict[str, Any]:
+        """Aggregate statuses, scores and token usage over all projects."""
+        entries = list(self.summary["projects"].values())
+        scores = [e["score"] for e in entries if e.get("score") is not None]
+        tokens: dict[str, int] = {}
+        for entry in entries:
+            for key, value in entry.get("tokens", {}).items():
+                tokens[key] = tokens.get(key, 0) + value
+
+        statuses: dict[str, int] = {}
+        for entry in entries:
+            statuses[entry["status"]] = statuses.get(entry["status"], 0) + 1
+
+        return {
+            "projects": len(entries),
+            **statuses,
+            "average_score": round(sum(scores) / len(scores), 3) if scores else None,
+            "tokens": tokens,
+        }
+
+    def _write_summary(self):
+        """Write the summary atomically so an interrupted run leaves a valid file."""
+        self.summary_path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.summary_path.with_suffix(self.summary_path.suffix + ".tmp")
+        temp.write_text(json.dumps(self.summary, indent=2), encoding="utf-8")
+        temp.replace(self.summary_path)
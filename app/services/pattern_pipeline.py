@@ -3,42 +3,177 @@ Pattern Pipeline
 Orchestrates the full document generation workflow using specialized agents
 """
 
+import asyncio
 import logging
+import os
+import threading
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Any
 
-from .ai_agents import CriticAgent, DraftAgent, EditorAgent
+from ..utils.document_utils import clean_markdown_output
+from ..utils.markdown_sections import (
+    Section,
+    find_section,
+    replace_sections,
+    section_text,
+    split_sections,
+    with_heading,
+)
+from .ai_agents import CriticAgent, DraftAgent, EditorAgent, LLMClient
+from .ai_agents.event_loop import call_in_caller, iterate_sync, run_sync
+from .ai_agents.model_cascade import ModelCascade
+from .ai_agents.telemetry import call_context
 from .pattern_registry import PatternRegistry
+from .pipeline_checkpoint import RunCheckpoint, load_generation_inputs, save_generation_inputs
+from .pipeline_dag import PipelineDAG
 from .project_context import ProjectContext
 
 logger = logging.getLogger(__name__)
 
+# Seconds each stage may take before it is cancelled; edit, the raw-draft critique
+# and section redrafts fall back (to the unedited draft / no critique / the
+# original section) instead of failing
+DEFAULT_STAGE_TIMEOUTS = {
+    "context": 30.0,
+    "user_prompt": 30.0,
+    "metadata": 30.0,
+    "draft": 300.0,
+    "edit": 300.0,
+    "draft_critique": 180.0,
+    "review": 900.0,
+    "format": 30.0,
+    "section": 600.0,
+}
+
+# Stages whose outputs are saved to the project's run directory for resuming
+CHECKPOINT_STAGES = ("candidates", "draft", "edit", "draft_critique", "review")
+
+# Temperature range best-of-N draft candidates are spread over
+CANDIDATE_TEMPERATURES = (0.2, 0.9)
+
+# Log entries written by the stage running in the current task
+_stage_log: ContextVar[list[dict] | None] = ContextVar("pipeline_stage_log", default=None)
+
+
+@dataclass
+class _PipelineRun:
+    """Per-execution settings and log shared by the stages of one run."""
+
+    pattern_name: str
+    pattern: dict[str, Any]
+    user_inputs: dict[str, Any]
+    project_path: Path | None
+    max_revision_iterations: int
+    on_token: Callable[[str, str], None] | None
+    context: dict[str, str] | None = None  # Preloaded project context
+    checkpoint: RunCheckpoint | None = None
+    resume: bool = True
+    log: list[dict] = field(default_factory=list)
+    critique: dict | None = None  # Last critique of the final content
+    resumed: list[str] = field(default_factory=list)
+
+    def add_log(self, entry: dict):
+        """Append a pipeline log entry (also kept with the current stage's checkpoint)."""
+        self.log.append(entry)
+        stage_log = _stage_log.get()
+        if stage_log is not None:
+            stage_log.append(entry)
+
+
+def _inputs_text(user_inputs: dict[str, Any]) -> str:
+    """Render user inputs as "name: value" lines."""
+    return "\n".join(f"{name}: {value}" for name, value in user_inputs.items())
+
+
+def _failed_output(output: Any) -> bool:
+    """Agent failures come back as error drafts or error dicts; never checkpoint those."""
+    if isinstance(output, str):
+        return output.startswith("[ERROR")
+    if isinstance(output, list):
+        return any(_failed_output(item) for item in output)
+    return isinstance(output, dict) and "error" in output
+
+
+def _candidate_score(candidate: dict[str, Any]) -> float:
+    """Weighted critique score of a best-of-N candidate (-1 if it could not be scored)."""
+    critique = candidate.get("critique")
+    if "error" in candidate or not critique or "error" in critique:
+        return -1.0
+    return critique.get("weighted_score", 0.0)
+
 
 class PatternPipeline:
     """
     Unix-style pipeline for document generation:
     User Input → Draft → Edit → Critique → [Revision Loop] → Format → Output
+
+    Stages run as a DAG, so the raw draft is critiqued while it is edited.
     """
 
-    def __init__(self, pattern_registry: PatternRegistry, project_context: ProjectContext = None):
+    _shared_agents: tuple[DraftAgent, EditorAgent, CriticAgent] | None = None
+    _shared_agents_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pattern_registry: PatternRegistry,
+        project_context: ProjectContext = None,
+        llm_client: LLMClient | None = None,
+        model_cascade: ModelCascade | None = None,
+        stage_timeouts: dict[str, float | None] | None = None,
+        per_criterion_critique: bool = False,
+        hedge_drafts: bool | None = None,
+    ):
         """
         Initialize pipeline
 
         Args:
             pattern_registry: Registry of available patterns
             project_context: Optional project context for documentation injection
+            llm_client: Optional client for dedicated agents; by default the
+                pipeline reuses process-wide agents on the shared client
+            model_cascade: Per-stage model tiers, cheapest first (defaults to
+                LLM_CASCADE_<STAGE> environment variables; none = one model)
+            stage_timeouts: Per-stage timeout overrides in seconds (None = no limit)
+            per_criterion_critique: Score each rubric criterion in its own
+                concurrent call (see CriticAgent.critique_charter)
+            hedge_drafts: Race a duplicate draft request when the first token is
+                unusually slow (defaults to the LLM_HEDGE environment variable;
+                streamed drafts are never hedged)
         """
         self.registry = pattern_registry
         self.project_context = project_context
+        self.cascade = model_cascade or ModelCascade.from_env()
+        self.stage_timeouts = {**DEFAULT_STAGE_TIMEOUTS, **(stage_timeouts or {})}
+        self.per_criterion_critique = per_criterion_critique
+        if hedge_drafts is None:
+            hedge_drafts = os.getenv("LLM_HEDGE", "").lower() in ("1", "true", "yes")
+        self.hedge_drafts = hedge_drafts
+        self._tier_agents: dict[tuple[type, str], Any] = {}
 
         # Initialize specialized agents
-        self.draft_agent = DraftAgent()
-        self.editor_agent = EditorAgent()
-        self.critic_agent = CriticAgent()
+        if llm_client:
+            self.draft_agent = DraftAgent(llm_client)
+            self.editor_agent = EditorAgent(llm_client)
+            self.critic_agent = CriticAgent(llm_client)
+        else:
+            self.draft_agent, self.editor_agent, self.critic_agent = self._get_shared_agents()
 
         logger.info("PatternPipeline: Initialized")
 
+    @classmethod
+    def _get_shared_agents(cls) -> tuple[DraftAgent, EditorAgent, CriticAgent]:
+        """Agents are stateless, so one set is reused across pipelines and executions."""
+        with cls._shared_agents_lock:
+            if cls._shared_agents is None:
+                llm = LLMClient.shared()
+                cls._shared_agents = (DraftAgent(llm), EditorAgent(llm), CriticAgent(llm))
+            return cls._shared_agents
+
     def execute(
         self,
         pattern_name: str,
@@ -47,6 +182,9 @@ class PatternPipeline:
         enable_critique: bool = True,
         max_revision_iterations: int = 2,
         project_path: Path = None,
+        on_token: Callable[[str, str], None] | None = None,
+        resume: bool = True,
+        best_of: int = 1,
     ) -> dict[str, Any]:
         """
         Execute full pipeline for a pattern
@@ -58,10 +196,59 @@ class PatternPipeline:
             enable_critique: Whether to run critic agent
             max_revision_iterations: Max critique-revision loops
             project_path: Optional path to project for context loading
+            on_token: Optional callback(stage, delta) for streaming draft/edit output
+            resume: Reuse stages checkpointed by an earlier, unfinished run with the
+                same inputs (checkpoints are kept under project_path)
+            best_of: Draft this many candidates concurrently at different
+                temperatures, critique them in parallel and keep the best one;
+                revisions then only run if it misses the threshold (needs critique)
 
         Returns:
             Result dictionary with 'document', 'metadata', 'critique', etc.
         """
+        return run_sync(
+            self.aexecute(
+                pattern_name,
+                user_inputs,
+                enable_editing=enable_editing,
+                enable_critique=enable_critique,
+                max_revision_iterations=max_revision_iterations,
+                project_path=project_path,
+                on_token=on_token,
+                resume=resume,
+                best_of=best_of,
+            )
+        )
+
+    async def aexecute(
+        self,
+        pattern_name: str,
+        user_inputs: dict[str, Any],
+        enable_editing: bool = True,
+        enable_critique: bool = True,
+        max_revision_iterations: int = 2,
+        project_path: Path = None,
+        on_token: Callable[[str, str], None] | None = None,
+        context: dict[str, str] | None = None,
+        resume: bool = True,
+        best_of: int = 1,
+    ) -> dict[str, Any]:
+        """
+        Async twin of execute(); runs the stages as a DAG.
+
+        The raw draft is critiqued while the editor polishes it. Editing only
+        improves wording, so that critique stands in for the first critique of
+        the edited text. on_token is called on the event loop's thread
+        (on the calling thread when run through execute()).
+
+        Args:
+            context: Already loaded project context (skips loading from project_path);
+                other arguments as for execute()
+
+        Raises:
+            ValueError: If the pattern does not exist
+            PipelineStageError: If a stage without a fallback fails or times out
+        """
         logger.info(f"Pipeline: Starting execution for pattern '{pattern_name}'")
 
         # Load pattern
@@ -69,110 +256,801 @@ class PatternPipeline:
         if not pattern:
             raise ValueError(f"Pattern not found: {pattern_name}")
 
-        # Load project context if available
+        run = _PipelineRun(
+            pattern_name=pattern_name,
+            pattern=pattern,
+            user_inputs=user_inputs,
+            project_path=project_path,
+            max_revision_iterations=max_revision_iterations,
+            on_token=on_token,
+            context=context,
+        )
+        if project_path:
+            run.checkpoint = RunCheckpoint.for_run(
+                project_path,
+                pattern_name,
+                {
+                    "user_inputs": user_inputs,
+                    "enable_editing": enable_editing,
+                    "enable_critique": enable_critique,
+                    "max_revision_iterations": max_revision_iterations,
+                    "best_of": best_of,
+                    "system": pattern["system"],
+                    "rubric": pattern["rubric"],
+                    "cascade": self.cascade.tiers,
+                },
+            )
+            run.resume = resume
+        critique = enable_critique and bool(pattern["rubric"])
+        if not enable_editing:
+            logger.info("Pipeline: Stage 2 - Editing skipped")
+        if not critique:
+            logger.info("Pipeline: Stage 3 - Critique skipped")
+            if best_of > 1:
+                logger.info("Pipeline: Best-of-N drafting needs critique, drafting once")
+        best_of = best_of if critique else 1
+
+        # context → user_prompt → draft → (edit ∥ draft_critique) → review → format
+        dag = PipelineDAG()
+        self._add_stage(dag, run, "context", self._context_stage)
+        self._add_stage(dag, run, "metadata", self._metadata_stage, ("context",))
+        self._add_stage(dag, run, "user_prompt", self._user_prompt_stage, ("context",))
+        if best_of > 1:
+            # N drafts critiqued concurrently; the best one and its critique feed the rest
+            candidates = partial(self._candidates_stage, count=best_of)
+            self._add_stage(dag, run, "candidates", candidates, ("user_prompt",))
+            self._add_stage(dag, run, "draft", self._select_stage, ("candidates",))
+        else:
+            self._add_stage(dag, run, "draft", self._draft_stage, ("user_prompt",))
+
+        # A failed edit keeps the unedited draft; a failed draft critique is redone in review
+        content = "draft"
+        if enable_editing:
+            keep_draft = lambda inputs: inputs["draft"]  # noqa: E731
+            self._add_stage(dag, run, "edit", self._edit_stage, ("draft",), keep_draft)
+            content = "edit"
+        if best_of > 1:
+            self._add_stage(
+                dag, run, "draft_critique", self._selected_critique_stage, ("candidates",)
+            )
+        elif critique:
+            no_critique = lambda inputs: None  # noqa: E731
+            critique_inputs = {"content": "draft"}
+            self._add_stage(
+                dag, run, "draft_critique", self._critique_stage, critique_inputs, no_critique
+            )
+        if critique:
+            review_inputs = {"content": content, "draft_critique": "draft_critique"}
+            self._add_stage(dag, run, "review", self._review_stage, review_inputs)
+            content = "review"
+        format_inputs = {"content": content, "metadata": "metadata"}
+        self._add_stage(dag, run, "format", self._format_stage, format_inputs)
+
+        outputs = await dag.run()
+        if run.checkpoint:
+            run.checkpoint.clear()
+        if project_path:
+            save_generation_inputs(project_path, pattern_name, user_inputs)
+
+        final_content, formatted_doc = outputs["format"]
+        critique_result = run.critique
+        pipeline_log = run.log
+
+        # Return complete result
+        return {
+            "document": formatted_doc,
+            "raw_content": final_content,
+            "metadata": outputs["metadata"],
+            "critique": critique_result,
+            "pipeline_log": pipeline_log,
+            "iterations": len([log for log in pipeline_log if "revision" in log.get("stage", "")]),
+            "final_score": critique_result.get("weighted_score") if critique_result else None,
+            "stage_timings": dag.timings,
+            "run_id": run.checkpoint.run_id if run.checkpoint else None,
+            "resumed_stages": run.resumed,
+        }
+
+    def regenerate_sections(
+        self,
+        pattern_name: str,
+        user_inputs: dict[str, Any],
+        document: str,
+        previous_inputs: dict[str, Any] | None = None,
+        enable_editing: bool = True,
+        enable_critique: bool = False,
+        project_path: Path = None,
+        on_token: Callable[[str, str], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Update an existing document for changed inputs, redrafting only affected sections
+
+        Changed variables are mapped to output sections through the "affects"
+        lists in the pattern's variables.json. Only those sections are redrafted
+        (and edited), concurrently, and spliced back; the rest of the document,
+        including manual edits, is kept verbatim. Falls back to a full execute()
+        when the previous inputs are unknown, a changed variable has no mapping,
+        or a mapped section is missing from the document.
+
+        Args:
+            pattern_name: Name of pattern that produced the document
+            user_inputs: Updated user-provided variables
+            document: Current document (as saved)
+            previous_inputs: Inputs the document was generated from (defaults to
+                those recorded under project_path by the last generation)
+            enable_editing: Whether to run the editor on redrafted sections
+            enable_critique: Whether to critique the updated document (no revision loop)
+            project_path: Optional path to project for context loading
+            on_token: Streaming callback, only used by the full-execute fallback
+
+        Returns:
+            Result dictionary like execute(), plus 'regenerated_sections' (headings
+            redrafted, or None after a full regeneration) and 'failed_sections'
+        """
+        return run_sync(
+            self.aregenerate_sections(
+                pattern_name,
+                user_inputs,
+                document,
+                previous_inputs=previous_inputs,
+                enable_editing=enable_editing,
+                enable_critique=enable_critique,
+                project_path=project_path,
+                on_token=on_token,
+            )
+        )
+
+    async def aregenerate_sections(
+        self,
+        pattern_name: str,
+        user_inputs: dict[str, Any],
+        document: str,
+        previous_inputs: dict[str, Any] | None = None,
+        enable_editing: bool = True,
+        enable_critique: bool = False,
+        project_path: Path = None,
+        on_token: Callable[[str, str], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Async twin of regenerate_sections().
+
+        Raises:
+            ValueError: If the pattern does not exist
+        """
+        pattern = self.registry.get_pattern(pattern_name)
+        if not pattern:
+            raise ValueError(f"Pattern not found: {pattern_name}")
+
+        if previous_inputs is None and project_path:
+            previous_inputs = load_generation_inputs(project_path, pattern_name)
+        sections = self._plan_regeneration(pattern_name, user_inputs, previous_inputs, document)
+        if sections is None:
+            result = await self.aexecute(
+                pattern_name,
+                user_inputs,
+                enable_editing=enable_editing,
+                enable_critique=enable_critique,
+                project_path=project_path,
+                on_token=on_token,
+            )
+            return {**result, "regenerated_sections": None, "failed_sections": []}
+
+        logger.info(
+            f"Pipeline: Regenerating {len(sections)} section(s) of '{pattern_name}': "
+            f"{', '.join(section.title for section in sections)}"
+        )
+        run = _PipelineRun(
+            pattern_name=pattern_name,
+            pattern=pattern,
+            user_inputs=user_inputs,
+            project_path=project_path,
+            max_revision_iterations=0,
+            on_token=None,
+        )
+
+        # context → user_prompt → one redraft (+ edit) per affected section, concurrently
+        dag = PipelineDAG()
+        self._add_stage(dag, run, "context", self._context_stage)
+        self._add_stage(dag, run, "user_prompt", self._user_prompt_stage, ("context",))
+        for i, section in enumerate(sections):
+            original = section_text(document, section)
+            dag.add(
+                f"section_{i}",
+                partial(self._section_stage, run, document, original, enable_editing),
+                inputs=("user_prompt",),
+                timeout=self.stage_timeouts.get("section"),
+                fallback=lambda inputs, original=original: (original, False),
+            )
+
+        outputs = await dag.run() if sections else {}
+        redrafts = {section: outputs[f"section_{i}"] for i, section in enumerate(sections)}
+        updated = replace_sections(
+            document, {section: content for section, (content, _) in redrafts.items()}
+        )
+        failed = [section.title for section, (_, ok) in redrafts.items() if not ok]
+
+        critique_result = None
+        if enable_critique and pattern["rubric"] and sections:
+            critique_result = await self._critique_stage(run, updated)
+            run.critique = critique_result
+
+        # Failed sections still reflect the old inputs; keep those on record so they are retried
+        if project_path and not failed:
+            save_generation_inputs(project_path, pattern_name, user_inputs)
+
+        return {
+            "document": updated,
+            "raw_content": updated,
+            "metadata": None,
+            "critique": critique_result,
+            "pipeline_log": run.log,
+            "iterations": 0,
+            "final_score": critique_result.get("weighted_score") if critique_result else None,
+            "stage_timings": dag.timings,
+            "run_id": None,
+            "resumed_stages": [],
+            "regenerated_sections": [section.title for section in sections],
+            "failed_sections": failed,
+        }
+
+    def _plan_regeneration(
+        self,
+        pattern_name: str,
+        user_inputs: dict[str, Any],
+        previous_inputs: dict[str, Any] | None,
+        document: str,
+    ) -> list[Section] | None:
+        """
+        Work out which sections of a document changed inputs affect.
+
+        Returns:
+            Sections to redraft (empty if nothing changed), or None if the whole
+            document has to be regenerated
+        """
+        if previous_inputs is None:
+            logger.info("Pipeline: Previous inputs unknown, regenerating whole document")
+            return None
+
+        changed = [
+            name
+            for name in {**previous_inputs, **user_inputs}
+            if str(user_inputs.get(name) or "").strip()
+            != str(previous_inputs.get(name) or "").strip()
+        ]
+        if not changed:
+            logger.info("Pipeline: Inputs unchanged, nothing to regenerate")
+            return []
+
+        names = self.registry.affected_sections(pattern_name, changed)
+        if names is None:
+            logger.info(
+                f"Pipeline: {', '.join(changed)} may affect the whole document, regenerating it"
+            )
+            return None
+
+        available = split_sections(document)
+        sections = []
+        for name in names:
+            section = find_section(available, name)
+            if section is None:
+                logger.info(f"Pipeline: Section '{name}' not found, regenerating whole document")
+                return None
+            sections.append(section)
+
+        # A section nested in another one is redrafted as part of its parent
+        return [
+            section
+            for section in dict.fromkeys(sections)
+            if not any(
+                other != section and other.start <= section.start and section.end <= other.end
+                for other in sections
+            )
+        ]
+
+    def execute_many(
+        self,
+        jobs: dict[str, dict[str, Any]],
+        project_path: Path = None,
+        max_parallel: int | None = None,
+        **options: Any,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """
+        Run several patterns for one project concurrently.
+
+        Results are yielded as each pattern finishes, so a full kit takes about
+        as long as its slowest pattern. Project context is loaded once and all
+        runs share the LLM client, its connection pool and rate limits.
+
+        Args:
+            jobs: Pattern name -> user inputs
+            project_path: Optional path to project for context loading
+            max_parallel: Max patterns in flight at once (default: all)
+            **options: enable_editing, enable_critique, max_revision_iterations, best_of
+
+        Returns:
+            Iterator of (pattern name, result); a failed pattern's result is
+            {"error": message}
+        """
+        yield from iterate_sync(self.aexecute_many(jobs, project_path, max_parallel, **options))
+
+    async def aexecute_many(
+        self,
+        jobs: dict[str, dict[str, Any]],
+        project_path: Path = None,
+        max_parallel: int | None = None,
+        **options: Any,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Async twin of execute_many()."""
+        logger.info(f"Pipeline: Running {len(jobs)} patterns concurrently")
+
         context = {}
         if project_path and self.project_context:
             self.project_context.project_path = Path(project_path)
-            context = self.project_context.load_context()
+            context = await asyncio.to_thread(self.project_context.load_context)
             logger.info(f"Pipeline: Loaded project context from {project_path}")
 
-        # Stage 1: DRAFT
-        logger.info("Pipeline: Stage 1 - Drafting")
-        user_prompt = self.registry.render_user_prompt(pattern_name, **user_inputs, **context)
-        draft = self.draft_agent.generate_draft(
-            system_prompt=pattern["system"],
-            user_prompt=user_prompt,
-            temperature=0.3,
-            max_tokens=2500,
+        limit = asyncio.Semaphore(max_parallel or len(jobs) or 1)
+
+        async def run_one(pattern_name: str, user_inputs: dict[str, Any]):
+            async with limit:
+                try:
+                    result = await self.aexecute(
+                        pattern_name,
+                        user_inputs,
+                        project_path=project_path,
+                        context=context,
+                        **options,
+                    )
+                except Exception as e:
+                    logger.error(f"Pipeline: Pattern '{pattern_name}' failed: {e}")
+                    result = {"error": str(e)}
+                return pattern_name, result
+
+        tasks = [asyncio.create_task(run_one(name, inputs)) for name, inputs in jobs.items()]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _add_stage(
+        self,
+        dag: PipelineDAG,
+        run: _PipelineRun,
+        name: str,
+        stage: Callable,
+        inputs: tuple[str, ...] | dict[str, str] = (),
+        fallback: Callable[[dict[str, Any]], Any] | None = None,
+    ):
+        """Add a stage method bound to this run, with its configured timeout and checkpoint."""
+        fn = partial(stage, run)
+        if run.checkpoint and name in CHECKPOINT_STAGES:
+            fn = partial(self._checkpointed, run, name, fn)
+        dag.add(
+            name,
+            fn,
+            inputs=inputs,
+            timeout=self.stage_timeouts.get(name),
+            fallback=fallback,
         )
 
-        # Track pipeline state
-        pipeline_log = [{"stage": "draft", "content": draft, "length": len(draft)}]
+    async def _checkpointed(
+        self, run: _PipelineRun, name: str, stage: Callable, **inputs: Any
+    ) -> Any:
+        """Restore a stage from the run's checkpoint, or run it and save its output."""
+        saved = run.checkpoint.load(name, inputs) if run.resume else None
+        if saved is not None:
+            logger.info(f"Pipeline: Resuming stage '{name}' from run {run.checkpoint.run_id}")
+            run.log.extend(saved["log"])
+            if "critique" in saved:
+                run.critique = saved["critique"]
+            run.resumed.append(name)
+            return saved["output"]
 
-        # Stage 2: EDIT (optional)
-        if enable_editing:
-            logger.info("Pipeline: Stage 2 - Editing")
-            edited = self.editor_agent.edit_draft(draft)
-            pipeline_log.append({"stage": "edit", "content": edited, "length": len(edited)})
-        else:
-            edited = draft
-            logger.info("Pipeline: Stage 2 - Editing skipped")
+        # Each DAG stage runs in its own task, so this only collects this stage's entries
+        entries: list[dict] = []
+        _stage_log.set(entries)
+        output = await stage(**inputs)
 
-        # Stage 3: CRITIQUE & REVISION (optional)
-        critique_result = None
-        final_content = edited
+        payload = {"output": output, "log": entries}
+        if name == "review":
+            payload["critique"] = run.critique
+        if not _failed_output(output) and not _failed_output(payload.get("critique")):
+            run.checkpoint.save(name, inputs, payload)
+        return output
 
-        if enable_critique and pattern["rubric"]:
-            logger.info("Pipeline: Stage 3 - Critique & Revision")
+    async def _context_stage(self, run: _PipelineRun) -> dict[str, str]:
+        """Load project context if available."""
+        if run.context is not None:
+            return run.context
+        if not (run.project_path and self.project_context):
+            return {}
 
-            for iteration in range(max_revision_iterations):
-                critique_result = self.critic_agent.critique_charter(
-                    final_content, rubric=pattern["rubric"]
-                )
+        self.project_context.project_path = Path(run.project_path)
+        context = await asyncio.to_thread(self.project_context.load_context)
+        logger.info(f"Pipeline: Loaded project context from {run.project_path}")
+        return context
 
-                score = critique_result.get("weighted_score", 0)
-                threshold = pattern["rubric"].get("threshold", 0.75)
+    async def _metadata_stage(self, run: _PipelineRun, context: dict[str, str]) -> dict[str, Any]:
+        """Build output metadata; runs alongside drafting."""
+        project_name = "Unknown"
+        if self.project_context:
+            project_name = await asyncio.to_thread(self.project_context.get_project_name)
 
-                logger.info(
-                    f"Pipeline: Critique iteration {iteration + 1} - Score: {score:.2f} (threshold: {threshold})"
-                )
+        return {
+            "project_name": project_name,
+            "created_date": datetime.now().strftime("%Y-%m-%d"),
+            "pattern": run.pattern_name,
+            "version": "1.0",
+            "author": "Project Team",
+            "status": "Draft",
+        }
 
-                if score >= threshold:
-                    logger.info("Pipeline: Quality threshold met")
-                    break
+    async def _user_prompt_stage(self, run: _PipelineRun, context: dict[str, str]) -> str:
+        """Render the pattern's user prompt with inputs and project context."""
+        return self.registry.render_user_prompt(run.pattern_name, **run.user_inputs, **context)
 
-                if iteration < max_revision_iterations - 1:
-                    # Revision pass
-                    logger.info("Pipeline: Running revision based on critique")
-                    revision_prompt = self._build_revision_prompt(final_content, critique_result)
-                    final_content = self.editor_agent.edit_draft(
-                        final_content, specific_guidance=revision_prompt
-                    )
-                    pipeline_log.append(
-                        {
-                            "stage": f"revision_{iteration + 1}",
-                            "content": final_content,
-                            "score": score,
-                            "length": len(final_content),
-                        }
+    async def _draft_stage(self, run: _PipelineRun, user_prompt: str) -> str:
+        """Stage 1: DRAFT."""
+        logger.info("Pipeline: Stage 1 - Drafting")
+        draft, model = await self._generate_draft(run, user_prompt)
+
+        # Track pipeline state
+        run.add_log(
+            {
+                "stage": "draft",
+                "content": draft,
+                "length": len(draft),
+                "model": self._model_name(self.draft_agent, model),
+            }
+        )
+        return draft
+
+    async def _generate_draft(
+        self, run: _PipelineRun, user_prompt: str, temperature: float = 0.3, stream: bool = True
+    ) -> tuple[str, str | None]:
+        """
+        Draft the document, escalating to the next model tier if drafting fails.
+
+        Returns:
+            Tuple of (draft, cascade tier used)
+        """
+        draft_models = self.cascade.models("draft")
+        for tier, model in enumerate(draft_models):
+            agent = self._tier_agent(self.draft_agent, model)
+            request = {
+                "system_prompt": run.pattern["system"],
+                "user_prompt": user_prompt,
+                "temperature": temperature,
+                "max_tokens": 2500,
+                "output_key": f"{run.pattern_name}:draft",
+                # Size from the user's inputs, not the variable-size project context
+                "output_basis": _inputs_text(run.user_inputs),
+                "hedge": self.hedge_drafts,
+            }
+            with call_context(pattern=run.pattern_name, stage="draft"):
+                if stream:
+                    draft = await self._run_agent(
+                        run, "draft", agent.generate_draft, agent.agenerate_draft, **request
                     )
+                else:
+                    draft = await agent.agenerate_draft(**request)
+            if not draft.startswith("[ERROR") or tier == len(draft_models) - 1:
+                break
+            self._log_escalation(run, "draft", model, draft_models[tier + 1], "draft failed")
+        return draft, model
+
+    async def _candidates_stage(
+        self, run: _PipelineRun, user_prompt: str, count: int
+    ) -> list[dict[str, Any]]:
+        """
+        Stage 1 (best-of-N): draft candidates concurrently and critique each one.
+
+        Candidates use temperatures spread over CANDIDATE_TEMPERATURES, so they
+        differ from each other (and never share a cached completion).
 
-            pipeline_log.append(
+        Returns:
+            Candidates as dicts with draft, critique, temperature and model; a
+            candidate whose draft failed also has an "error" key
+        """
+        logger.info(f"Pipeline: Stage 1 - Drafting {count} candidates")
+        low, high = CANDIDATE_TEMPERATURES
+        temperatures = [round(low + (high - low) * i / (count - 1), 2) for i in range(count)]
+
+        async def candidate(temperature: float) -> dict[str, Any]:
+            draft, model = await self._generate_draft(run, user_prompt, temperature, stream=False)
+            entry = {"draft": draft, "critique": None, "temperature": temperature, "model": model}
+            if _failed_output(draft):
+                entry["error"] = draft
+            else:
+                entry["critique"] = await self._critique_stage(run, draft)
+            return entry
+
+        candidates = await asyncio.gather(*(candidate(t) for t in temperatures))
+        for entry in candidates:
+            run.add_log(
                 {
-                    "stage": "final_critique",
-                    "score": critique_result.get("weighted_score", 0),
-                    "approved": critique_result.get("approved", False),
+                    "stage": "candidate",
+                    "temperature": entry["temperature"],
+                    "score": _candidate_score(entry),
+                    "length": len(entry["draft"]),
                 }
             )
-        else:
-            logger.info("Pipeline: Stage 3 - Critique skipped")
+        return candidates
 
-        # Stage 4: FORMAT OUTPUT
+    async def _select_stage(self, run: _PipelineRun, candidates: list[dict[str, Any]]) -> str:
+        """Keep the best-scoring candidate as the draft."""
+        best = max(candidates, key=_candidate_score)
+        logger.info(
+            f"Pipeline: Selected candidate at temperature {best['temperature']} "
+            f"(score {_candidate_score(best):.2f}) from {len(candidates)}"
+        )
+        run.add_log(
+            {
+                "stage": "draft",
+                "content": best["draft"],
+                "length": len(best["draft"]),
+                "model": self._model_name(self.draft_agent, best["model"]),
+                "temperature": best["temperature"],
+                "candidates": len(candidates),
+            }
+        )
+        return best["draft"]
+
+    async def _selected_critique_stage(
+        self, run: _PipelineRun, candidates: list[dict[str, Any]]
+    ) -> dict | None:
+        """The critique of the selected candidate stands in for the raw-draft critique."""
+        critique = max(candidates, key=_candidate_score)["critique"]
+        return None if _failed_output(critique) else critique
+
+    async def _edit_stage(self, run: _PipelineRun, draft: str) -> str:
+        """Stage 2: EDIT (optional)."""
+        logger.info("Pipeline: Stage 2 - Editing")
+        # Edits never escalate: a failed edit returns the draft unchanged
+        edit_model = self.cascade.models("edit")[0]
+        agent = self._tier_agent(self.editor_agent, edit_model)
+        with call_context(pattern=run.pattern_name, stage="edit"):
+            edited = await self._run_agent(
+                run, "edit", agent.edit_draft, agent.aedit_draft, draft=draft
+            )
+
+        run.add_log(
+            {
+                "stage": "edit",
+                "content": edited,
+                "length": len(edited),
+                "model": self._model_name(self.editor_agent, edit_model),
+            }
+        )
+        return edited
+
+    async def _review_stage(
+        self, run: _PipelineRun, content: str, draft_critique: dict | None
+    ) -> str:
+        """
+        Stage 3: CRITIQUE & REVISION (optional).
+
+        Starts from the raw-draft critique when it finished; a score below
+        threshold escalates the revision one model tier. The last critique is
+        kept on the run.
+        """
+        logger.info("Pipeline: Stage 3 - Critique & Revision")
+        rubric = run.pattern["rubric"]
+        threshold = rubric.get("threshold", 0.75)
+        revision_models = self.cascade.models("revision")
+        revision_model = revision_models[0]
+        critique_result = draft_critique
+        final_content = content
+
+        for iteration in range(run.max_revision_iterations):
+            if iteration or critique_result is None:
+                critique_result = await self._critique_stage(run, final_content)
+
+            score = critique_result.get("weighted_score", 0)
+            logger.info(
+                f"Pipeline: Critique iteration {iteration + 1} - Score: {score:.2f} (threshold: {threshold})"
+            )
+
+            if score >= threshold:
+                logger.info("Pipeline: Quality threshold met")
+                break
+
+            if iteration < run.max_revision_iterations - 1:
+                next_model = revision_models[min(iteration + 1, len(revision_models) - 1)]
+                if next_model != revision_model:
+                    self._log_escalation(
+                        run,
+                        "revision",
+                        revision_model,
+                        next_model,
+                        f"score {score:.2f} below threshold {threshold}",
+                    )
+                    revision_model = next_model
+
+                # Revision pass
+                logger.info("Pipeline: Running revision based on critique")
+                stage = f"revision_{iteration + 1}"
+                agent = self._tier_agent(self.editor_agent, revision_model)
+                with call_context(pattern=run.pattern_name, stage="revision"):
+                    final_content = await self._run_agent(
+                        run,
+                        stage,
+                        agent.edit_draft,
+                        agent.aedit_draft,
+                        draft=final_content,
+                        specific_guidance=self._build_revision_prompt(
+                            final_content, critique_result
+                        ),
+                    )
+                run.add_log(
+                    {
+                        "stage": stage,
+                        "content": final_content,
+                        "score": score,
+                        "length": len(final_content),
+                        "model": self._model_name(self.editor_agent, revision_model),
+                    }
+                )
+
+        if critique_result is None:
+            critique_result = await self._critique_stage(run, final_content)
+
+        run.add_log(
+            {
+                "stage": "final_critique",
+                "score": critique_result.get("weighted_score", 0),
+                "approved": critique_result.get("approved", False),
+            }
+        )
+        run.critique = critique_result
+        return final_content
+
+    async def _critique_stage(self, run: _PipelineRun, content: str) -> dict:
+        """Critique content, escalating the critic model tier when the reply can't be parsed."""
+        models = self.cascade.models("critique")
+        for tier, model in enumerate(models):
+            with call_context(pattern=run.pattern_name, stage="critique"):
+                result = await self._tier_agent(self.critic_agent, model).acritique_charter(
+                    content,
+                    rubric=run.pattern["rubric"],
+                    per_criterion=self.per_criterion_critique,
+                )
+            if "error" not in result or tier == len(models) - 1:
+                return result
+            self._log_escalation(run, "critique", model, models[tier + 1], result["error"])
+        return result
+
+    async def _section_stage(
+        self,
+        run: _PipelineRun,
+        document: str,
+        original: str,
+        enable_editing: bool,
+        user_prompt: str,
+    ) -> tuple[str, bool]:
+        """
+        Redraft (and edit) one section for the updated inputs.
+
+        Returns:
+            Tuple of (section markdown, whether it was redrafted); a failed
+            redraft keeps the original section
+        """
+        heading = original.splitlines()[0]
+        title = heading.lstrip("#").strip()
+        draft_models = self.cascade.models("draft")
+        for tier, model in enumerate(draft_models):
+            with call_context(pattern=run.pattern_name, stage="section"):
+                redraft = await self._tier_agent(self.draft_agent, model).aredraft_section(
+                    system_prompt=run.pattern["system"],
+                    user_prompt=user_prompt,
+                    document=document,
+                    section=original,
+                )
+            if not redraft.startswith("[ERROR") or tier == len(draft_models) - 1:
+                break
+            self._log_escalation(run, "section", model, draft_models[tier + 1], "redraft failed")
+
+        if redraft.startswith("[ERROR"):
+            logger.warning(f"Pipeline: Keeping section '{title}': {redraft}")
+            run.add_log({"stage": "section", "section": title, "error": redraft})
+            return original, False
+
+        # Keep the original heading so the section can be found again next time
+        content = with_heading(clean_markdown_output(redraft), heading)
+        if enable_editing:
+            edit_model = self.cascade.models("edit")[0]
+            with call_context(pattern=run.pattern_name, stage="edit"):
+                edited = await self._tier_agent(self.editor_agent, edit_model).aedit_draft(
+                    draft=content
+                )
+            if edited and not _failed_output(edited):
+                content = with_heading(clean_markdown_output(edited), heading)
+
+        run.add_log(
+            {
+                "stage": "section",
+                "section": title,
+                "content": content,
+                "length": len(content),
+                "model": self._model_name(self.draft_agent, model),
+            }
+        )
+        return content, True
+
+    async def _format_stage(
+        self, run: _PipelineRun, content: str, metadata: dict[str, Any]
+    ) -> tuple[str, str]:
+        """
+        Stage 4: FORMAT OUTPUT.
+
+        Returns:
+            Tuple of (final content, formatted document)
+        """
         logger.info("Pipeline: Stage 4 - Formatting output")
+        document = self.registry.render_output(run.pattern_name, content=content, **metadata)
+        return content, document
 
-        metadata = {
-            "project_name": self.project_context.get_project_name()
-            if self.project_context
-            else "Unknown",
-            "created_date": datetime.now().strftime("%Y-%m-%d"),
-            "pattern": pattern_name,
-            "version": "1.0",
-            "author": "Project Team",
-            "status": "Draft",
-        }
+    async def _run_agent(
+        self,
+        run: _PipelineRun,
+        stage: str,
+        sync_fn: Callable[..., str],
+        async_fn: Callable[..., Any],
+        **kwargs: Any,
+    ) -> str:
+        """
+        Run an agent call, streaming to on_token when a callback is set.
 
-        formatted_doc = self.registry.render_output(pattern_name, content=final_content, **metadata)
+        Streaming calls run in a worker thread; their deltas are handed back to
+        the thread waiting in execute() (or the event loop's thread for async
+        callers) so UI callbacks never run on the worker.
+        """
+        if run.on_token is None:
+            return await async_fn(**kwargs)
 
-        # Return complete result
-        return {
-            "document": formatted_doc,
-            "raw_content": final_content,
-            "metadata": metadata,
-            "critique": critique_result,
-            "pipeline_log": pipeline_log,
-            "iterations": len([log for log in pipeline_log if "revision" in log.get("stage", "")]),
-            "final_score": critique_result.get("weighted_score") if critique_result else None,
-        }
+        loop = asyncio.get_running_loop()
+        on_token = run.on_token
+
+        def forward(delta: str):
+            call_in_caller(on_token, stage, delta, loop=loop)
+
+        return await asyncio.to_thread(sync_fn, on_token=forward, **kwargs)
+
+    def _tier_agent(self, agent, model: str | None):
+        """Get a copy of an agent bound to a cascade model (the agent itself for None)."""
+        if model is None or model == agent.llm.model:
+            return agent
+
+        key = (type(agent), model)
+        if key not in self._tier_agents:
+            self._tier_agents[key] = type(agent)(agent.llm.with_model(model))
+        return self._tier_agents[key]
+
+    def _model_name(self, agent, model: str | None) -> str:
+        """Resolve a cascade tier to the model name actually used."""
+        return model or agent.llm.model
+
+    def _log_escalation(
+        self,
+        run: _PipelineRun,
+        stage: str,
+        from_model: str | None,
+        to_model: str | None,
+        reason: str,
+    ):
+        """Record a model escalation in the pipeline log."""
+        logger.info(f"Pipeline: Escalating {stage} from {from_model} to {to_model} ({reason})")
+        run.add_log(
+            {
+                "stage": "escalation",
+                "escalated_stage": stage,
+                "from_model": from_model,
+                "to_model": to_model,
+                "reason": reason,
+            }
+        )
 
     def _build_revision_prompt(self, content: str, critique: dict) -> str:
         """Build specific revision guidance from critique"""
@@ -191,8 +1069,6 @@ class PatternPipeline:
             if low_scores:
                 guidance += "## Areas Needing Improvement\n"
                 for score in low_scores[:2]:  # Top 2
-                    guidance += (
-                        f"- **{score['criterion']}**: {', '.join(score.get('improvements', []))}\n"
-                    )
+                    guidance += f"- **{score['criterion']}**: {score.get('improvements', '')}\n"
 
         return guidance
@@ -130,6 +130,34 @@ class PatternRegistry:
             "rubric_threshold": pattern["rubric"].get("threshold") if pattern["rubric"] else None,
         }
 
+    def affected_sections(self, pattern_name: str, variable_names: list[str]) -> list[str] | None:
+        """
+        Get the output sections influenced by a set of variables
+
+        Uses the optional "affects" list of each variable in variables.json
+        (section headings, e.g. ["Milestones", "Assumptions & Notes"]).
+
+        Args:
+            pattern_name: Name of pattern
+            variable_names: Variables whose values changed
+
+        Returns:
+            Section headings in first-seen order, or None if any variable has no
+            "affects" list (i.e. it may influence the whole document)
+        """
+        pattern = self.get_pattern(pattern_name)
+        if not pattern:
+            return None
+
+        variables = pattern.get("variables") or {}
+        sections = []
+        for name in variable_names:
+            affects = variables.get(name, {}).get("affects")
+            if not affects:
+                return None
+            sections.extend(section for section in affects if section not in sections)
+        return sections
+
     def render_user_prompt(self, pattern_name: str, **variables) -> str:
         """
         Render user.md template with provided variables
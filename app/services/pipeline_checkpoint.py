@@ -0,0 +1,171 @@
+"""
+Pipeline Checkpoints
+Persists completed pipeline stages so an interrupted run can resume, and the
+inputs each deliverable was last generated from
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = Path(".project_wizard")
+RUNS_DIR = STATE_DIR / "runs"
+INPUTS_DIR = STATE_DIR / "inputs"
+
+
+def content_hash(value: Any) -> str:
+    """Stable SHA-256 of a JSON-serializable value."""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def save_generation_inputs(project_path: Path, pattern_name: str, user_inputs: dict[str, Any]):
+    """
+    Remember the inputs a deliverable was generated from.
+
+    Section-level regeneration diffs new wizard inputs against these.
+
+    Args:
+        project_path: Project root
+        pattern_name: Pattern that produced the deliverable
+        user_inputs: Variables used for the generation
+    """
+    path = Path(project_path) / INPUTS_DIR / f"{pattern_name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _ignore_state_dir(Path(project_path))
+    temp = path.with_suffix(".tmp")
+    temp.write_text(json.dumps(user_inputs, indent=2, ensure_ascii=False), encoding="utf-8")
+    temp.replace(path)
+
+
+def load_generation_inputs(project_path: Path, pattern_name: str) -> dict[str, Any] | None:
+    """
+    Get the inputs a deliverable was last generated from.
+
+    Args:
+        project_path: Project root
+        pattern_name: Pattern that produced the deliverable
+
+    Returns:
+        Saved variables, or None if unknown
+    """
+    path = Path(project_path) / INPUTS_DIR / f"{pattern_name}.json"
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Checkpoint: Ignoring unreadable {path}: {e}")
+        return None
+
+
+def _ignore_state_dir(project_path: Path):
+    """Keep the .project_wizard folder out of the project's git."""
+    ignore = project_path / STATE_DIR / ".gitignore"
+    if not ignore.exists():
+        ignore.write_text("*\n")
+
+
+class RunCheckpoint:
+    """
+    Stage outputs of one pipeline run, stored as JSON files in a run directory.
+
+    The run ID combines the pattern name with a hash of everything that
+    defines the run (inputs, options, pattern prompt and rubric). Each stage
+    file also records a hash of the stage's own inputs, so a stage is only
+    restored if everything upstream of it is unchanged.
+    """
+
+    def __init__(self, run_dir: Path):
+        """
+        Initialize checkpoint store
+
+        Args:
+            run_dir: Directory holding this run's stage files
+        """
+        self.run_dir = Path(run_dir)
+
+    @classmethod
+    def for_run(cls, project_path: Path, pattern_name: str, run_key: dict) -> "RunCheckpoint":
+        """
+        Get the checkpoint store for a run in a project.
+
+        Args:
+            project_path: Project root
+            pattern_name: Pattern being executed
+            run_key: Everything that defines the run (inputs, options, pattern)
+
+        Returns:
+            RunCheckpoint for <project>/.project_wizard/runs/<pattern>-<hash>
+        """
+        run_id = f"{pattern_name}-{content_hash(run_key)[:12]}"
+        return cls(Path(project_path) / RUNS_DIR / run_id)
+
+    @property
+    def run_id(self) -> str:
+        return self.run_dir.name
+
+    def load(self, stage: str, inputs: dict[str, Any]) -> dict[str, Any] | None:
+        """
+        Get a saved stage if it was produced from the same inputs.
+
+        Args:
+            stage: Stage name
+            inputs: The stage's current inputs
+
+        Returns:
+            Saved payload (output, log, ...) or None
+        """
+        path = self._stage_file(stage)
+        if not path.exists():
+            return None
+
+        try:
+            saved = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Checkpoint: Ignoring unreadable {path}: {e}")
+            return None
+
+        if saved.get("input_hash") != content_hash(inputs):
+            logger.info(f"Checkpoint: Inputs of stage '{stage}' changed, not resuming it")
+            return None
+        return saved
+
+    def save(self, stage: str, inputs: dict[str, Any], payload: dict[str, Any]):
+        """
+        Persist a completed stage.
+
+        Args:
+            stage: Stage name
+            inputs: The stage's inputs
+            payload: JSON-serializable stage data (output, log entries, ...)
+        """
+        self._ensure_dir()
+        record = {
+            **payload,
+            "stage": stage,
+            "input_hash": content_hash(inputs),
+            "saved_at": datetime.now().isoformat(),
+        }
+        path = self._stage_file(stage)
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps(record, indent=2, ensure_ascii=False), encoding="utf-8")
+        temp.replace(path)
+
+    def clear(self):
+        """Delete the run directory (called once a run completes)."""
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+    def _stage_file(self, stage: str) -> Path:
+        return self.run_dir / f"{stage}.json"
+
+    def _ensure_dir(self):
+        """Create the run directory, keeping the runs folder out of the project's git."""
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        _ignore_state_dir(self.run_dir.parent.parent.parent)
@@ -0,0 +1,161 @@
+"""
+Pipeline DAG
+Runs pipeline stages as a dependency graph on an asyncio scheduler
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineStageError(RuntimeError):
+    """Raised when a stage without a fallback fails or times out."""
+
+    def __init__(self, stage: str, cause: BaseException):
+        reason = "timed out" if isinstance(cause, asyncio.TimeoutError) else str(cause)
+        super().__init__(f"Pipeline stage '{stage}' failed: {reason}")
+        self.stage = stage
+        self.cause = cause
+
+
+@dataclass
+class Node:
+    """One pipeline stage: an async function of the outputs it depends on."""
+
+    name: str
+    fn: Callable[..., Awaitable[Any]]  # Called with one keyword argument per input
+    inputs: dict[str, str] = field(default_factory=dict)  # Argument name -> source name
+    timeout: float | None = None
+    fallback: Callable[[dict[str, Any]], Any] | None = None  # Output used on failure/timeout
+
+
+class PipelineDAG:
+    """
+    Stages with explicit inputs, scheduled as soon as their inputs are ready.
+
+    Each node's output is stored under its name and passed to downstream nodes
+    as a keyword argument (named after the source, or renamed with a mapping).
+    Independent nodes run concurrently.
+
+    Example:
+        dag = PipelineDAG()
+        dag.add("draft", draft_fn, inputs=("prompt",), timeout=300)
+        dag.add("edit", edit_fn, inputs=("draft",))
+        dag.add("critique", critique_fn, inputs={"content": "draft"})  # overlaps with edit
+        outputs = await dag.run(prompt="...")
+    """
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        self.nodes: dict[str, Node] = {}
+        self.timings: dict[str, float] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Awaitable[Any]],
+        inputs: Sequence[str] | Mapping[str, str] = (),
+        timeout: float | None = None,
+        fallback: Callable[[dict[str, Any]], Any] | None = None,
+    ) -> "PipelineDAG":
+        """
+        Add a stage.
+
+        Args:
+            name: Stage name, also the name of its output
+            fn: Coroutine function called with the stage inputs as keyword arguments
+            inputs: Names of stages (or initial values) this stage needs, or a
+                mapping of argument name to source name
+            timeout: Seconds before the stage is cancelled (None = no limit)
+            fallback: Called with the inputs to produce an output if the stage
+                fails or times out; without one the whole run fails
+
+        Returns:
+            The graph, for chaining
+
+        Raises:
+            ValueError: If a stage with that name already exists
+        """
+        if name in self.nodes:
+            raise ValueError(f"Duplicate pipeline stage: {name}")
+        if not isinstance(inputs, Mapping):
+            inputs = {source: source for source in inputs}
+        self.nodes[name] = Node(name, fn, dict(inputs), timeout, fallback)
+        return self
+
+    async def run(self, **initial: Any) -> dict[str, Any]:
+        """
+        Run every stage once its inputs are available.
+
+        Args:
+            **initial: Values available before any stage runs
+
+        Returns:
+            Dict of initial values and stage outputs by name
+
+        Raises:
+            ValueError: If an input can never be satisfied (missing stage or cycle)
+            PipelineStageError: If a stage without a fallback fails
+        """
+        self._check(initial.keys())
+        self.timings = {}
+        results = dict(initial)
+        pending = dict(self.nodes)
+        running: dict[asyncio.Task, str] = {}
+
+        try:
+            while pending or running:
+                for name, node in list(pending.items()):
+                    if all(source in results for source in node.inputs.values()):
+                        del pending[name]
+                        kwargs = {arg: results[source] for arg, source in node.inputs.items()}
+                        task = asyncio.create_task(self._run_node(node, kwargs), name=name)
+                        running[task] = name
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    results[running.pop(task)] = task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        return results
+
+    async def _run_node(self, node: Node, kwargs: dict[str, Any]) -> Any:
+        """Run one stage under its timeout, falling back on failure if it can."""
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(node.fn(**kwargs), node.timeout)
+        except Exception as e:
+            if node.fallback is None:
+                raise PipelineStageError(node.name, e) from e
+            reason = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+            logger.warning(f"Pipeline: Stage '{node.name}' {reason}, using fallback")
+            return node.fallback(kwargs)
+        finally:
+            self.timings[node.name] = round(time.monotonic() - started, 3)
+            logger.debug(f"Pipeline: Stage '{node.name}' took {self.timings[node.name]}s")
+
+    def _check(self, available):
+        """Verify every input is produced by some stage and the graph is acyclic."""
+        ready = set(available)
+        remaining = dict(self.nodes)
+        while remaining:
+            runnable = [
+                n for n, node in remaining.items() if ready.issuperset(node.inputs.values())
+            ]
+            if not runnable:
+                unresolved = {
+                    n: [i for i in node.inputs.values() if i not in ready]
+                    for n, node in remaining.items()
+                }
+                raise ValueError(f"Unsatisfiable pipeline inputs (missing or cyclic): {unresolved}")
+            for name in runnable:
+                ready.add(name)
+                del remaining[name]
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 
 import streamlit as st
 
-from app.components.document_editor import DocumentEditor
+from app.components.document_editor import DocumentEditor, StreamingPreview
 from app.services.ai_agents import CharterAgent, CriticAgent
 from app.services.pattern_pipeline import PatternPipeline
 from app.services.pattern_registry import PatternRegistry
@@ -279,13 +279,16 @@ def _render_generate_step(charter_file, registry, project_registry):
                 # Use pattern pipeline for charter generation
                 project_context = ProjectContext(st.session_state.project_path)
                 pipeline = PatternPipeline(pattern_registry=registry, project_context=project_context)
+                preview = StreamingPreview()
                 result = pipeline.execute(
                     pattern_name="project_charter",
                     user_inputs=st.session_state.form_data,
                     enable_editing=False,
                     enable_critique=False,
                     project_path=st.session_state.project_path,
+                    on_token=preview,
                 )
+                preview.clear()
 
                 charter_text = result["document"]
                 
@@ -8,10 +8,11 @@ from pathlib import Path
 
 import streamlit as st
 
-from app.components.document_editor import DocumentEditor
+from app.components.document_editor import DocumentEditor, StreamingPreview
 from app.services.ai_agents import CharterAgent, CriticAgent
 from app.services.pattern_pipeline import PatternPipeline
 from app.services.pattern_registry import PatternRegistry
+from app.services.pipeline_checkpoint import load_generation_inputs
 from app.services.project_context import ProjectContext
 from app.services.openproject_exporter import OpenProjectExporter
 from app.utils.parsers import parse_charter_to_form_data
@@ -45,20 +46,12 @@ def render_deliverables_tab(
     # Let user select deliverable type
     selected_deliverable, pattern_key = _render_deliverable_selector(deliverable_patterns)
 
+    _render_generate_all(deliverable_patterns, registry)
+
     st.markdown("---")
 
     # Check if deliverable exists
-    deliverable_file = st.session_state.project_path / f"{pattern_key.upper()}.md"
-
-    # Handle special case for project_charter -> PROJECT_CHARTER.md
-    if pattern_key == "project_charter":
-        charter_file = st.session_state.project_path / "PROJECT_CHARTER.md"
-        deliverable_file = charter_file
-    # Handle special case for work_plan/ISSUES.md
-    elif pattern_key == "work_plan":
-        issues_file = st.session_state.project_path / "ISSUES.md"
-        if issues_file.exists():
-            deliverable_file = issues_file
+    deliverable_file = _get_deliverable_file(pattern_key)
 
     # Check if wizard should be shown (even if file exists)
     if st.session_state.get(f"show_wizard_{pattern_key}", False):
@@ -86,6 +79,22 @@ def _get_deliverable_patterns(registry: PatternRegistry) -> dict:
             deliverable_patterns[pattern_key] = display_name
     return deliverable_patterns
 
+def _get_deliverable_file(pattern_key: str) -> Path:
+    """Get the file a deliverable pattern is saved to."""
+    deliverable_file = st.session_state.project_path / f"{pattern_key.upper()}.md"
+
+    # Handle special case for project_charter -> PROJECT_CHARTER.md
+    if pattern_key == "project_charter":
+        deliverable_file = st.session_state.project_path / "PROJECT_CHARTER.md"
+    # Handle special case for work_plan/ISSUES.md
+    elif pattern_key == "work_plan":
+        issues_file = st.session_state.project_path / "ISSUES.md"
+        if issues_file.exists():
+            deliverable_file = issues_file
+
+    return deliverable_file
+
+
 def _render_deliverable_selector(deliverable_patterns: dict) -> tuple:
     """Render deliverable selector and return selected pattern."""
     deliverable_options = list(deliverable_patterns.values())
@@ -232,9 +241,9 @@ def _render_wizard_form(
     """Render the wizard form for creating a deliverable."""
     st.subheader(f"Create {selected_deliverable}")
 
-    # Pre-populate form with existing charter data if recreating
-    existing_form_data = {}
-    if deliverable_file.exists():
+    # Pre-populate form with the inputs it was generated from, or parsed charter data
+    existing_form_data = load_generation_inputs(st.session_state.project_path, pattern_key) or {}
+    if deliverable_file.exists() and not existing_form_data:
         try:
             existing_content = deliverable_file.read_text()
             existing_form_data = parse_charter_to_form_data(existing_content)
@@ -279,11 +288,26 @@ def _render_wizard_form(
                 with st.expander("📚 Common values (copy/paste)"):
                     st.code("\n".join(library), language=None)
 
+        regenerate_all = False
+        if deliverable_file.exists():
+            regenerate_all = st.checkbox(
+                "Regenerate entire document",
+                value=False,
+                help="Redraft the whole document instead of only the sections affected "
+                "by changed inputs (replaces any manual edits)",
+                key=f"regenerate_all_{pattern_key}",
+            )
+
         col1, col2 = st.columns([3, 1])
         with col1:
             if st.form_submit_button("✨ Generate", type="primary", use_container_width=True):
                 _generate_deliverable(
-                    deliverable_file, pattern_key, selected_deliverable, user_inputs, registry
+                    deliverable_file,
+                    pattern_key,
+                    selected_deliverable,
+                    user_inputs,
+                    registry,
+                    regenerate_all=regenerate_all,
                 )
 
         with col2:
@@ -292,21 +316,133 @@ def _render_wizard_form(
                 st.rerun()
 
 
+def _render_generate_all(deliverable_patterns: dict, registry: PatternRegistry):
+    """Render the action that generates every deliverable in one concurrent batch."""
+    with st.expander("⚡ Generate all deliverables"):
+        st.caption(
+            "Generates every deliverable at once from the project charter and any "
+            "wizard inputs entered this session. Runs in parallel, so the kit takes "
+            "about as long as the slowest deliverable."
+        )
+        overwrite = st.checkbox(
+            "Overwrite existing deliverables", value=False, key="generate_all_overwrite"
+        )
+        if st.button("⚡ Generate all", type="primary", key="generate_all_button"):
+            _generate_all_deliverables(deliverable_patterns, registry, overwrite)
+
+
+def _collect_batch_inputs(pattern_key: str, variables: dict, charter_data: dict) -> tuple:
+    """
+    Gather wizard inputs for a pattern from session state, falling back to the charter.
+
+    Returns:
+        Tuple of (user inputs, labels of missing required fields)
+    """
+    user_inputs = {}
+    missing = []
+    for var_name, var_config in variables.items():
+        value = st.session_state.get(f"{pattern_key}_{var_name}") or charter_data.get(var_name, "")
+        user_inputs[var_name] = value
+        if var_config.get("required", False) and not str(value).strip():
+            missing.append(var_config.get("label", var_name))
+    return user_inputs, missing
+
+
+def _generate_all_deliverables(
+    deliverable_patterns: dict, registry: PatternRegistry, overwrite: bool
+):
+    """Generate all deliverables concurrently, saving each as soon as it finishes."""
+    project_path = st.session_state.project_path
+
+    charter_data = {}
+    charter_file = project_path / "PROJECT_CHARTER.md"
+    if charter_file.exists():
+        try:
+            charter_data = parse_charter_to_form_data(charter_file.read_text())
+        except Exception as e:
+            st.warning(f"Could not parse charter: {e}")
+
+    jobs = {}
+    for pattern_key, display_name in deliverable_patterns.items():
+        if _get_deliverable_file(pattern_key).exists() and not overwrite:
+            continue
+        pattern = registry.get_pattern(pattern_key)
+        user_inputs, missing = _collect_batch_inputs(
+            pattern_key, pattern.get("variables", {}), charter_data
+        )
+        if missing:
+            st.warning(f"⚠️ Skipping {display_name}: missing {', '.join(missing)}")
+            continue
+        jobs[pattern_key] = user_inputs
+
+    if not jobs:
+        st.info("Nothing to generate")
+        return
+
+    pipeline = PatternPipeline(registry, ProjectContext(project_path))
+    progress = st.progress(0.0, text=f"Generating {len(jobs)} deliverables...")
+
+    for done, (pattern_key, result) in enumerate(
+        pipeline.execute_many(
+            jobs, project_path=project_path, enable_editing=True, enable_critique=False
+        ),
+        start=1,
+    ):
+        display_name = deliverable_patterns[pattern_key]
+        progress.progress(done / len(jobs), text=f"{done}/{len(jobs)} done")
+
+        if "error" in result:
+            st.error(f"❌ {display_name} failed: {result['error']}")
+            continue
+
+        # Save to file
+        deliverable_file = _get_deliverable_file(pattern_key)
+        deliverable_file.write_text(clean_markdown_output(result["document"]))
+        st.session_state.pop(f"deliverable_content_{deliverable_file.name}", None)
+        st.success(f"✓ {display_name} created")
+
+
 def _generate_deliverable(
-    deliverable_file, pattern_key, selected_deliverable, user_inputs, registry
+    deliverable_file,
+    pattern_key,
+    selected_deliverable,
+    user_inputs,
+    registry,
+    regenerate_all: bool = False,
 ):
-    """Generate a deliverable using the pattern pipeline."""
+    """
+    Generate a deliverable using the pattern pipeline.
+
+    An existing deliverable only has the sections affected by changed inputs
+    redrafted, unless regenerate_all is set.
+    """
     with st.spinner(f"Generating {selected_deliverable}..."):
         context = ProjectContext(st.session_state.project_path)
         pipeline = PatternPipeline(registry, context)
 
-        result = pipeline.execute(
-            pattern_name=pattern_key,
-            user_inputs=user_inputs,
-            enable_editing=True,
-            enable_critique=False,
-            project_path=st.session_state.project_path,
-        )
+        # Render draft/edit output live instead of waiting for the whole chain
+        preview = StreamingPreview()
+        if deliverable_file.exists() and not regenerate_all:
+            # Only redraft the sections the changed inputs affect
+            result = pipeline.regenerate_sections(
+                pattern_name=pattern_key,
+                user_inputs=user_inputs,
+                document=deliverable_file.read_text(),
+                enable_editing=True,
+                enable_critique=False,
+                project_path=st.session_state.project_path,
+                on_token=preview,
+            )
+        else:
+            result = pipeline.execute(
+                pattern_name=pattern_key,
+                user_inputs=user_inputs,
+                enable_editing=True,
+                enable_critique=False,
+                project_path=st.session_state.project_path,
+                on_token=preview,
+            )
+        preview.clear()
 
         # Save to file
         document_content = clean_markdown_output(result["document"])
@@ -318,5 +454,13 @@ def _generate_deliverable(
             del st.session_state[content_key]
 
         st.session_state[f"show_wizard_{pattern_key}"] = False
-        st.success(f"✓ {selected_deliverable} created!")
+        sections = result.get("regenerated_sections")
+        if sections is None:
+            st.success(f"✓ {selected_deliverable} created!")
+        elif sections:
+            st.success(f"✓ {selected_deliverable} updated: {', '.join(sections)}")
+        else:
+            st.info("No inputs changed, document left as is")
+        for title in result.get("failed_sections", []):
+            st.warning(f"⚠️ Could not regenerate '{title}', kept the previous version")
         st.rerun()
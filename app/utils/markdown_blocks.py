@@ -0,0 +1,189 @@
+"""
+Utility functions for splitting markdown into structural blocks and token-sized chunks.
+"""
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .markdown_sections import HEADING_PATTERN
+
+FENCE_PATTERN = re.compile(r"^\s*(`{3,}|~{3,})")
+RULE_PATTERN = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+LIST_ITEM_PATTERN = re.compile(r"^\s*([-*+]|\d+[.)])\s+")
+TABLE_ROW_PATTERN = re.compile(r"^\s*\|")
+QUOTE_PATTERN = re.compile(r"^\s*>")
+
+# Blocks with no prose to improve; they never need an LLM call
+INERT_KINDS = frozenset({"heading", "rule"})
+
+
+@dataclass(frozen=True)
+class Block:
+    """One markdown block: heading, paragraph, list, table, code, quote or rule."""
+
+    kind: str
+    text: str
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """Consecutive blocks processed together; passthrough chunks are kept verbatim."""
+
+    text: str
+    passthrough: bool = False
+
+
+def parse_blocks(text: str) -> list[Block]:
+    """
+    Split markdown into top-level blocks.
+
+    Fenced code, tables, lists and quotes are always returned whole, so a
+    chunk boundary can never fall inside them.
+
+    Args:
+        text: Markdown document
+
+    Returns:
+        Blocks in document order (blank lines between blocks are dropped)
+    """
+    lines = text.splitlines()
+    blocks = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            i += 1
+            continue
+
+        fence = FENCE_PATTERN.match(line)
+        if fence:
+            end = i + 1
+            while end < len(lines) and not lines[end].strip().startswith(fence.group(1)):
+                end += 1
+            blocks.append(Block("code", "\n".join(lines[i : end + 1])))
+            i = end + 1
+        elif HEADING_PATTERN.match(line):
+            blocks.append(Block("heading", line))
+            i += 1
+        elif RULE_PATTERN.match(line):
+            blocks.append(Block("rule", line))
+            i += 1
+        elif TABLE_ROW_PATTERN.match(line):
+            end = _run_end(lines, i, lambda row: bool(TABLE_ROW_PATTERN.match(row)))
+            blocks.append(Block("table", "\n".join(lines[i:end])))
+            i = end
+        elif QUOTE_PATTERN.match(line):
+            end = _run_end(lines, i, lambda row: bool(QUOTE_PATTERN.match(row)))
+            blocks.append(Block("quote", "\n".join(lines[i:end])))
+            i = end
+        elif LIST_ITEM_PATTERN.match(line):
+            end = _list_end(lines, i)
+            blocks.append(Block("list", "\n".join(lines[i:end]).rstrip()))
+            i = end
+        else:
+            end = _run_end(lines, i + 1, lambda row: bool(row.strip()) and not _starts_block(row))
+            blocks.append(Block("paragraph", "\n".join(lines[i:end])))
+            i = end
+    return blocks
+
+
+def chunk_blocks(
+    blocks: list[Block],
+    max_tokens: int,
+    count_tokens: Callable[[str], int],
+    passthrough_kinds: frozenset[str] | set[str] = frozenset(),
+) -> list[Chunk]:
+    """
+    Group blocks into chunks of at most max_tokens, preferring heading boundaries.
+
+    A new chunk starts before a heading once the current chunk is half full,
+    so sections stay together where possible. A single block larger than
+    max_tokens becomes its own chunk rather than being split.
+
+    Args:
+        blocks: Blocks from parse_blocks()
+        max_tokens: Target chunk size in tokens
+        count_tokens: Token counter for the target model
+        passthrough_kinds: Block kinds to keep verbatim, each as its own chunk
+
+    Returns:
+        Chunks in document order
+    """
+    chunks: list[Chunk] = []
+    current: list[Block] = []
+    size = 0
+
+    def flush():
+        nonlocal current, size
+        if current:
+            inert = all(block.kind in INERT_KINDS for block in current)
+            chunks.append(Chunk("\n\n".join(block.text for block in current), passthrough=inert))
+        current, size = [], 0
+
+    for block in blocks:
+        if block.kind in passthrough_kinds:
+            flush()
+            chunks.append(Chunk(block.text, passthrough=True))
+            continue
+
+        tokens = count_tokens(block.text)
+        at_heading = block.kind == "heading" and size >= max_tokens // 2
+        if current and (size + tokens > max_tokens or at_heading):
+            # Headings move on with the content they introduce
+            carry = []
+            while current and current[-1].kind == "heading":
+                carry.insert(0, current.pop())
+            flush()
+            current, size = carry, sum(count_tokens(heading.text) for heading in carry)
+        current.append(block)
+        size += tokens
+
+    flush()
+    return chunks
+
+
+def _run_end(lines: list[str], start: int, belongs: Callable[[str], bool]) -> int:
+    """Index just past the run of lines starting at start that satisfy belongs."""
+    end = start
+    while end < len(lines) and belongs(lines[end]):
+        end += 1
+    return end
+
+
+def _list_end(lines: list[str], start: int) -> int:
+    """Index just past a list, including indented continuations and loose items."""
+    end = start + 1
+    while end < len(lines):
+        line = lines[end]
+        if line.strip():
+            if not (LIST_ITEM_PATTERN.match(line) or line[:1].isspace()):
+                break
+            end += 1
+            continue
+        # A blank line only continues the list if more list content follows
+        following = end + 1
+        while following < len(lines) and not lines[following].strip():
+            following += 1
+        if following < len(lines) and (
+            LIST_ITEM_PATTERN.match(lines[following]) or lines[following][:1].isspace()
+        ):
+            end = following
+            continue
+        break
+    return end
+
+
+def _starts_block(line: str) -> bool:
+    """Whether a line opens a non-paragraph block (ending the paragraph before it)."""
+    return any(
+        pattern.match(line)
+        for pattern in (
+            FENCE_PATTERN,
+            HEADING_PATTERN,
+            RULE_PATTERN,
+            TABLE_ROW_PATTERN,
+            QUOTE_PATTERN,
+            LIST_ITEM_PATTERN,
+        )
+    )
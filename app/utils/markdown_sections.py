@@ -0,0 +1,133 @@
+"""
+Utility functions for splitting markdown documents into heading sections.
+"""
+
+import re
+from dataclasses import dataclass
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+# Blank lines and horizontal rules closing a section; they belong to the layout, not the content
+TRAILER_PATTERN = re.compile(r"(?:\s*^(?:-{3,}|\*{3,}|_{3,})[ \t]*$)*\s*\Z", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class Section:
+    """A heading and everything below it up to the next heading of the same or higher level."""
+
+    title: str
+    level: int
+    start: int  # Character offset of the heading line
+    end: int  # Character offset just past the section (exclusive)
+
+
+def normalize_title(title: str) -> str:
+    """
+    Reduce a heading to comparable words.
+
+    Drops emoji, punctuation, markdown emphasis and leading numbering, so
+    "## 💰 Resources & Budget (if applicable)" becomes "resources budget if applicable"
+    and "## 2. Problem/Opportunity Statement" becomes "problem opportunity statement".
+    """
+    words = re.sub(r"[^0-9a-z]+", " ", title.lower()).split()
+    while words and words[0].isdigit():
+        words.pop(0)
+    return " ".join(words)
+
+
+def split_sections(text: str) -> list[Section]:
+    """
+    Find every heading section in a markdown document.
+
+    Headings inside fenced code blocks are ignored. Sections nest: a "##"
+    section contains the "###" sections below it.
+
+    Args:
+        text: Markdown document
+
+    Returns:
+        Sections in document order
+    """
+    headings = []
+    offset = 0
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = HEADING_PATTERN.match(line.rstrip("\r\n"))
+            if match:
+                headings.append((offset, len(match.group(1)), match.group(2)))
+        offset += len(line)
+
+    sections = []
+    for i, (start, level, title) in enumerate(headings):
+        end = len(text)
+        for next_start, next_level, _ in headings[i + 1 :]:
+            if next_level <= level:
+                end = next_start
+                break
+        sections.append(Section(title=title, level=level, start=start, end=end))
+    return sections
+
+
+def find_section(sections: list[Section], name: str) -> Section | None:
+    """
+    Find the first section whose heading starts with a name.
+
+    Args:
+        sections: Sections from split_sections()
+        name: Heading name, compared after normalize_title() (e.g. "Milestones")
+
+    Returns:
+        Matching section or None
+    """
+    wanted = normalize_title(name)
+    if not wanted:
+        return None
+    for section in sections:
+        title = normalize_title(section.title)
+        if title == wanted or title.startswith(wanted + " "):
+            return section
+    return None
+
+
+def section_text(text: str, section: Section) -> str:
+    """Get a section's markdown (heading included) without its trailing blank lines or rules."""
+    original = text[section.start : section.end]
+    return original[: TRAILER_PATTERN.search(original).start()]
+
+
+def with_heading(content: str, heading: str) -> str:
+    """
+    Make content start with the given heading line.
+
+    A leading heading in content is replaced (models sometimes rename or
+    re-level it); otherwise the heading is prepended.
+    """
+    lines = content.strip().splitlines()
+    if lines and HEADING_PATTERN.match(lines[0]):
+        lines = lines[1:]
+    body = "\n".join(lines).strip()
+    return f"{heading.strip()}\n\n{body}" if body else heading.strip()
+
+
+def replace_sections(text: str, replacements: dict[Section, str]) -> str:
+    """
+    Splice new content in place of sections, leaving the rest byte-for-byte intact.
+
+    Args:
+        text: Original markdown document
+        replacements: Section (from split_sections() on text) -> replacement markdown
+            including its heading; sections must not overlap
+
+    Returns:
+        Updated document
+    """
+    result = text
+    for section, content in sorted(replacements.items(), key=lambda item: -item[0].start):
+        original = text[section.start : section.end]
+        # Keep the blank lines and rules that separated the section from the next heading
+        trailing = original[TRAILER_PATTERN.search(original).start() :]
+        result = result[: section.start] + content.strip() + trailing + result[section.end :]
+    return result
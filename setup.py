@@ -15,6 +15,9 @@ setup(
         "rich>=13.0.0",
         "questionary>=2.0.0",
         "gitpython>=3.1.0",
+        "openai>=1.40.0",
+        "tenacity>=8.2.0",
+        "httpx>=0.23.0,<1",
     ],
     entry_points={
         "console_scripts": [